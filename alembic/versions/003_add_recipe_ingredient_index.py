@@ -0,0 +1,24 @@
+"""Add RecipeIngredient.ri_recipe_id index
+
+Revision ID: 003_add_recipe_ingredient_index
+Revises: 002_add_user_table
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_add_recipe_ingredient_index'
+down_revision = '002_add_user_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_recipe_ingredient_recipe_id', 'RecipeIngredient', ['ri_recipe_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_recipe_ingredient_recipe_id', table_name='RecipeIngredient')
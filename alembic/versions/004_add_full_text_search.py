@@ -0,0 +1,83 @@
+"""Add full-text search index for recipes, meals, food items and ingredients
+
+Revision ID: 004_add_full_text_search
+Revises: 003_add_recipe_ingredient_index
+Create Date: 2026-10-18 00:00:00.000000
+
+SQLite: external-content FTS5 tables kept in sync by triggers.
+PostgreSQL: generated tsvector columns with GIN indexes.
+See data/search.py for the query side.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_add_full_text_search'
+down_revision = '003_add_recipe_ingredient_index'
+branch_labels = None
+depends_on = None
+
+
+# (table, primary key, name column, description column, FTS5 table)
+INDEXED_TABLES = [
+    ('Recipe', 'recipe_id', 'recipe_name', 'recipe_description', 'recipe_fts'),
+    ('Meal', 'meal_id', 'meal_name', 'meal_description', 'meal_fts'),
+    ('FoodItem', 'fooditem_id', 'fooditem_name', 'fooditem_description', 'fooditem_fts'),
+    ('Ingredient', 'ingredient_id', 'ingredient_name', 'ingredient_description', 'ingredient_fts'),
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    for table, key, name, description, fts in INDEXED_TABLES:
+        if dialect == 'sqlite':
+            op.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                f"{name}, {description}, content='{table}', content_rowid='{key}', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            op.execute(
+                f'CREATE TRIGGER {fts}_ai AFTER INSERT ON "{table}" BEGIN '
+                f"INSERT INTO {fts}(rowid, {name}, {description}) "
+                f"VALUES (new.{key}, new.{name}, new.{description}); END"
+            )
+            op.execute(
+                f'CREATE TRIGGER {fts}_ad AFTER DELETE ON "{table}" BEGIN '
+                f"INSERT INTO {fts}({fts}, rowid, {name}, {description}) "
+                f"VALUES ('delete', old.{key}, old.{name}, old.{description}); END"
+            )
+            op.execute(
+                f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {name}, {description} ON "{table}" BEGIN '
+                f"INSERT INTO {fts}({fts}, rowid, {name}, {description}) "
+                f"VALUES ('delete', old.{key}, old.{name}, old.{description}); "
+                f"INSERT INTO {fts}(rowid, {name}, {description}) "
+                f"VALUES (new.{key}, new.{name}, new.{description}); END"
+            )
+            # Index the rows that already exist
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        elif dialect == 'postgresql':
+            op.execute(
+                f'ALTER TABLE "{table}" ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ('
+                f"setweight(to_tsvector('simple', coalesce({name}, '')), 'A') || "
+                f"setweight(to_tsvector('simple', coalesce({description}, '')), 'B')"
+                f") STORED"
+            )
+            op.create_index(
+                f'idx_{table.lower()}_search_vector', table, ['search_vector'],
+                postgresql_using='gin'
+            )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    for table, key, name, description, fts in INDEXED_TABLES:
+        if dialect == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
+        elif dialect == 'postgresql':
+            op.drop_index(f'idx_{table.lower()}_search_vector', table_name=table)
+            op.drop_column(table, 'search_vector')
@@ -0,0 +1,49 @@
+"""Add trigram indexes for fuzzy name search
+
+Revision ID: 005_add_trigram_indexes
+Revises: 004_add_full_text_search
+Create Date: 2026-10-18 00:00:00.000000
+
+PostgreSQL: pg_trgm extension plus a GIN gin_trgm_ops index on each name
+column, used by the % operator and similarity().
+SQLite: nothing to do; data/fuzzy.py keeps an in-process trigram index.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005_add_trigram_indexes'
+down_revision = '004_add_full_text_search'
+branch_labels = None
+depends_on = None
+
+
+# (table, name column)
+INDEXED_COLUMNS = [
+    ('Recipe', 'recipe_name'),
+    ('Meal', 'meal_name'),
+    ('FoodItem', 'fooditem_name'),
+    ('Ingredient', 'ingredient_name'),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in INDEXED_COLUMNS:
+        op.create_index(
+            f'idx_{table.lower()}_name_trgm', table, [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in INDEXED_COLUMNS:
+        op.drop_index(f'idx_{table.lower()}_name_trgm', table_name=table)
@@ -0,0 +1,45 @@
+"""Add CategoryClosure table for category subtree queries
+
+Revision ID: 006_add_category_closure
+Revises: 005_add_trigram_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+Populated from Category.parent_category_id with a recursive CTE; kept
+current afterwards by the crud category operations.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_add_category_closure'
+down_revision = '005_add_trigram_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('CategoryClosure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['Category.category_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['Category.category_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('idx_category_closure_descendant', 'CategoryClosure', ['descendant_id'], unique=False)
+
+    op.execute(
+        'INSERT INTO "CategoryClosure" (ancestor_id, descendant_id, depth) '
+        'WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS ('
+        'SELECT category_id, category_id, 0 FROM "Category" '
+        'UNION ALL '
+        'SELECT tree.ancestor_id, c.category_id, tree.depth + 1 '
+        'FROM tree JOIN "Category" c ON c.parent_category_id = tree.descendant_id'
+        ') SELECT ancestor_id, descendant_id, depth FROM tree'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_category_closure_descendant', table_name='CategoryClosure')
+    op.drop_table('CategoryClosure')
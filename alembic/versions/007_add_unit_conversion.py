@@ -0,0 +1,69 @@
+"""Add unit dimensions, base factors and ingredient density
+
+Revision ID: 007_add_unit_conversion
+Revises: 006_add_category_closure
+Create Date: 2026-10-18 00:00:00.000000
+
+UnitType gains unit_dimension ('mass', 'volume' or 'count') and
+unit_base_factor (size of one unit in gram / milliliter / piece);
+Ingredient gains ingredient_density (g/ml). Existing units named like the
+seeded ones are filled in; all other units stay unconvertible until
+edited.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_add_unit_conversion'
+down_revision = '006_add_category_closure'
+branch_labels = None
+depends_on = None
+
+# unit_type -> (unit_dimension, unit_base_factor), as of this revision
+STANDARD_UNITS = {
+    "gram": ("mass", 1.0),
+    "kilogram": ("mass", 1000.0),
+    "ounce": ("mass", 28.349523125),
+    "pound": ("mass", 453.59237),
+    "milliliter": ("volume", 1.0),
+    "liter": ("volume", 1000.0),
+    "teaspoon": ("volume", 4.92892159375),
+    "tablespoon": ("volume", 14.78676478125),
+    "fluid ounce": ("volume", 29.5735295625),
+    "cup": ("volume", 236.5882365),
+    "pint": ("volume", 473.176473),
+    "quart": ("volume", 946.352946),
+    "gallon": ("volume", 3785.411784),
+    "pinch": ("volume", 0.30805759961),
+    "dash": ("volume", 0.61611519922),
+    "piece": ("count", 1.0),
+    "whole": ("count", 1.0),
+}
+
+
+def upgrade() -> None:
+    op.add_column('UnitType', sa.Column('unit_dimension', sa.Text(), nullable=True))
+    op.add_column('UnitType', sa.Column('unit_base_factor', sa.Float(), nullable=True))
+    op.add_column('Ingredient', sa.Column('ingredient_density', sa.Float(), nullable=True))
+
+    unit_type = sa.table(
+        'UnitType',
+        sa.column('unit_type', sa.Text),
+        sa.column('unit_dimension', sa.Text),
+        sa.column('unit_base_factor', sa.Float),
+    )
+    for name, (dimension, factor) in STANDARD_UNITS.items():
+        op.execute(
+            unit_type.update()
+            .where(sa.func.lower(unit_type.c.unit_type) == name)
+            .values(unit_dimension=dimension, unit_base_factor=factor)
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('Ingredient') as batch_op:
+        batch_op.drop_column('ingredient_density')
+    with op.batch_alter_table('UnitType') as batch_op:
+        batch_op.drop_column('unit_base_factor')
+        batch_op.drop_column('unit_dimension')
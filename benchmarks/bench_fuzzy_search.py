@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark the in-process trigram index behind ?fuzzy=true search.
+
+Builds a data.fuzzy.TrigramIndex over synthetic names (a Zipf-distributed
+vocabulary, so common words like "chicken" appear in thousands of names),
+then times typo-laden queries with and without a result limit, and checks
+every result against a brute-force similarity scan of all names.
+
+Usage:
+    python benchmarks/bench_fuzzy_search.py [--names 100000] [--threshold 0.3] [--limit 5]
+"""
+
+import argparse
+import gc
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path to enable imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.fuzzy import TrigramIndex, trigrams
+
+COMMON_WORDS = [
+    "chicken", "beef", "tomato", "basil", "spaghetti", "parmesan", "garlic", "onion", "soup", "salad",
+    "roasted", "grilled", "lemon", "pepper", "curry", "rice", "noodle", "pork", "mushroom", "spinach",
+    "cheddar", "bread", "butter", "cream", "honey", "ginger", "sesame", "tofu", "salmon", "shrimp",
+]
+
+QUERIES = [
+    "spagetti", "parmesean", "chiken sup", "tomato basil soup", "garlic bread",
+    "mushroom risotto", "chicken", "beef", "xqzv",
+]
+
+
+def make_names(count: int, seed: int = 1):
+    """Generate ``count`` names of 1-4 words drawn from a Zipf-weighted vocabulary."""
+    rng = random.Random(seed)
+    vocab = COMMON_WORDS + [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+        for _ in range(5000)
+    ]
+    weights = [1 / rank for rank in range(1, len(vocab) + 1)]
+    return {i: " ".join(rng.choices(vocab, weights, k=rng.randint(1, 4))) for i in range(1, count + 1)}
+
+
+def brute_force(names, q: str, threshold: float):
+    """Score every name; the reference result for TrigramIndex.search()."""
+    query = trigrams(q)
+    matches = []
+    for name_id, name in names.items():
+        grams = trigrams(name)
+        shared = len(query & grams)
+        if shared and shared / (len(query) + len(grams) - shared) >= threshold:
+            matches.append((name_id, shared / (len(query) + len(grams) - shared)))
+    matches.sort(key=lambda match: (-match[1], match[0]))
+    return matches
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Best wall time of ``repeat`` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--names", type=int, default=100000, help="Names to index")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Minimum similarity")
+    parser.add_argument("--limit", type=int, default=5, help="Results per limited lookup")
+    args = parser.parse_args()
+
+    names = make_names(args.names)
+    start = time.perf_counter()
+    index = TrigramIndex()
+    for name_id, name in names.items():
+        index.add(name_id, name)
+    gc.freeze()
+    print(f"Indexed {len(index)} names in {time.perf_counter() - start:.2f}s")
+    print(f"{'query':<20} {'limit ' + str(args.limit):>10} {'all':>10} {'matches':>8}  correct")
+
+    correct = True
+    for q in QUERIES:
+        limited = best_of(lambda: index.search(q, args.threshold, args.limit))
+        unlimited = best_of(lambda: index.search(q, args.threshold))
+        expected = brute_force(names, q, args.threshold)
+        ok = (
+            index.search(q, args.threshold) == expected
+            and index.search(q, args.threshold, args.limit) == expected[:args.limit]
+        )
+        correct &= ok
+        print(f"{q:<20} {limited:8.2f}ms {unlimited:8.2f}ms {len(expected):>8}  {ok}")
+
+    return 0 if correct else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON response encoding paths on a large recipe payload.
+
+Compares the previous path (serializers emitting isoformat() strings, then
+FastAPI's jsonable_encoder + JSONResponse.render) with the current one
+(serializers emitting datetimes, encoded directly by encoding.dumps), and
+checks that both produce the same bytes.
+
+No database is needed: recipes are built as transient ORM objects.
+
+Usage:
+    python benchmarks/bench_json_encoding.py [--recipes 10000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path to enable imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from data import serializers
+from data.encoding import dumps
+from data.models import (
+    Recipe, RecipeIngredient, RecipeInstruction, Ingredient, FoodItem, UnitType, Category
+)
+
+
+def build_recipes(count: int):
+    """Build transient recipes with ingredients, instructions and categories."""
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    units = [UnitType(id=i, unit_type=name) for i, name in enumerate(["cup", "tbsp", "gram"], 1)]
+    ingredients = [
+        Ingredient(ingredient_id=i, ingredient_name=f"Ingredient {i}", ingredient_description=f"Déscription {i}")
+        for i in range(1, 51)
+    ]
+    categories = [
+        Category(category_id=i, category_name=f"Category {i}", created_at=base, updated_at=base)
+        for i in range(1, 11)
+    ]
+    food_item = FoodItem(fooditem_id=1, fooditem_name="Stock")
+
+    recipes = []
+    for n in range(1, count + 1):
+        stamp = base + timedelta(seconds=n, microseconds=n % 7 * 1000)
+        recipe = Recipe(
+            recipe_id=n,
+            recipe_name=f"Recipe {n}",
+            recipe_fooditem_id=food_item.fooditem_id,
+            recipe_description=f"Recipe number {n} — with \"quotes\" and unicode",
+            created_at=stamp,
+            updated_at=stamp,
+        )
+        recipe.ingredients = [
+            RecipeIngredient(
+                ri_id=n * 10 + k,
+                ri_recipe_id=n,
+                ri_ingredient_id=ingredients[(n + k) % 50].ingredient_id,
+                ri_fooditem_id=food_item.fooditem_id if k == 0 else None,
+                ri_unit_type_id=units[k % 3].id,
+                ri_quantity=0.25 * (k + 1),
+                created_at=stamp,
+                updated_at=stamp,
+                ingredient=ingredients[(n + k) % 50],
+                unit_type=units[k % 3],
+                fooditem=food_item if k == 0 else None,
+            )
+            for k in range(6)
+        ]
+        recipe.instructions = [
+            RecipeInstruction(step_number=k, instruction_text=f"Step {k} of recipe {n}")
+            for k in range(1, 5)
+        ]
+        recipe.categories = [categories[n % 10], categories[(n + 3) % 10]]
+        recipes.append(recipe)
+    return recipes
+
+
+def isoformat_payload(payload):
+    """Reproduce the previous serializer output, with datetimes as isoformat() strings."""
+    if isinstance(payload, dict):
+        return {key: isoformat_payload(value) for key, value in payload.items()}
+    if isinstance(payload, list):
+        return [isoformat_payload(value) for value in payload]
+    if isinstance(payload, datetime):
+        return payload.isoformat()
+    return payload
+
+
+def timed(func, repeat: int):
+    """Return (best seconds, last result) over repeat runs."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=10000, help="Number of recipes in the payload")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    recipes = build_recipes(args.recipes)
+
+    # Serialize once up front so only the encoding step is timed
+    current_content = {"recipes": serializers.serialize_recipes(recipes)}
+    previous_content = isoformat_payload(current_content)
+
+    def previous_path():
+        return JSONResponse(content=None).render(jsonable_encoder(previous_content))
+
+    def current_path():
+        return dumps(current_content)
+
+    previous_time, previous_body = timed(previous_path, args.repeat)
+    current_time, current_body = timed(current_path, args.repeat)
+
+    print(f"Payload: {args.recipes} recipes, {len(current_body) / 1024 / 1024:.1f} MiB")
+    print(f"jsonable_encoder + JSONResponse: {previous_time * 1000:8.1f} ms")
+    print(f"encoding.dumps:                 {current_time * 1000:8.1f} ms")
+    print(f"Speedup: {previous_time / current_time:.2f}x")
+    print(f"Byte-identical: {previous_body == current_body}")
+
+    return 0 if previous_body == current_body else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark pantry coverage ranking (/recipes/match) over a large catalog.
+
+Builds a data.pantry.PantryMatrix for synthetic recipes (some using food
+items made by earlier recipes), then times vectorized scoring and ranking
+for random pantries against a per-recipe Python loop computing the same
+ranking, and checks that both agree.
+
+Usage:
+    python benchmarks/bench_pantry_match.py [--recipes 100000] [--ingredients 2000] [--pantry 600]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path to enable imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.pantry import PantryMatrix
+
+FOOD_ITEM_SHARE = 0.05
+LIMIT = 20
+
+
+def make_catalog(recipe_count: int, ingredient_count: int, seed: int = 3):
+    """Recipes (recipe r produces food item r) and their ingredient rows."""
+    rng = random.Random(seed)
+    recipes = [(r, r) for r in range(1, recipe_count + 1)]
+    entries = []
+    ri_id = 1
+    for r in range(1, recipe_count + 1):
+        for _ in range(rng.randint(3, 12)):
+            if r > 10 and rng.random() < FOOD_ITEM_SHARE:
+                entries.append((r, ri_id, None, rng.randint(1, r - 1)))
+            else:
+                entries.append((r, ri_id, rng.randint(1, ingredient_count), None))
+            ri_id += 1
+    return recipes, entries
+
+
+def loop_rank(recipes, entries, pantry):
+    """Reference implementation: plain Python loops over every recipe."""
+    rows = {}
+    for recipe_id, _, ingredient_id, fooditem_id in entries:
+        rows.setdefault(recipe_id, []).append((ingredient_id, fooditem_id))
+    produces = dict(recipes)
+
+    def covered(recipe_id, have_food):
+        return sum(
+            1 for ingredient_id, fooditem_id in rows[recipe_id]
+            if (ingredient_id in pantry if ingredient_id else fooditem_id in have_food)
+        )
+
+    have_food = set()
+    changed = True
+    while changed:
+        changed = False
+        for recipe_id in rows:
+            if produces[recipe_id] not in have_food and covered(recipe_id, have_food) == len(rows[recipe_id]):
+                have_food.add(produces[recipe_id])
+                changed = True
+
+    scores = {}
+    for recipe_id, recipe_rows in rows.items():
+        count = covered(recipe_id, have_food)
+        if count:
+            scores[recipe_id] = (-count / len(recipe_rows), len(recipe_rows) - count, recipe_id)
+    return sorted(scores, key=scores.get)[:LIMIT]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=100000, help="Recipes in the catalog")
+    parser.add_argument("--ingredients", type=int, default=2000, help="Distinct ingredients")
+    parser.add_argument("--pantry", type=int, default=600, help="Ingredients on hand per query")
+    parser.add_argument("--queries", type=int, default=5, help="Random pantries to time")
+    args = parser.parse_args()
+
+    recipes, entries = make_catalog(args.recipes, args.ingredients)
+    start = time.perf_counter()
+    matrix = PantryMatrix(recipes, entries)
+    print(f"Built matrix for {len(matrix)} recipes / {len(entries)} rows in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(7)
+    agreed = True
+    for _ in range(args.queries):
+        pantry = set(rng.sample(range(1, args.ingredients + 1), args.pantry))
+
+        start = time.perf_counter()
+        counts, _ = matrix.score(pantry)
+        rows, total = matrix.rank(counts, LIMIT)
+        vectorized = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = loop_rank(recipes, entries, pantry)
+        looped = time.perf_counter() - start
+
+        ranked = [int(matrix.recipe_ids[row]) for row in rows]
+        agreed &= ranked == expected
+        print(
+            f"  {total:>7} matching  vectorized {vectorized * 1000:7.1f} ms  "
+            f"loops {looped * 1000:8.1f} ms  same top {LIMIT}: {ranked == expected}"
+        )
+    return 0 if agreed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ORM and Core read paths used by the list endpoints.
+
+Seeds a throwaway SQLite database, then reads every recipe (and meal) page
+through:
+
+- the ORM path: crud.get_recipes_page() / get_all_meals() + serializers
+- the Core path: queries.get_recipes_page() / get_meals_page()
+
+and reports throughput (rows per second) and peak Python allocations
+(tracemalloc) for each, after checking that both produce the same output.
+
+Usage:
+    python benchmarks/bench_read_path.py [--recipes 5000] [--page-size 1000] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path to enable imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from data import crud, queries, serializers
+from data.models import (
+    Base, Recipe, RecipeIngredient, RecipeInstruction, RecipeCategory, Ingredient, FoodItem,
+    UnitType, Category, Meal, MealFoodItem, MealCategory
+)
+
+INGREDIENTS_PER_RECIPE = 8
+INSTRUCTIONS_PER_RECIPE = 5
+FOOD_ITEMS_PER_MEAL = 4
+
+
+async def seed(session_factory, recipe_count: int, meal_count: int) -> None:
+    """Insert lookup rows, recipes with children, and meals."""
+    async with session_factory() as session:
+        session.add_all([UnitType(id=i, unit_type=name) for i, name in enumerate(["cup", "tbsp", "gram", "ml"], 1)])
+        session.add_all([
+            Ingredient(ingredient_id=i, ingredient_name=f"Ingredient {i}", ingredient_description=f"Description {i}")
+            for i in range(1, 201)
+        ])
+        session.add_all([Category(category_id=i, category_name=f"Category {i}") for i in range(1, 21)])
+        session.add_all([FoodItem(fooditem_id=i, fooditem_name=f"Food {i}") for i in range(1, recipe_count + 1)])
+        await session.flush()
+
+        for n in range(1, recipe_count + 1):
+            session.add(Recipe(recipe_id=n, recipe_name=f"Recipe {n}", recipe_fooditem_id=n))
+        await session.flush()
+
+        for n in range(1, recipe_count + 1):
+            for k in range(INGREDIENTS_PER_RECIPE):
+                if k == 0 and n > 1:
+                    source = {"ri_fooditem_id": n - 1}
+                else:
+                    source = {"ri_ingredient_id": (n * 7 + k) % 200 + 1}
+                session.add(RecipeIngredient(ri_recipe_id=n, ri_unit_type_id=k % 4 + 1, ri_quantity=0.5 * (k + 1), **source))
+            for k in range(1, INSTRUCTIONS_PER_RECIPE + 1):
+                session.add(RecipeInstruction(recipe_id=n, step_number=k, instruction_text=f"Step {k} of recipe {n}"))
+            session.add(RecipeCategory(recipe_id=n, category_id=n % 20 + 1))
+            session.add(RecipeCategory(recipe_id=n, category_id=(n + 7) % 20 + 1))
+
+        for n in range(1, meal_count + 1):
+            session.add(Meal(meal_id=n, meal_name=f"Meal {n}"))
+        await session.flush()
+        for n in range(1, meal_count + 1):
+            for k in range(FOOD_ITEMS_PER_MEAL):
+                session.add(MealFoodItem(mf_meal_id=n, mf_fooditem_id=(n * 3 + k) % recipe_count + 1))
+            session.add(MealCategory(meal_id=n, category_id=n % 20 + 1))
+        await session.commit()
+
+
+async def read_all(session_factory, read_page, key: str, page_size: int):
+    """Read every page in cursor order with a fresh session; return all rows."""
+    rows = []
+    after_id = None
+    async with session_factory() as session:
+        while True:
+            page = await read_page(session, page_size, after_id)
+            if not page:
+                return rows
+            rows.extend(page)
+            after_id = page[-1][key]
+
+
+async def measure(session_factory, read_page, key: str, page_size: int, repeat: int):
+    """Return (best seconds, peak allocated bytes, rows) for one read path."""
+    best = float("inf")
+    rows = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = await read_all(session_factory, read_page, key, page_size)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    await read_all(session_factory, read_page, key, page_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, rows
+
+
+def report(label: str, orm, core) -> bool:
+    """Print one comparison and return whether the outputs matched."""
+    orm_time, orm_peak, orm_rows = orm
+    core_time, core_peak, core_rows = core
+    count = len(core_rows)
+    print(f"{label} ({count} rows)")
+    print(f"  ORM : {count / orm_time:10.0f} rows/s  {orm_time * 1000:8.1f} ms  peak {orm_peak / 1024 / 1024:7.1f} MiB")
+    print(f"  Core: {count / core_time:10.0f} rows/s  {core_time * 1000:8.1f} ms  peak {core_peak / 1024 / 1024:7.1f} MiB")
+    print(f"  Speedup {orm_time / core_time:.2f}x, allocations {orm_peak / core_peak:.2f}x lower")
+    matched = orm_rows == core_rows
+    print(f"  Identical output: {matched}")
+    return matched
+
+
+async def run(args) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed(session_factory, args.recipes, args.recipes // 2)
+
+        async def orm_recipes(session, limit, after_id):
+            recipes = await crud.get_recipes_page(session, limit, after_id=after_id)
+            return serializers.serialize_recipes(recipes)
+
+        async def core_recipes(session, limit, after_id):
+            return await queries.get_recipes_page(session, limit, after_id=after_id)
+
+        async def orm_meals(session, limit, after_id):
+            meals = await crud.get_all_meals(session, limit=limit, after_id=after_id)
+            return serializers.serialize_meals(meals)
+
+        async def core_meals(session, limit, after_id):
+            return await queries.get_meals_page(session, limit=limit, after_id=after_id)
+
+        matched = report(
+            "Recipes",
+            await measure(session_factory, orm_recipes, "recipe_id", args.page_size, args.repeat),
+            await measure(session_factory, core_recipes, "recipe_id", args.page_size, args.repeat),
+        )
+        matched &= report(
+            "Meals",
+            await measure(session_factory, orm_meals, "meal_id", args.page_size, args.repeat),
+            await measure(session_factory, core_meals, "meal_id", args.page_size, args.repeat),
+        )
+        await engine.dispose()
+        return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=5000, help="Recipes to seed (meals: half as many)")
+    parser.add_argument("--page-size", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per path (best is reported)")
+    args = parser.parse_args()
+    return 0 if asyncio.run(run(args)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+In-memory prefix index behind the /autocomplete endpoint.
+
+The search box needs only names while the user types, so /autocomplete
+is answered entirely from memory: one PrefixIndex per entity (recipe,
+meal, food item, ingredient), built from the name columns at startup and
+kept current by the crud create/update/delete functions. A lookup never
+touches the database and costs two bisects plus the rows returned.
+
+Names and queries are split into words the way search queries are
+(search.search_terms(): runs of letters and digits), so punctuation
+separates words too. Each name is indexed under its full word sequence
+and under every later word, so "sou" completes "Chicken Soup" and
+"fri" completes "Chicken-Fried Steak". Matches on the start of the name
+rank before matches on a later word; within each group results are
+alphabetical.
+"""
+
+import bisect
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .fuzzy import FUZZY_TARGETS
+from .search import search_terms
+
+logger = logging.getLogger(__name__)
+
+# Values accepted by /autocomplete?types= (and returned as "type")
+AUTOCOMPLETE_TYPES = tuple(FUZZY_TARGETS)
+
+
+def _keys(name: str) -> Tuple[str, List[str]]:
+    """Return (full-name key, later-word keys) for a name."""
+    words = search_terms(name)
+    return " ".join(words), [" ".join(words[i:]) for i in range(1, len(words))]
+
+
+class PrefixIndex:
+    """
+    Sorted (key, id) arrays searched with bisect.
+
+    ``_starts`` holds one key per name (the whole name) and ``_words`` one
+    key per later word, so a prefix lookup is a contiguous slice of each.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._starts: List[Tuple[str, int]] = []
+        self._words: List[Tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[int, Optional[str]]]) -> "PrefixIndex":
+        """Build an index from (id, name) rows with a single sort per array."""
+        index = cls()
+        for entity_id, name in rows:
+            if not name:
+                continue
+            start, words = _keys(name)
+            index._names[entity_id] = name
+            index._starts.append((start, entity_id))
+            index._words.extend((word, entity_id) for word in words)
+        index._starts.sort()
+        index._words.sort()
+        return index
+
+    def add(self, entity_id: int, name: Optional[str]) -> None:
+        """Index (or re-index) one name."""
+        self.remove(entity_id)
+        if not name:
+            return
+        start, words = _keys(name)
+        self._names[entity_id] = name
+        bisect.insort(self._starts, (start, entity_id))
+        for word in words:
+            bisect.insort(self._words, (word, entity_id))
+
+    def remove(self, entity_id: int) -> None:
+        """Drop one id from the index (no-op if it is not indexed)."""
+        name = self._names.pop(entity_id, None)
+        if name is None:
+            return
+        start, words = _keys(name)
+        for keys, key in [(self._starts, start)] + [(self._words, word) for word in words]:
+            position = bisect.bisect_left(keys, (key, entity_id))
+            if position < len(keys) and keys[position] == (key, entity_id):
+                del keys[position]
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[int, str, int]]:
+        """
+        Find up to ``limit`` names starting with (a word starting with) prefix.
+
+        Returns:
+            List of (tier, key, id): tier 0 for whole-name matches, 1 for
+            later-word matches; ordered by (tier, key).
+        """
+        prefix = " ".join(search_terms(prefix))
+        if not prefix:
+            return []
+
+        matches = []
+        seen = set()
+        for tier, keys in enumerate((self._starts, self._words)):
+            position = bisect.bisect_left(keys, (prefix,))
+            while position < len(keys) and len(matches) < limit:
+                key, entity_id = keys[position]
+                if not key.startswith(prefix):
+                    break
+                if entity_id not in seen:
+                    seen.add(entity_id)
+                    matches.append((tier, key, entity_id))
+                position += 1
+        return matches
+
+    def name(self, entity_id: int) -> str:
+        """Display name of an indexed id."""
+        return self._names[entity_id]
+
+
+# entity -> prefix index
+_indexes: Dict[str, PrefixIndex] = {}
+
+
+def is_built() -> bool:
+    """Whether build_indexes() has run in this process."""
+    return len(_indexes) == len(AUTOCOMPLETE_TYPES)
+
+
+async def build_indexes(db: AsyncSession) -> None:
+    """Build the prefix indexes from the name columns."""
+    for entity, (_, key, name) in FUZZY_TARGETS.items():
+        result = await db.execute(select(key, name))
+        _indexes[entity] = PrefixIndex.build(result)
+    logger.info("Built autocomplete indexes: %s", {entity: len(index) for entity, index in _indexes.items()})
+
+
+def record(entity: str, entity_id: int, name: Optional[str]) -> None:
+    """Index a created or renamed row (no-op until the indexes are built)."""
+    index = _indexes.get(entity)
+    if index is not None:
+        index.add(entity_id, name)
+
+
+def forget(entity: str, *entity_ids: int) -> None:
+    """Remove deleted rows from the index (no-op until the indexes are built)."""
+    index = _indexes.get(entity)
+    if index is not None:
+        for entity_id in entity_ids:
+            index.remove(entity_id)
+
+
+def complete(q: str, entities: Iterable[str], limit: int) -> List[Dict[str, object]]:
+    """
+    Complete a partial name across the given entity types.
+
+    Returns:
+        Up to ``limit`` dicts of {"type", "id", "name"}: whole-name matches
+        first, then later-word matches, each alphabetical.
+    """
+    matches = []
+    for entity in entities:
+        index = _indexes.get(entity)
+        if index is not None:
+            matches.extend((tier, key, entity, entity_id) for tier, key, entity_id in index.search(q, limit))
+    matches.sort()
+    return [
+        {"type": entity, "id": entity_id, "name": _indexes[entity].name(entity_id)}
+        for _, _, entity, entity_id in matches[:limit]
+    ]
@@ -0,0 +1,229 @@
+"""
+Bulk recipe import behind POST /recipes/bulk.
+
+The body is a JSON array of recipes in the POST /recipes create shape, or
+an NDJSON stream of them (one recipe per line). Recipes are validated as
+they arrive, mapped to crud.create_recipe() dicts, and handed to
+crud.create_recipes_bulk() in chunks of ``settings.bulk_import_chunk_size``:
+one transaction and one multi-row INSERT per child table per chunk,
+instead of a flush and a refresh per row. An NDJSON body is consumed while it
+streams, so memory is bounded by the chunk size rather than the import.
+
+Failures are reported per recipe by its position in the input; a recipe
+that fails validation, refers to rows that do not exist or would close a
+recipe cycle does not affect the others. Only a chunk the database
+rejects as a whole fails all of its recipes.
+"""
+
+import logging
+import math
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud
+from . import encoding
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+# Keys accepted in each nested ingredient / instruction object
+INGREDIENT_FIELDS = ("ri_ingredient_id", "ri_fooditem_id", "ri_unit_type_id", "ri_quantity")
+INSTRUCTION_FIELDS = ("step_number", "instruction_text")
+
+
+def is_ndjson(content_type: Optional[str]) -> bool:
+    """Whether a Content-Type header names an NDJSON body."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return media_type in NDJSON_MEDIA_TYPES
+
+
+def _positive_int(value: Any, name: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+
+def _list(item: Dict[str, Any], name: str) -> List[Any]:
+    value = item.get(name)
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"{name} must be a list")
+    return value
+
+
+def _validate_ingredient(data: Any, index: int) -> Dict[str, Any]:
+    where = f"ingredients[{index}]"
+    if not isinstance(data, dict):
+        raise ValueError(f"{where} must be an object")
+    unknown = sorted(set(data) - set(INGREDIENT_FIELDS))
+    if unknown:
+        raise ValueError(f"{where} has unknown fields: {', '.join(unknown)}")
+
+    ingredient_id = data.get("ri_ingredient_id")
+    fooditem_id = data.get("ri_fooditem_id")
+    if (ingredient_id is None) == (fooditem_id is None):
+        raise ValueError(f"{where} needs exactly one of ri_ingredient_id and ri_fooditem_id")
+    quantity = data.get("ri_quantity")
+    if isinstance(quantity, bool) or not isinstance(quantity, (int, float)) or not math.isfinite(quantity) or quantity <= 0:
+        raise ValueError(f"{where}.ri_quantity must be a positive number")
+
+    return {
+        "ri_ingredient_id": None if ingredient_id is None else _positive_int(ingredient_id, f"{where}.ri_ingredient_id"),
+        "ri_fooditem_id": None if fooditem_id is None else _positive_int(fooditem_id, f"{where}.ri_fooditem_id"),
+        "ri_unit_type_id": _positive_int(data.get("ri_unit_type_id"), f"{where}.ri_unit_type_id"),
+        "ri_quantity": float(quantity),
+    }
+
+
+def _validate_instruction(data: Any, index: int, steps: set) -> Dict[str, Any]:
+    where = f"instructions[{index}]"
+    if not isinstance(data, dict):
+        raise ValueError(f"{where} must be an object")
+    unknown = sorted(set(data) - set(INSTRUCTION_FIELDS))
+    if unknown:
+        raise ValueError(f"{where} has unknown fields: {', '.join(unknown)}")
+
+    step = data.get("step_number")
+    if isinstance(step, bool) or not isinstance(step, int):
+        raise ValueError(f"{where}.step_number must be an integer")
+    if step in steps:
+        raise ValueError(f"{where}.step_number {step} is repeated")
+    steps.add(step)
+    text = data.get("instruction_text")
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError(f"{where}.instruction_text is required")
+    return {"step_number": step, "instruction_text": text}
+
+
+def validate_recipe(item: Any) -> Dict[str, Any]:
+    """
+    Check one recipe in the POST /recipes create shape.
+
+    Returns:
+        The crud.create_recipe() dict for it, with every key present
+        (nested lists default to empty, category ids de-duplicated).
+
+    Raises:
+        ValueError: Describing the first problem found.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("Expected a recipe object")
+    name = item.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Recipe name is required")
+    if item.get("fooditem_id") is None:
+        raise ValueError("Recipe fooditem_id is required")
+    fooditem_id = _positive_int(item["fooditem_id"], "fooditem_id")
+    description = item.get("description")
+    if description is not None and not isinstance(description, str):
+        raise ValueError("description must be a string")
+
+    steps = set()
+    return {
+        "recipe_name": name,
+        "recipe_description": description,
+        "recipe_fooditem_id": fooditem_id,
+        "ingredients": [_validate_ingredient(data, index) for index, data in enumerate(_list(item, "ingredients"))],
+        "instructions": [
+            _validate_instruction(data, index, steps) for index, data in enumerate(_list(item, "instructions"))
+        ],
+        "category_ids": list(dict.fromkeys(
+            _positive_int(category_id, "category_ids") for category_id in _list(item, "category_ids")
+        )),
+    }
+
+
+async def read_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    Decode an NDJSON byte stream one line at a time.
+
+    Blank lines are skipped. A line that is not valid JSON is yielded as
+    the ValueError describing it, so it is reported at its position like
+    any other invalid recipe.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _decode_line(line)
+    if pending.strip():
+        yield _decode_line(pending)
+
+
+def _decode_line(line: bytes) -> Any:
+    try:
+        return encoding.loads(line)
+    except ValueError as e:
+        return ValueError(f"Malformed JSON: {e}")
+
+
+async def _iterate(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def import_recipes(
+    db: AsyncSession,
+    items: Union[Iterable[Any], AsyncIterable[Any]],
+    chunk_size: int
+) -> Dict[str, Any]:
+    """
+    Validate and create recipes, committing every ``chunk_size`` recipes.
+
+    Args:
+        items: Decoded recipes in the create shape (a list, or read_ndjson()).
+
+    Returns:
+        {"created", "failed", "recipe_ids", "errors"}: counts, the new
+        recipe_id per input position (None where the recipe failed), and
+        {"index", "detail"} per failed recipe in input order.
+    """
+    recipe_ids: List[Optional[int]] = []
+    errors: List[Dict[str, Any]] = []
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+
+    async def write_chunk() -> None:
+        try:
+            created, chunk_errors = await crud.create_recipes_bulk(db, [recipe_data for _, recipe_data in chunk])
+        except SQLAlchemyError:
+            logger.exception("Bulk import chunk of %d recipes failed", len(chunk))
+            created = [None] * len(chunk)
+            chunk_errors = dict.fromkeys(range(len(chunk)), "Batch could not be written")
+        for offset, (index, _) in enumerate(chunk):
+            recipe_ids[index] = created[offset]
+            if offset in chunk_errors:
+                errors.append({"index": index, "detail": chunk_errors[offset]})
+        chunk.clear()
+
+    async for item in _iterate(items):
+        index = len(recipe_ids)
+        recipe_ids.append(None)
+        try:
+            if isinstance(item, ValueError):
+                raise item
+            chunk.append((index, validate_recipe(item)))
+        except ValueError as e:
+            errors.append({"index": index, "detail": str(e)})
+            continue
+        if len(chunk) >= chunk_size:
+            await write_chunk()
+    if chunk:
+        await write_chunk()
+
+    errors.sort(key=lambda error: error["index"])
+    return {
+        "created": sum(recipe_id is not None for recipe_id in recipe_ids),
+        "failed": len(errors),
+        "recipe_ids": recipe_ids,
+        "errors": errors,
+    }
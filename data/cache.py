@@ -0,0 +1,170 @@
+"""
+In-process cache of encoded JSON responses for RecipeFirst read endpoints.
+
+Recipe reads are expensive (several queries plus nested serialization) but
+recipes change rarely, so GET /recipes and GET /recipes/{id} keep the final
+JSON bytes here. Entries are tagged with every entity embedded in them
+(recipe, ingredient, food item, unit type, category) and crud write
+operations invalidate exactly the tags they touch.
+
+The cache is per worker process; the TTL bounds staleness across workers
+and for writes made outside the API (seed scripts, manual SQL).
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from .config import settings
+
+# Tag attached to every cached recipe list page. Creating or deleting a
+# recipe changes page membership, so it drops all list pages at once.
+RECIPE_LIST_TAG = "recipes"
+
+
+def tag(kind: str, entity_id: Any) -> str:
+    """Build the invalidation tag for one entity, e.g. tag("recipe", 5)."""
+    return f"{kind}:{entity_id}"
+
+
+def recipe_tags(recipe) -> Set[str]:
+    """
+    Collect the tags for every entity embedded in a serialized recipe.
+
+    Only relationships already loaded on the instance are inspected, so this
+    never triggers extra queries for recipes read with a narrow ``include``.
+    """
+    tags = {tag("recipe", recipe.recipe_id)}
+    loaded = recipe.__dict__
+
+    for ri in loaded.get("ingredients", ()):
+        if ri.ri_ingredient_id is not None:
+            tags.add(tag("ingredient", ri.ri_ingredient_id))
+        if ri.ri_fooditem_id is not None:
+            tags.add(tag("fooditem", ri.ri_fooditem_id))
+        tags.add(tag("unit_type", ri.ri_unit_type_id))
+
+    for category in loaded.get("categories", ()):
+        tags.add(tag("category", category.category_id))
+
+    return tags
+
+
+def recipe_data_tags(data: Dict[str, Any]) -> Set[str]:
+    """
+    Collect the tags for a recipe already serialized as a dict.
+
+    Same as recipe_tags(), for the rows built by the read-only query layer
+    (queries.py). ``data`` must not have been trimmed with ``fields`` yet.
+    """
+    tags = {tag("recipe", data["recipe_id"])}
+
+    for ri in data.get("ingredients", ()):
+        if ri["ri_ingredient_id"] is not None:
+            tags.add(tag("ingredient", ri["ri_ingredient_id"]))
+        if ri["ri_fooditem_id"] is not None:
+            tags.add(tag("fooditem", ri["ri_fooditem_id"]))
+        tags.add(tag("unit_type", ri["ri_unit_type_id"]))
+
+    for category in data.get("categories", ()):
+        tags.add(tag("category", category["category_id"]))
+
+    return tags
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of encoded response bodies with a memory budget.
+
+    Entries are evicted least-recently-used first once the total size of the
+    cached bodies exceeds ``max_bytes``, and are treated as missing once they
+    are older than ``ttl`` seconds.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # key -> (stored_at, body, tags), ordered least- to most-recently used
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes, Set[str]]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached body for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, body, _ = entry
+        if time.monotonic() - stored_at > self.ttl:
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, key: Hashable, body: bytes, tags: Iterable[str]) -> None:
+        """Store a body under key, tagged for later invalidation."""
+        if len(body) > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        tags = set(tags)
+        self._entries[key] = (time.monotonic(), body, tags)
+        self.size += len(body)
+        for t in tags:
+            self._keys_by_tag.setdefault(t, set()).add(key)
+
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry carrying any of the given tags."""
+        for t in tags:
+            for key in list(self._keys_by_tag.get(t, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit/miss/eviction counters and current usage."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove one entry and its tag index references."""
+        _, body, tags = self._entries.pop(key)
+        self.size -= len(body)
+        for t in tags:
+            keys = self._keys_by_tag.get(t)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[t]
+
+
+# Global response cache shared by the recipe read endpoints
+response_cache = ResponseCache(settings.response_cache_max_bytes, settings.response_cache_ttl)
@@ -0,0 +1,121 @@
+"""
+Cached category hierarchy behind /categories/tree.
+
+The tree is the nested form of the Category table, each node carrying
+the number of recipes, meals and ingredients filed under it or any of its
+descendants. Counts are read with one grouped COUNT per junction table
+over the closure table (CategoryClosure joins every category to its whole
+subtree), so building the tree costs four queries whatever its size.
+
+An item filed under several categories of one subtree is counted once
+for that subtree's root.
+
+The encoded response body is kept in memory and served as-is, with no
+query, until a category or category-junction write calls invalidate().
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, func, distinct
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import encoding
+from .models import (
+    Category, CategoryClosure, Recipe, Meal, Ingredient,
+    RecipeCategory, MealCategory, IngredientCategory
+)
+
+logger = logging.getLogger(__name__)
+
+# count key -> (junction model, junction item column, item primary key)
+COUNTED_ITEMS = {
+    "recipe_count": (RecipeCategory, RecipeCategory.recipe_id, Recipe.recipe_id),
+    "meal_count": (MealCategory, MealCategory.meal_id, Meal.meal_id),
+    "ingredient_count": (IngredientCategory, IngredientCategory.ingredient_id, Ingredient.ingredient_id),
+}
+
+# Encoded {"categories": [...]} body; None until built or after invalidate()
+_body: Optional[bytes] = None
+
+# Bumped by invalidate(), so a build that raced with a write is not kept
+_generation = 0
+
+
+def invalidate() -> None:
+    """Drop the cached tree after a category or category-junction write."""
+    global _body, _generation
+    _body = None
+    _generation += 1
+
+
+async def _subtree_counts(db: AsyncSession, junction, item_column, item_key) -> Dict[int, int]:
+    """Map category_id -> distinct items filed under the category's subtree."""
+    # Joining the item table skips junction rows left behind by deletes on
+    # backends that do not enforce ON DELETE CASCADE
+    result = await db.execute(
+        select(CategoryClosure.ancestor_id, func.count(distinct(item_column)))
+        .join(junction, junction.category_id == CategoryClosure.descendant_id)
+        .join(item_key.class_, item_key == item_column)
+        .group_by(CategoryClosure.ancestor_id)
+    )
+    return dict(result.all())
+
+
+async def build_tree(db: AsyncSession) -> List[Dict[str, Any]]:
+    """
+    Read the category hierarchy with subtree counts.
+
+    Returns:
+        Root nodes ordered by category_id. Each node is {"category_id",
+        "category_name", "category_description", "parent_category_id",
+        "recipe_count", "meal_count", "ingredient_count", "children"}.
+        A category whose parent no longer exists is returned as a root.
+    """
+    result = await db.execute(
+        select(
+            Category.category_id,
+            Category.category_name,
+            Category.category_description,
+            Category.parent_category_id,
+        ).order_by(Category.category_id)
+    )
+    rows = result.all()
+
+    counts = {
+        key: await _subtree_counts(db, *columns)
+        for key, columns in COUNTED_ITEMS.items()
+    }
+
+    nodes = {}
+    for category_id, name, description, parent_id in rows:
+        node = {
+            "category_id": category_id,
+            "category_name": name,
+            "category_description": description,
+            "parent_category_id": parent_id,
+        }
+        for key, by_category in counts.items():
+            node[key] = by_category.get(category_id, 0)
+        node["children"] = []
+        nodes[category_id] = node
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_category_id"])
+        (parent["children"] if parent is not None else roots).append(node)
+    return roots
+
+
+async def get_tree_body(db: AsyncSession) -> bytes:
+    """Return the encoded tree response, building it if it is not cached."""
+    global _body
+    if _body is not None:
+        return _body
+
+    generation = _generation
+    body = encoding.dumps({"categories": await build_tree(db)})
+    logger.info("Built category tree (%d bytes)", len(body))
+    if generation == _generation:
+        _body = body
+    return body
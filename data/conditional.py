@@ -0,0 +1,99 @@
+"""
+Conditional request helpers (ETag / Last-Modified) for RecipeFirst read endpoints.
+
+Validators are derived from the write generations of the tables embedded in
+a representation (see versions.py) rather than from the response body, so a
+matching If-None-Match can be answered with 304 Not Modified before anything
+is queried, loaded or serialized.
+
+Write endpoints use the Prefer header (RFC 7240) the same way: the updated
+representation is only loaded and returned when the client asks for it
+with ``Prefer: return=representation``.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the parts identifying one representation.
+
+    Parts typically include the entity/collection name, the request options
+    that change the body (fields, include, page), and the version tuple.
+    """
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def http_date(dt: Optional[datetime]) -> Optional[str]:
+    """Format a UTC timestamp (naive or aware) as an HTTP-date for Last-Modified."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """
+    Response headers carrying the ETag and, when known, Last-Modified.
+
+    Versions only see writes made through this process. A write made
+    elsewhere (seed or migration scripts, manual SQL, another worker) is
+    not reflected until the ETag's ``settings.etag_max_age`` period ends,
+    and does not move Last-Modified at all.
+    """
+    headers = {"ETag": etag}
+    formatted = http_date(last_modified)
+    if formatted:
+        headers["Last-Modified"] = formatted
+    return headers
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Return True if the request's If-None-Match matches etag.
+
+    Uses the weak comparison required for If-None-Match, so a ``W/`` prefix
+    on the client's copy is ignored. If-Modified-Since is deliberately not
+    evaluated: Last-Modified has one-second resolution, so two writes in
+    the same second would look unchanged; the ETag tells them apart.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """Build an empty 304 response carrying the validator headers."""
+    return Response(status_code=304, headers=headers)
+
+
+# Sent with a representation returned because of Prefer: return=representation
+REPRESENTATION_APPLIED = {"Preference-Applied": "return=representation"}
+
+
+def prefers_representation(request: Request) -> bool:
+    """Return True if the request carries Prefer: return=representation."""
+    for header in request.headers.getlist("prefer"):
+        for preference in header.split(","):
+            # Preferences may carry parameters: return=representation; foo=bar
+            token = preference.split(";", 1)[0].strip().lower().replace(" ", "")
+            if token == "return=representation":
+                return True
+    return False
@@ -25,6 +25,25 @@ class Settings(BaseSettings):
     api_title: str = "RecipeFirst API"
     api_version: str = "1.0.0"
 
+    # Pagination configuration
+    max_page_size: int = 1000  # Upper bound on rows returned by any list endpoint
+    count_cache_ttl: float = 30.0  # Seconds to cache X-Total-Count table counts
+    max_batch_ids: int = 100  # Upper bound on ids accepted by ?ids= multi-get requests
+
+    # Search configuration
+    full_text_search: bool = True  # Use the FTS5 / tsvector index when migrated (LIKE otherwise)
+    fuzzy_search_threshold: float = 0.3  # Minimum trigram similarity for ?fuzzy=true matches (pg_trgm default)
+
+    # Response cache configuration (encoded recipe responses)
+    response_cache_max_bytes: int = 64 * 1024 * 1024  # Memory budget for cached bodies
+    response_cache_ttl: float = 300.0  # Seconds before a cached body is considered stale
+
+    # Conditional request configuration
+    etag_max_age: float = 300.0  # Seconds an ETag stays valid without a write through this process
+
+    # Bulk import configuration
+    bulk_import_chunk_size: int = 500  # Recipes written per transaction by POST /recipes/bulk
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -5,34 +5,95 @@ This module replaces the raw SQL functions from db.py with SQLAlchemy queries.
 All functions use async/await and proper eager loading to prevent N+1 queries.
 
 Organization:
+- Write helpers (2 functions)
 - User operations (4 functions)
-- Recipe operations (5 functions)
-- Ingredient operations (5 functions)
+- Recipe operations (8 functions)
+- Ingredient operations (6 functions)
 - RecipeIngredient junction operations (4 functions)
-- Category operations (5 functions)
-- FoodItem operations (5 functions)
+- Category operations (6 functions)
+- FoodItem operations (6 functions)
 - Meal operations (5 functions)
 - UnitType operations (5 functions)
-- Search operations (4 functions)
-- Utility operations (2 functions)
+- Search operations (5 functions)
+- Utility operations (4 functions)
+- Pagination helpers (1 function)
 """
 
-from sqlalchemy import select, delete as sql_delete, or_, func
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import select, insert, update, delete as sql_delete, or_, func, literal, inspect
+from sqlalchemy.orm import selectinload, joinedload, noload, lazyload, aliased
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Collection, Iterable, Tuple, Callable, FrozenSet
+from collections import defaultdict, deque
+import itertools
 import logging
 
 from .models import (
     Recipe, Ingredient, FoodItem, Meal, Category, UnitType, User,
     RecipeIngredient, RecipeInstruction, MealFoodItem,
-    RecipeCategory, IngredientCategory, MealCategory
+    RecipeCategory, IngredientCategory, MealCategory, CategoryClosure
 )
 from .security import get_password_hash
+from .pagination import count_cache, apply_page
+from .cache import response_cache, tag, RECIPE_LIST_TAG
+from . import search
+from . import fuzzy as fuzzy_search
+from . import autocomplete
+from . import ingredient_index
+from . import pantry
+from . import category_tree
+from . import expansion
+from . import recipe_graph
+from . import units
+from .expansion import RecipeCycleError
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# Write Helpers
+# ============================================================================
+
+# Writes return what the database generated (ids, created_at, updated_at)
+# with the statement itself where the dialect supports RETURNING (SQLite
+# 3.35+, PostgreSQL): the ORM already appends RETURNING to INSERTs, and
+# _update_row() issues UPDATE ... RETURNING. Neither then needs the
+# refreshing SELECT that used to follow every commit.
+
+async def _load_server_values(db: AsyncSession, obj) -> None:
+    """
+    Load the columns the database filled in during the last flush.
+
+    A no-op when the INSERT / UPDATE returned them; otherwise one SELECT
+    of just those columns.
+    """
+    expired = inspect(obj).expired_attributes
+    if expired:
+        await db.refresh(obj, attribute_names=list(expired))
+
+
+async def _update_row(db: AsyncSession, model, where, data: Dict[str, Any]):
+    """
+    UPDATE one row from a dict and return it, or None if no row matches.
+
+    Keys that are not columns of ``model`` are ignored. Uses a single
+    UPDATE ... RETURNING where the dialect supports it, instead of a
+    SELECT, the UPDATE and a refreshing SELECT; elsewhere the row is read
+    back after the UPDATE.
+
+    Args:
+        where: Criteria selecting the row.
+    """
+    values = {key: value for key, value in data.items() if key in model.__table__.columns}
+    if values:
+        stmt = update(model).where(*where).values(**values)
+        if db.bind.dialect.update_returning:
+            result = await db.execute(stmt.returning(model), execution_options={"populate_existing": True})
+            return result.scalar_one_or_none()
+        await db.execute(stmt, execution_options={"synchronize_session": False})
+    result = await db.execute(select(model).where(*where), execution_options={"populate_existing": True})
+    return result.scalar_one_or_none()
+
+
 # ============================================================================
 # User Operations
 # ============================================================================
@@ -89,7 +150,7 @@ async def create_user(db: AsyncSession, user_data: Dict[str, Any]) -> User:
     user = User(**data)
     db.add(user)
     await db.commit()
-    await db.refresh(user)
+    await _load_server_values(db, user)
     return user
 
 
@@ -97,53 +158,139 @@ async def create_user(db: AsyncSession, user_data: Dict[str, Any]) -> User:
 # Recipe Operations
 # ============================================================================
 
-async def get_all_recipes(db: AsyncSession) -> List[Recipe]:
+def _recipe_load_options(include: Optional[Collection[str]] = None):
     """
-    Get all recipes with nested ingredients, instructions, and categories.
+    Eager-load options for a Recipe with the nested data used by serialize_recipe().
 
-    Uses selectinload to prevent N+1 queries. This replaces the old implementation
-    that executed 1 + (3 * N) queries with just 2-5 queries total.
+    Args:
+        include: Relationships to load ("ingredients", "instructions",
+                 "categories"); None loads all of them. Excluded
+                 relationships get noload() so the model-level
+                 lazy="selectin" does not issue queries for them.
     """
-    stmt = (
-        select(Recipe)
-        .options(
-            # Load ingredients with their related data
+    options = []
+
+    if include is None or "ingredients" in include:
+        # Load ingredients with their related data
+        options += [
             selectinload(Recipe.ingredients)
                 .selectinload(RecipeIngredient.ingredient),
             selectinload(Recipe.ingredients)
                 .selectinload(RecipeIngredient.fooditem),
             selectinload(Recipe.ingredients)
                 .selectinload(RecipeIngredient.unit_type),
-            # Load instructions
-            selectinload(Recipe.instructions),
-            # Load categories
-            selectinload(Recipe.categories)
-        )
-    )
+        ]
+    else:
+        options.append(noload(Recipe.ingredients))
+
+    if include is None or "instructions" in include:
+        options.append(selectinload(Recipe.instructions))
+    else:
+        options.append(noload(Recipe.instructions))
+
+    if include is None or "categories" in include:
+        options.append(selectinload(Recipe.categories))
+    else:
+        options.append(noload(Recipe.categories))
+
+    return options
+
+
+async def get_all_recipes(db: AsyncSession) -> List[Recipe]:
+    """
+    Get all recipes with nested ingredients, instructions, and categories.
+
+    Uses selectinload to prevent N+1 queries. This replaces the old implementation
+    that executed 1 + (3 * N) queries with just 2-5 queries total.
+    """
+    stmt = select(Recipe).options(*_recipe_load_options())
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
-async def get_recipe_by_id(db: AsyncSession, recipe_id: int) -> Optional[Recipe]:
-    """Get a single recipe by ID with all nested data."""
+async def get_recipes_page(
+    db: AsyncSession,
+    limit: int,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+    include: Optional[Collection[str]] = None
+) -> List[Recipe]:
+    """
+    Get one page of recipes ordered by recipe_id.
+
+    With ``after_id`` the page starts strictly after that recipe (keyset
+    pagination). Unlike OFFSET, the seek is a primary-key range scan however
+    deep the page is, so per-page cost does not grow with the table.
+    ``include`` limits the relationships loaded (see _recipe_load_options()).
+    """
+    stmt = select(Recipe).options(*_recipe_load_options(include))
+    stmt = apply_page(stmt, Recipe.recipe_id, limit, offset, after_id)
+
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+async def stream_recipe_batches(db: AsyncSession, batch_size: int = 500) -> AsyncIterator[List[Recipe]]:
+    """
+    Stream every recipe with nested data in batches of ``batch_size``.
+
+    Rows are fetched with a server-side cursor (``yield_per``) and the eager
+    loads run once per batch. Each batch (with its ingredient and instruction
+    rows) is expunged from the session once the caller asks for the next one,
+    so memory stays bounded by the batch size rather than the size of the
+    catalog; only the shared lookup rows (units, categories, ingredients)
+    stay in the identity map.
+    """
+    stmt = (
+        select(Recipe)
+        .options(*_recipe_load_options())
+        .order_by(Recipe.recipe_id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream(stmt)
+    async for batch in result.scalars().partitions():
+        yield batch
+        # Caller is done with this batch; drop it from the identity map
+        for recipe in batch:
+            db.expunge(recipe)
+
+
+async def get_recipe_by_id(
+    db: AsyncSession,
+    recipe_id: int,
+    include: Optional[Collection[str]] = None
+) -> Optional[Recipe]:
+    """Get a single recipe by ID with nested data (all relationships unless include is given)."""
     stmt = (
         select(Recipe)
         .where(Recipe.recipe_id == recipe_id)
-        .options(
-            selectinload(Recipe.ingredients)
-                .selectinload(RecipeIngredient.ingredient),
-            selectinload(Recipe.ingredients)
-                .selectinload(RecipeIngredient.fooditem),
-            selectinload(Recipe.ingredients)
-                .selectinload(RecipeIngredient.unit_type),
-            selectinload(Recipe.instructions),
-            selectinload(Recipe.categories)
-        )
+        .options(*_recipe_load_options(include))
     )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
+async def _commit_recipe(
+    db: AsyncSession,
+    graph: recipe_graph.DependencyGraph,
+    recipe_id: int,
+    previous: Optional[Tuple[int, FrozenSet[int]]]
+) -> None:
+    """
+    Commit a recipe write whose dependency graph change is already made.
+
+    If the commit fails, the session is rolled back and the recipe's graph
+    entry is restored to ``previous`` (graph.entry() before the write, None
+    for a new recipe), so the graph keeps matching the committed rows.
+    """
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        graph.restore_recipe(recipe_id, previous)
+        raise
+
+
 async def create_recipe(db: AsyncSession, recipe_data: Dict[str, Any]) -> Recipe:
     """
     Create a new recipe with ingredients, instructions, and categories.
@@ -156,7 +303,13 @@ async def create_recipe(db: AsyncSession, recipe_data: Dict[str, Any]) -> Recipe
             - ingredients: List[Dict] (optional)
             - instructions: List[Dict] (optional)
             - category_ids: List[int] (optional)
+
+    Raises:
+        RecipeCycleError: If the recipe would make its food item require
+                          itself through the food items it uses.
     """
+    graph = await recipe_graph.get_graph(db)
+
     # Extract nested data
     ingredients_data = recipe_data.pop('ingredients', [])
     instructions_data = recipe_data.pop('instructions', [])
@@ -192,81 +345,361 @@ async def create_recipe(db: AsyncSession, recipe_data: Dict[str, Any]) -> Recipe
         )
         db.add(instruction)
 
-    await db.commit()
-    await db.refresh(recipe)
+    try:
+        graph.set_recipe(recipe.recipe_id, recipe.recipe_fooditem_id, recipe_graph.ingredient_fooditem_ids(ingredients_data))
+    except RecipeCycleError:
+        await db.rollback()
+        raise
 
-    # Load nested data
+    await _commit_recipe(db, graph, recipe.recipe_id, None)
+    count_cache.invalidate('Recipe')
+    response_cache.invalidate(RECIPE_LIST_TAG)
+    _record_name("recipe", recipe.recipe_id, recipe.recipe_name)
+    ingredient_index.record_recipe(recipe.recipe_id, ingredients_data)
+    pantry.invalidate()
+    expansion.invalidate(recipe.recipe_fooditem_id)
+    if category_ids:
+        category_tree.invalidate()
+
+    # Load nested data (the INSERTs returned the recipe's own columns)
     return await get_recipe_by_id(db, recipe.recipe_id)
 
 
-async def update_recipe(db: AsyncSession, recipe_id: int, recipe_data: Dict[str, Any]) -> Optional[Recipe]:
+# (column, label) of every table a bulk-imported recipe may refer to
+_RECIPE_REFERENCES = (
+    (FoodItem.fooditem_id, "Food item"),
+    (Ingredient.ingredient_id, "Ingredient"),
+    (UnitType.id, "Unit type"),
+    (Category.category_id, "Category"),
+)
+
+# Dependency graph keys of bulk-imported recipes until they have an id;
+# negative, so they never collide with a real recipe_id
+_placeholder_ids = itertools.count(-1, -1)
+
+
+def _recipe_references(recipe_data: Dict[str, Any]) -> Iterable[Tuple[Any, int]]:
+    """(column, id) of every row a create_recipe() dict refers to."""
+    yield FoodItem.fooditem_id, recipe_data['recipe_fooditem_id']
+    for ing_data in recipe_data['ingredients']:
+        if ing_data['ri_ingredient_id'] is not None:
+            yield Ingredient.ingredient_id, ing_data['ri_ingredient_id']
+        if ing_data['ri_fooditem_id'] is not None:
+            yield FoodItem.fooditem_id, ing_data['ri_fooditem_id']
+        yield UnitType.id, ing_data['ri_unit_type_id']
+    for category_id in recipe_data['category_ids']:
+        yield Category.category_id, category_id
+
+
+async def create_recipes_bulk(
+    db: AsyncSession,
+    recipes: List[Dict[str, Any]]
+) -> Tuple[List[Optional[int]], Dict[int, str]]:
+    """
+    Create a batch of recipes in one transaction (POST /recipes/bulk).
+
+    Each recipe is a create_recipe() dict as returned by
+    bulk_import.validate_recipe(), so every key is present. Recipes that
+    refer to rows that do not exist, or that would make a food item
+    require itself, are skipped. The rest are written with one multi-row
+    INSERT per child table and committed together. The recipe rows use
+    INSERT ... RETURNING with the ids in input order, batched where the
+    backend can order a multi-row RETURNING (PostgreSQL) and one row per
+    statement otherwise (SQLite).
+
+    Returns:
+        Tuple of (new recipe_id per input position, None where skipped;
+        error message per skipped position).
+
+    Raises:
+        SQLAlchemyError: If the batch cannot be written. It is rolled back
+                         and nothing is recorded.
+    """
+    graph = await recipe_graph.get_graph(db)
+    errors: Dict[int, str] = {}
+
+    # One IN query per referenced table for the whole batch
+    wanted = defaultdict(set)
+    for recipe_data in recipes:
+        for column, key_id in _recipe_references(recipe_data):
+            wanted[column].add(key_id)
+    found = {}
+    for column, key_ids in wanted.items():
+        result = await db.execute(select(column).where(column.in_(key_ids)))
+        found[column] = set(result.scalars())
+
+    labels = dict(_RECIPE_REFERENCES)
+    placeholders: Dict[int, int] = {}
+    for position, recipe_data in enumerate(recipes):
+        missing = next(
+            ((column, key_id) for column, key_id in _recipe_references(recipe_data) if key_id not in found[column]),
+            None
+        )
+        if missing is not None:
+            errors[position] = f"{labels[missing[0]]} {missing[1]} does not exist"
+            continue
+        # Checked in input order, so a recipe may use food items produced
+        # by recipes earlier in the batch
+        placeholder = next(_placeholder_ids)
+        try:
+            graph.set_recipe(
+                placeholder,
+                recipe_data['recipe_fooditem_id'],
+                recipe_graph.ingredient_fooditem_ids(recipe_data['ingredients'])
+            )
+        except RecipeCycleError as e:
+            errors[position] = str(e)
+            continue
+        placeholders[position] = placeholder
+
+    recipe_ids: List[Optional[int]] = [None] * len(recipes)
+    if not placeholders:
+        return recipe_ids, errors
+
+    # Core INSERTs against the tables: the ORM bulk path leaves None values
+    # out of each row and splits rows with different None columns into
+    # separate statements
+    accepted = list(placeholders)
+    columns = ('recipe_name', 'recipe_description', 'recipe_fooditem_id')
+    try:
+        # sort_by_parameter_order: the new ids come back in the order of
+        # the parameter rows (on backends that cannot guarantee this for a
+        # multi-row INSERT, SQLAlchemy inserts the rows one at a time)
+        recipe_table = Recipe.__table__
+        result = await db.execute(
+            insert(recipe_table).returning(recipe_table.c.recipe_id, sort_by_parameter_order=True),
+            [{column: recipes[position][column] for column in columns} for position in accepted]
+        )
+        for position, recipe_id in zip(accepted, result.scalars()):
+            recipe_ids[position] = recipe_id
+
+        ingredient_rows = []
+        instruction_rows = []
+        category_rows = []
+        for position in accepted:
+            recipe_id = recipe_ids[position]
+            recipe_data = recipes[position]
+            ingredient_rows.extend(dict(ing_data, ri_recipe_id=recipe_id) for ing_data in recipe_data['ingredients'])
+            instruction_rows.extend(dict(inst_data, recipe_id=recipe_id) for inst_data in recipe_data['instructions'])
+            category_rows.extend(
+                {'recipe_id': recipe_id, 'category_id': category_id} for category_id in recipe_data['category_ids']
+            )
+        for model, rows in (
+            (RecipeIngredient, ingredient_rows),
+            (RecipeInstruction, instruction_rows),
+            (RecipeCategory, category_rows),
+        ):
+            if rows:
+                await db.execute(insert(model.__table__), rows)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        for placeholder in placeholders.values():
+            graph.remove_recipe(placeholder)
+        raise
+
+    fooditem_ids = set()
+    for position in accepted:
+        recipe_id = recipe_ids[position]
+        recipe_data = recipes[position]
+        # Same edges the placeholder was checked with, so this cannot fail
+        graph.remove_recipe(placeholders[position])
+        graph.set_recipe(
+            recipe_id,
+            recipe_data['recipe_fooditem_id'],
+            recipe_graph.ingredient_fooditem_ids(recipe_data['ingredients'])
+        )
+        _record_name("recipe", recipe_id, recipe_data['recipe_name'])
+        ingredient_index.record_recipe(recipe_id, recipe_data['ingredients'])
+        fooditem_ids.add(recipe_data['recipe_fooditem_id'])
+
+    count_cache.invalidate('Recipe')
+    response_cache.invalidate(RECIPE_LIST_TAG)
+    pantry.invalidate()
+    expansion.invalidate(*fooditem_ids)
+    if any(recipes[position]['category_ids'] for position in accepted):
+        category_tree.invalidate()
+    return recipe_ids, errors
+
+
+async def _sync_children(
+    db: AsyncSession,
+    existing: Iterable[Any],
+    incoming: List[Dict[str, Any]],
+    key_columns: Tuple[str, ...],
+    make: Callable[[Dict[str, Any]], Any]
+) -> bool:
+    """
+    Diff loaded child rows against request dicts by natural key.
+
+    Rows pair up by their ``key_columns`` values (rows sharing a key pair
+    up in order). Paired rows get only their changed columns set, so the
+    flush UPDATEs just those; unpaired existing rows are deleted and
+    unpaired dicts inserted with ``make``. The unit of work batches each
+    kind into one executemany / multi-row statement per table.
+
+    Returns:
+        True if any row was inserted, updated or deleted.
+    """
+    unpaired = defaultdict(deque)
+    for child in existing:
+        unpaired[tuple(getattr(child, column) for column in key_columns)].append(child)
+
+    changed = False
+    for data in incoming:
+        matches = unpaired.get(tuple(data.get(column) for column in key_columns))
+        if not matches:
+            db.add(make(data))
+            changed = True
+            continue
+        child = matches.popleft()
+        for column, value in data.items():
+            if hasattr(child, column) and getattr(child, column) != value:
+                setattr(child, column, value)
+                changed = True
+
+    for children in unpaired.values():
+        for child in children:
+            await db.delete(child)
+            changed = True
+    return changed
+
+
+async def _sync_junction(db: AsyncSession, model, owner_column, owner_id: int, item_column, item_ids: Iterable[int]) -> bool:
+    """
+    Make the junction rows of one owner link exactly ``item_ids``.
+
+    Issues at most one bulk DELETE of the links that went away and one
+    executemany INSERT of the new ones; links kept keep their created_at.
+
+    Returns:
+        True if any link was added or removed.
+    """
+    result = await db.execute(select(item_column).where(owner_column == owner_id))
+    current = set(result.scalars())
+    wanted = dict.fromkeys(item_ids)  # de-duplicated, in request order
+
+    removed = current - wanted.keys()
+    added = [item_id for item_id in wanted if item_id not in current]
+    if removed:
+        await db.execute(
+            sql_delete(model).where(owner_column == owner_id, item_column.in_(removed))
+        )
+    if added:
+        await db.execute(
+            insert(model),
+            [{owner_column.key: owner_id, item_column.key: item_id} for item_id in added]
+        )
+    return bool(removed or added)
+
+
+async def update_recipe(
+    db: AsyncSession,
+    recipe_id: int,
+    recipe_data: Dict[str, Any],
+    reload: bool = False
+) -> Optional[Recipe]:
     """
     Update a recipe.
 
-    Uses the delete/recreate pattern for nested relationships (ingredients, instructions, categories)
-    to match the behavior of the original implementation.
+    Nested lists (ingredients, instructions, category_ids) replace the
+    recipe's current ones, but are diffed against the existing rows by
+    natural key (ingredient / food item id, step number, category id):
+    only rows that changed are written, and unchanged rows keep their ids
+    and created_at. Only the child rows being diffed are loaded.
+
+    Returns:
+        None if the recipe does not exist. Otherwise the recipe with all
+        nested data freshly loaded when ``reload`` is set, else the updated
+        Recipe row without loaded relationships (not for serializing).
+
+    Raises:
+        RecipeCycleError: If the new ingredients or food item would make a
+                          food item require itself.
     """
-    recipe = await get_recipe_by_id(db, recipe_id)
-    if not recipe:
-        return None
+    graph = await recipe_graph.get_graph(db)
 
     # Extract nested data
     ingredients_data = recipe_data.pop('ingredients', None)
     instructions_data = recipe_data.pop('instructions', None)
     category_ids = recipe_data.pop('category_ids', None)
 
+    # Load the recipe with just the children that are diffed below, and
+    # without the lookup rows of its ingredients
+    stmt = (
+        select(Recipe)
+        .where(Recipe.recipe_id == recipe_id)
+        .options(
+            selectinload(Recipe.ingredients).lazyload('*') if ingredients_data is not None
+            else lazyload(Recipe.ingredients),
+            selectinload(Recipe.instructions) if instructions_data is not None
+            else lazyload(Recipe.instructions),
+            lazyload(Recipe.categories),
+        )
+    )
+    result = await db.execute(stmt)
+    recipe = result.scalar_one_or_none()
+    if not recipe:
+        return None
+    old_fooditem_id = recipe.recipe_fooditem_id
+    previous = graph.entry(recipe_id)
+
     # Update scalar fields
     for key, value in recipe_data.items():
         if hasattr(recipe, key):
             setattr(recipe, key, value)
 
-    # Update categories (delete/recreate pattern)
-    if category_ids is not None:
-        # Delete existing
-        await db.execute(
-            sql_delete(RecipeCategory).where(RecipeCategory.recipe_id == recipe_id)
-        )
-        # Create new
-        for category_id in category_ids:
-            recipe_category = RecipeCategory(
-                recipe_id=recipe_id,
-                category_id=category_id
-            )
-            db.add(recipe_category)
+    # Update categories (diffed by category_id)
+    categories_changed = category_ids is not None and await _sync_junction(
+        db, RecipeCategory, RecipeCategory.recipe_id, recipe_id, RecipeCategory.category_id, category_ids
+    )
 
-    # Update ingredients (delete/recreate pattern)
-    if ingredients_data is not None:
-        # Delete existing
-        await db.execute(
-            sql_delete(RecipeIngredient).where(RecipeIngredient.ri_recipe_id == recipe_id)
-        )
-        # Create new
-        for ing_data in ingredients_data:
-            ingredient = RecipeIngredient(
-                ri_recipe_id=recipe_id,
-                **ing_data
-            )
-            db.add(ingredient)
+    # Update ingredients (diffed by ingredient / food item id)
+    ingredients_changed = ingredients_data is not None and await _sync_children(
+        db, recipe.ingredients, ingredients_data, ("ri_ingredient_id", "ri_fooditem_id"),
+        lambda data: RecipeIngredient(ri_recipe_id=recipe_id, **data)
+    )
 
-    # Update instructions (delete/recreate pattern)
+    # Update instructions (diffed by step_number)
     if instructions_data is not None:
-        # Delete existing
-        await db.execute(
-            sql_delete(RecipeInstruction).where(RecipeInstruction.recipe_id == recipe_id)
+        await _sync_children(
+            db, recipe.instructions, instructions_data, ("step_number",),
+            lambda data: RecipeInstruction(recipe_id=recipe_id, **data)
         )
-        # Create new
-        for inst_data in instructions_data:
-            instruction = RecipeInstruction(
-                recipe_id=recipe_id,
-                **inst_data
-            )
-            db.add(instruction)
 
-    await db.commit()
-    await db.refresh(recipe)
+    try:
+        if ingredients_data is not None:
+            graph.set_recipe(
+                recipe_id,
+                recipe_data.get('recipe_fooditem_id', old_fooditem_id),
+                recipe_graph.ingredient_fooditem_ids(ingredients_data)
+            )
+        elif recipe_data.get('recipe_fooditem_id', old_fooditem_id) != old_fooditem_id:
+            await recipe_graph.refresh_recipe(db, recipe_id)
+    except RecipeCycleError:
+        await db.rollback()
+        raise
 
-    # Reload with nested data
-    return await get_recipe_by_id(db, recipe_id)
+    await _commit_recipe(db, graph, recipe_id, previous)
+    response_cache.invalidate(tag("recipe", recipe_id))
+    if 'recipe_name' in recipe_data:
+        _record_name("recipe", recipe_id, recipe_data['recipe_name'])
+    if ingredients_changed:
+        ingredient_index.record_recipe(recipe_id, ingredients_data)
+    if ingredients_changed or 'recipe_fooditem_id' in recipe_data:
+        pantry.invalidate()
+        expansion.invalidate(old_fooditem_id, recipe_data.get('recipe_fooditem_id', old_fooditem_id))
+    if categories_changed:
+        category_tree.invalidate()
+
+    if not reload:
+        return recipe
+    # populate_existing: the loaded collections predate the diff
+    result = await db.execute(
+        select(Recipe).where(Recipe.recipe_id == recipe_id).options(*_recipe_load_options()),
+        execution_options={"populate_existing": True}
+    )
+    return result.scalar_one()
 
 
 async def delete_recipe(db: AsyncSession, recipe_id: int) -> bool:
@@ -280,8 +713,17 @@ async def delete_recipe(db: AsyncSession, recipe_id: int) -> bool:
     if not recipe:
         return False
 
+    fooditem_id = recipe.recipe_fooditem_id
     await db.delete(recipe)
     await db.commit()
+    count_cache.invalidate('Recipe')
+    response_cache.invalidate(tag("recipe", recipe_id), RECIPE_LIST_TAG)
+    _forget_names("recipe", recipe_id)
+    ingredient_index.forget_recipes(recipe_id)
+    pantry.invalidate()
+    expansion.invalidate(fooditem_id)
+    recipe_graph.forget_recipes(recipe_id)
+    category_tree.invalidate()
     return True
 
 
@@ -289,9 +731,22 @@ async def delete_recipe(db: AsyncSession, recipe_id: int) -> bool:
 # Ingredient Operations
 # ============================================================================
 
-async def get_all_ingredients(db: AsyncSession) -> List[Ingredient]:
-    """Get all ingredients."""
-    stmt = select(Ingredient)
+async def get_all_ingredients(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after_id: Optional[int] = None
+) -> List[Ingredient]:
+    """
+    Get all ingredients, ordered by primary key.
+
+    Args:
+        limit: Maximum number of rows to return (None for no limit).
+        offset: Number of rows to skip (limit/offset mode).
+        after_id: Return only rows with a primary key greater than this
+                  (cursor mode).
+    """
+    stmt = apply_page(select(Ingredient), Ingredient.ingredient_id, limit, offset, after_id)
     result = await db.execute(stmt)
     return result.scalars().all()
 
@@ -301,27 +756,50 @@ async def get_ingredient_by_id(db: AsyncSession, ingredient_id: int) -> Optional
     return await db.get(Ingredient, ingredient_id)
 
 
+async def get_ingredients_by_ids(db: AsyncSession, ingredient_ids: Collection[int]) -> List[Ingredient]:
+    """Get the ingredients with the given IDs in one query (unknown IDs are skipped)."""
+    stmt = (
+        select(Ingredient)
+        .where(Ingredient.ingredient_id.in_(ingredient_ids))
+        .order_by(Ingredient.ingredient_id)
+    )
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
 async def create_ingredient(db: AsyncSession, ingredient_data: Dict[str, Any]) -> Ingredient:
-    """Create a new ingredient."""
+    """
+    Create a new ingredient.
+
+    Raises:
+        ValueError: If ingredient_density is given and not positive.
+    """
+    units.validate_density(ingredient_data.get('ingredient_density'))
     ingredient = Ingredient(**ingredient_data)
     db.add(ingredient)
     await db.commit()
-    await db.refresh(ingredient)
+    count_cache.invalidate('Ingredient')
+    _record_name("ingredient", ingredient.ingredient_id, ingredient.ingredient_name)
+    await _load_server_values(db, ingredient)
     return ingredient
 
 
 async def update_ingredient(db: AsyncSession, ingredient_id: int, ingredient_data: Dict[str, Any]) -> Optional[Ingredient]:
-    """Update an ingredient."""
-    ingredient = await db.get(Ingredient, ingredient_id)
+    """
+    Update an ingredient.
+
+    Raises:
+        ValueError: If ingredient_density is given and not positive.
+    """
+    units.validate_density(ingredient_data.get('ingredient_density'))
+    ingredient = await _update_row(db, Ingredient, [Ingredient.ingredient_id == ingredient_id], ingredient_data)
     if not ingredient:
         return None
 
-    for key, value in ingredient_data.items():
-        if hasattr(ingredient, key):
-            setattr(ingredient, key, value)
-
     await db.commit()
-    await db.refresh(ingredient)
+    response_cache.invalidate(tag("ingredient", ingredient_id))
+    if 'ingredient_name' in ingredient_data:
+        _record_name("ingredient", ingredient_id, ingredient_data['ingredient_name'])
     return ingredient
 
 
@@ -333,6 +811,13 @@ async def delete_ingredient(db: AsyncSession, ingredient_id: int) -> bool:
 
     await db.delete(ingredient)
     await db.commit()
+    count_cache.invalidate('Ingredient')
+    response_cache.invalidate(tag("ingredient", ingredient_id))
+    _forget_names("ingredient", ingredient_id)
+    ingredient_index.forget_key("ingredient", ingredient_id)
+    pantry.invalidate()
+    expansion.invalidate()
+    category_tree.invalidate()
     return True
 
 
@@ -356,51 +841,100 @@ async def get_recipe_ingredients(db: AsyncSession, recipe_id: int) -> List[Recip
 
 
 async def add_ingredient_to_recipe(db: AsyncSession, recipe_id: int, ingredient_data: Dict[str, Any]) -> RecipeIngredient:
-    """Add an ingredient to a recipe."""
+    """
+    Add an ingredient to a recipe.
+
+    Raises:
+        RecipeCycleError: If the added food item would make the recipe's
+                          food item require itself.
+    """
+    graph = await recipe_graph.get_graph(db)
+    previous = graph.entry(recipe_id)
+
     recipe_ingredient = RecipeIngredient(
         ri_recipe_id=recipe_id,
         **ingredient_data
     )
     db.add(recipe_ingredient)
-    await db.commit()
-    await db.refresh(recipe_ingredient)
+    if ingredient_data.get('ri_fooditem_id') is not None:
+        try:
+            await recipe_graph.refresh_recipe(db, recipe_id)
+        except RecipeCycleError:
+            await db.rollback()
+            raise
+    await _commit_recipe(db, graph, recipe_id, previous)
+    response_cache.invalidate(tag("recipe", recipe_id))
+    await ingredient_index.refresh_recipe(db, recipe_id)
+    pantry.invalidate()
+    await expansion.invalidate_recipe(db, recipe_id)
+    await _load_server_values(db, recipe_ingredient)
+
+    # Load related data (the INSERT returned the row itself)
+    return await _load_recipe_ingredient(db, recipe_ingredient.ri_id)
+
+
+async def update_recipe_ingredient(
+    db: AsyncSession,
+    recipe_id: int,
+    ingredient_id: int,
+    update_data: Dict[str, Any],
+    reload: bool = False
+) -> Optional[RecipeIngredient]:
+    """
+    Update a recipe ingredient.
 
-    # Load related data
-    stmt = (
-        select(RecipeIngredient)
-        .where(RecipeIngredient.ri_id == recipe_ingredient.ri_id)
-        .options(
-            selectinload(RecipeIngredient.ingredient),
-            selectinload(RecipeIngredient.fooditem),
-            selectinload(RecipeIngredient.unit_type)
-        )
+    Returns:
+        None if it does not exist. Otherwise the updated row, with its
+        ingredient, food item and unit type loaded when ``reload`` is set.
+
+    Raises:
+        RecipeCycleError: If a new food item would make the recipe's food
+                          item require itself.
+    """
+    # Read before the UPDATE below, which a first build would otherwise see
+    graph = await recipe_graph.get_graph(db)
+    previous = graph.entry(recipe_id)
+
+    recipe_ingredient = await _update_row(
+        db, RecipeIngredient,
+        [RecipeIngredient.ri_recipe_id == recipe_id, RecipeIngredient.ri_id == ingredient_id],
+        update_data
     )
-    result = await db.execute(stmt)
-    return result.scalar_one()
+    if not recipe_ingredient:
+        return None
+
+    if 'ri_ingredient_id' in update_data or 'ri_fooditem_id' in update_data:
+        try:
+            await recipe_graph.refresh_recipe(db, recipe_id)
+        except RecipeCycleError:
+            await db.rollback()
+            raise
+
+    await _commit_recipe(db, graph, recipe_id, previous)
+    response_cache.invalidate(tag("recipe", recipe_id))
+    if 'ri_ingredient_id' in update_data or 'ri_fooditem_id' in update_data:
+        await ingredient_index.refresh_recipe(db, recipe_id)
+        pantry.invalidate()
+    await expansion.invalidate_recipe(db, recipe_id)
+    if reload:
+        return await _load_recipe_ingredient(db, ingredient_id)
+    return recipe_ingredient
 
 
-async def update_recipe_ingredient(db: AsyncSession, recipe_id: int, ingredient_id: int, update_data: Dict[str, Any]) -> Optional[RecipeIngredient]:
-    """Update a recipe ingredient."""
+async def _load_recipe_ingredient(db: AsyncSession, ri_id: int) -> RecipeIngredient:
+    """Read a recipe ingredient with its lookup rows in one joined SELECT."""
     stmt = (
         select(RecipeIngredient)
-        .where(
-            RecipeIngredient.ri_recipe_id == recipe_id,
-            RecipeIngredient.ri_id == ingredient_id
+        .where(RecipeIngredient.ri_id == ri_id)
+        .options(
+            joinedload(RecipeIngredient.ingredient),
+            joinedload(RecipeIngredient.fooditem),
+            joinedload(RecipeIngredient.unit_type)
         )
     )
-    result = await db.execute(stmt)
-    recipe_ingredient = result.scalar_one_or_none()
-
-    if not recipe_ingredient:
-        return None
-
-    for key, value in update_data.items():
-        if hasattr(recipe_ingredient, key):
-            setattr(recipe_ingredient, key, value)
-
-    await db.commit()
-    await db.refresh(recipe_ingredient)
-    return recipe_ingredient
+    # populate_existing: an update may have changed the foreign keys
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    return result.scalar_one()
 
 
 async def remove_ingredient_from_recipe(db: AsyncSession, recipe_id: int, ingredient_id: int) -> bool:
@@ -412,6 +946,12 @@ async def remove_ingredient_from_recipe(db: AsyncSession, recipe_id: int, ingred
         )
     )
     await db.commit()
+    response_cache.invalidate(tag("recipe", recipe_id))
+    if result.rowcount:
+        await ingredient_index.refresh_recipe(db, recipe_id)
+        pantry.invalidate()
+        await expansion.invalidate_recipe(db, recipe_id)
+        await recipe_graph.refresh_recipe(db, recipe_id)
     return result.rowcount > 0
 
 
@@ -419,9 +959,22 @@ async def remove_ingredient_from_recipe(db: AsyncSession, recipe_id: int, ingred
 # Category Operations
 # ============================================================================
 
-async def get_all_categories(db: AsyncSession) -> List[Category]:
-    """Get all categories."""
-    stmt = select(Category)
+async def get_all_categories(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after_id: Optional[int] = None
+) -> List[Category]:
+    """
+    Get all categories, ordered by primary key.
+
+    Args:
+        limit: Maximum number of rows to return (None for no limit).
+        offset: Number of rows to skip (limit/offset mode).
+        after_id: Return only rows with a primary key greater than this
+                  (cursor mode).
+    """
+    stmt = apply_page(select(Category), Category.category_id, limit, offset, after_id)
     result = await db.execute(stmt)
     return result.scalars().all()
 
@@ -451,8 +1004,12 @@ async def create_category(db: AsyncSession, category_data: Dict[str, Any]) -> Ca
     category = Category(**cleaned)
     db.add(category)
     try:
+        await db.flush()  # Get category_id
+        await _closure_attach(db, category.category_id, category.parent_category_id, new=True)
         await db.commit()
-        await db.refresh(category)
+        count_cache.invalidate('Category')
+        category_tree.invalidate()
+        await _load_server_values(db, category)
     except Exception as e:
         await db.rollback()
         logger.error(f"Failed to create category: {e}")
@@ -462,17 +1019,36 @@ async def create_category(db: AsyncSession, category_data: Dict[str, Any]) -> Ca
 
 
 async def update_category(db: AsyncSession, category_id: int, category_data: Dict[str, Any]) -> Optional[Category]:
-    """Update a category."""
+    """
+    Update a category.
+
+    Changing parent_category_id moves the category's whole subtree.
+
+    Raises:
+        ValueError: If the new parent is the category itself or one of its
+                    descendants.
+    """
     category = await db.get(Category, category_id)
     if not category:
         return None
 
+    old_parent_id = category.parent_category_id
     for key, value in category_data.items():
         if hasattr(category, key):
             setattr(category, key, value)
 
+    new_parent_id = category.parent_category_id
+    if new_parent_id != old_parent_id:
+        if new_parent_id is not None and new_parent_id in await get_category_subtree_ids(db, category_id):
+            await db.rollback()
+            raise ValueError("A category cannot be moved under itself or one of its descendants")
+        await _closure_detach(db, category_id)
+        await _closure_attach(db, category_id, new_parent_id)
+
     await db.commit()
-    await db.refresh(category)
+    response_cache.invalidate(tag("category", category_id))
+    category_tree.invalidate()
+    await _load_server_values(db, category)
     return category
 
 
@@ -482,21 +1058,155 @@ async def delete_category(db: AsyncSession, category_id: int) -> bool:
     if not category:
         return False
 
+    # Children get parent_category_id SET NULL, which changes their embedded form
+    result = await db.execute(
+        select(Category.category_id).where(Category.parent_category_id == category_id)
+    )
+    child_ids = result.scalars().all()
+
+    # Unlink the category from the closure; its children's subtrees become roots
+    await _closure_detach(db, category_id, include_self=True)
     await db.delete(category)
     await db.commit()
+    count_cache.invalidate('Category')
+    response_cache.invalidate(
+        tag("category", category_id),
+        *(tag("category", child_id) for child_id in child_ids)
+    )
+    category_tree.invalidate()
     return True
 
 
+async def get_category_subtree_ids(db: AsyncSession, category_id: int) -> List[int]:
+    """Get the IDs of a category and all of its descendants (one indexed lookup)."""
+    result = await db.execute(
+        select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+    )
+    return result.scalars().all()
+
+
+async def rebuild_category_closure(db: AsyncSession) -> None:
+    """
+    Recompute the whole CategoryClosure table from parent_category_id.
+
+    For categories inserted without the crud operations (seeding, data
+    migration); the caller commits.
+    """
+    tree = select(
+        Category.category_id.label("ancestor_id"),
+        Category.category_id.label("descendant_id"),
+        literal(0).label("depth")
+    ).cte("tree", recursive=True)
+    tree = tree.union_all(
+        select(tree.c.ancestor_id, Category.category_id, tree.c.depth + 1)
+        .join(Category, Category.parent_category_id == tree.c.descendant_id)
+    )
+    await db.execute(sql_delete(CategoryClosure))
+    await db.execute(
+        insert(CategoryClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(tree.c.ancestor_id, tree.c.descendant_id, tree.c.depth)
+        )
+    )
+
+
+async def _closure_attach(db: AsyncSession, category_id: int, parent_id: Optional[int], new: bool = False) -> None:
+    """
+    Link a category's subtree under parent_id in the closure table.
+
+    Every ancestor of the parent (the parent included) gains every node of
+    the subtree. ``new`` adds the category's own depth-0 row first.
+    """
+    if new:
+        db.add(CategoryClosure(ancestor_id=category_id, descendant_id=category_id, depth=0))
+        await db.flush()
+    if parent_id is None:
+        return
+    above = aliased(CategoryClosure)
+    below = aliased(CategoryClosure)
+    await db.execute(
+        insert(CategoryClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .select_from(above)
+            .join(below, below.ancestor_id == category_id)  # cross product: ancestors x subtree
+            .where(above.descendant_id == parent_id)
+        )
+    )
+
+
+async def _closure_detach(db: AsyncSession, category_id: int, include_self: bool = False) -> None:
+    """
+    Unlink a category's subtree from the category's ancestors.
+
+    Rows inside the subtree stay. ``include_self`` also removes the
+    category's own rows, leaving its children's subtrees as roots.
+    """
+    ancestors = select(CategoryClosure.ancestor_id).where(CategoryClosure.descendant_id == category_id)
+    if not include_self:
+        ancestors = ancestors.where(CategoryClosure.ancestor_id != category_id)
+    subtree = select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+    # Materialize both sides first: a DELETE may not read the table it
+    # deletes from in a subquery on every backend
+    ancestor_ids = (await db.execute(ancestors)).scalars().all()
+    subtree_ids = (await db.execute(subtree)).scalars().all()
+    if ancestor_ids and subtree_ids:
+        await db.execute(
+            sql_delete(CategoryClosure).where(
+                CategoryClosure.ancestor_id.in_(ancestor_ids),
+                CategoryClosure.descendant_id.in_(subtree_ids)
+            )
+        )
+
+
+def _in_category(category_column, category_id: int, include_descendants: bool):
+    """Condition on a junction table's category_id, optionally for the whole subtree."""
+    if not include_descendants:
+        return category_column == category_id
+    return category_column.in_(
+        select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+    )
+
+
 # ============================================================================
 # FoodItem Operations
 # ============================================================================
 
-async def get_all_food_items(db: AsyncSession) -> List[FoodItem]:
-    """Get all food items with their associated recipes."""
+def _food_item_recipes_option():
+    """
+    Load a FoodItem's recipes for serialize_food_item().
+
+    Only basic recipe columns are serialized, so the recipes' own
+    relationships (lazy="selectin" on the model) are not loaded.
+    """
+    return selectinload(FoodItem.recipes).options(
+        noload(Recipe.ingredients), noload(Recipe.instructions), noload(Recipe.categories)
+    )
+
+
+async def get_all_food_items(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after_id: Optional[int] = None
+) -> List[FoodItem]:
+    """
+    Get all food items with their associated recipes, ordered by primary key.
+
+    Producing recipes are only selectin-loaded for the food items on the
+    requested page.
+
+    Args:
+        limit: Maximum number of rows to return (None for no limit).
+        offset: Number of rows to skip (limit/offset mode).
+        after_id: Return only rows with a primary key greater than this
+                  (cursor mode).
+    """
     stmt = (
         select(FoodItem)
         .options(selectinload(FoodItem.recipes))
     )
+    stmt = apply_page(stmt, FoodItem.fooditem_id, limit, offset, after_id)
     result = await db.execute(stmt)
     return result.scalars().all()
 
@@ -512,30 +1222,60 @@ async def get_food_item_by_id(db: AsyncSession, fooditem_id: int) -> Optional[Fo
     return result.scalar_one_or_none()
 
 
+async def get_food_items_by_ids(db: AsyncSession, fooditem_ids: Collection[int]) -> List[FoodItem]:
+    """
+    Get the food items with the given IDs and their recipes (unknown IDs are skipped).
+
+    One IN query for the food items plus one shared selectin load for the
+    recipes of all of them.
+    """
+    stmt = (
+        select(FoodItem)
+        .where(FoodItem.fooditem_id.in_(fooditem_ids))
+        .options(_food_item_recipes_option())
+        .order_by(FoodItem.fooditem_id)
+    )
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
 async def create_food_item(db: AsyncSession, food_item_data: Dict[str, Any]) -> FoodItem:
     """Create a new food item."""
     food_item = FoodItem(**food_item_data)
     db.add(food_item)
     await db.commit()
-    await db.refresh(food_item)
+    count_cache.invalidate('FoodItem')
+    _record_name("fooditem", food_item.fooditem_id, food_item.fooditem_name)
 
-    # Reload with relationships to prevent lazy loading issues
+    # Load the (empty) recipes relationship to prevent lazy loading issues
     return await get_food_item_by_id(db, food_item.fooditem_id)
 
 
-async def update_food_item(db: AsyncSession, fooditem_id: int, food_item_data: Dict[str, Any]) -> Optional[FoodItem]:
-    """Update a food item."""
-    food_item = await db.get(FoodItem, fooditem_id)
+async def update_food_item(
+    db: AsyncSession,
+    fooditem_id: int,
+    food_item_data: Dict[str, Any],
+    reload: bool = False
+) -> Optional[FoodItem]:
+    """
+    Update a food item.
+
+    Returns:
+        None if the food item does not exist. Otherwise the food item with
+        its recipes loaded when ``reload`` is set, else just the updated
+        row.
+    """
+    food_item = await _update_row(db, FoodItem, [FoodItem.fooditem_id == fooditem_id], food_item_data)
     if not food_item:
         return None
 
-    for key, value in food_item_data.items():
-        if hasattr(food_item, key):
-            setattr(food_item, key, value)
-
     await db.commit()
-    await db.refresh(food_item)
+    response_cache.invalidate(tag("fooditem", fooditem_id))
+    if 'fooditem_name' in food_item_data:
+        _record_name("fooditem", fooditem_id, food_item_data['fooditem_name'])
 
+    if not reload:
+        return food_item
     # Reload with relationships to prevent lazy loading issues
     return await get_food_item_by_id(db, fooditem_id)
 
@@ -546,8 +1286,29 @@ async def delete_food_item(db: AsyncSession, fooditem_id: int) -> bool:
     if not food_item:
         return False
 
+    # Recipes producing this food item are removed by ON DELETE CASCADE
+    result = await db.execute(
+        select(Recipe.recipe_id).where(Recipe.recipe_fooditem_id == fooditem_id)
+    )
+    recipe_ids = result.scalars().all()
+
     await db.delete(food_item)
     await db.commit()
+    count_cache.invalidate('FoodItem', 'Recipe')
+    response_cache.invalidate(
+        tag("fooditem", fooditem_id),
+        RECIPE_LIST_TAG,
+        *(tag("recipe", recipe_id) for recipe_id in recipe_ids)
+    )
+    _forget_names("fooditem", fooditem_id)
+    _forget_names("recipe", *recipe_ids)
+    ingredient_index.forget_key("fooditem", fooditem_id)
+    ingredient_index.forget_recipes(*recipe_ids)
+    pantry.invalidate()
+    expansion.invalidate()
+    recipe_graph.forget_fooditem(fooditem_id)
+    if recipe_ids:
+        category_tree.invalidate()
     return True
 
 
@@ -555,28 +1316,63 @@ async def delete_food_item(db: AsyncSession, fooditem_id: int) -> bool:
 # Meal Operations
 # ============================================================================
 
-async def get_all_meals(db: AsyncSession) -> List[Meal]:
-    """Get all meals with nested food items and categories."""
-    stmt = (
-        select(Meal)
-        .options(
-            selectinload(Meal.meal_food_items).selectinload(MealFoodItem.food_item),
-            selectinload(Meal.categories)
-        )
-    )
+def _meal_load_options(include: Optional[Collection[str]] = None):
+    """
+    Eager-load options for a Meal with the nested data used by serialize_meal().
+
+    Args:
+        include: Relationships to load ("food_items", "categories"); None
+                 loads both. The viewonly Meal.food_items shortcut is never
+                 needed by the serializer, so it is always noload()ed.
+    """
+    options = [noload(Meal.food_items)]
+
+    if include is None or "food_items" in include:
+        options.append(selectinload(Meal.meal_food_items).selectinload(MealFoodItem.food_item))
+    else:
+        options.append(noload(Meal.meal_food_items))
+
+    if include is None or "categories" in include:
+        options.append(selectinload(Meal.categories))
+    else:
+        options.append(noload(Meal.categories))
+
+    return options
+
+
+async def get_all_meals(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+    include: Optional[Collection[str]] = None
+) -> List[Meal]:
+    """
+    Get all meals with nested food items and categories, ordered by primary key.
+
+    Args:
+        limit: Maximum number of rows to return (None for no limit).
+        offset: Number of rows to skip (limit/offset mode).
+        after_id: Return only rows with a primary key greater than this
+                  (cursor mode).
+        include: Relationships to load (see _meal_load_options()).
+    """
+    stmt = select(Meal).options(*_meal_load_options(include))
+    stmt = apply_page(stmt, Meal.meal_id, limit, offset, after_id)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
-async def get_meal_by_id(db: AsyncSession, meal_id: int) -> Optional[Meal]:
-    """Get a single meal by ID with nested data."""
+async def get_meal_by_id(
+    db: AsyncSession,
+    meal_id: int,
+    include: Optional[Collection[str]] = None
+) -> Optional[Meal]:
+    """Get a single meal by ID with nested data (all relationships unless include is given)."""
     stmt = (
         select(Meal)
         .where(Meal.meal_id == meal_id)
-        .options(
-            selectinload(Meal.meal_food_items).selectinload(MealFoodItem.food_item),
-            selectinload(Meal.categories)
-        )
+        .options(*_meal_load_options(include))
     )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
@@ -610,56 +1406,83 @@ async def create_meal(db: AsyncSession, meal_data: Dict[str, Any]) -> Meal:
         db.add(meal_category)
 
     await db.commit()
-    await db.refresh(meal)
+    count_cache.invalidate('Meal')
+    _record_name("meal", meal.meal_id, meal.meal_name)
+    if category_ids:
+        category_tree.invalidate()
 
-    # Reload with nested data
+    # Load nested data (the INSERTs returned the meal's own columns)
     return await get_meal_by_id(db, meal.meal_id)
 
 
-async def update_meal(db: AsyncSession, meal_id: int, meal_data: Dict[str, Any]) -> Optional[Meal]:
-    """Update a meal."""
-    meal = await get_meal_by_id(db, meal_id)
-    if not meal:
-        return None
+async def update_meal(
+    db: AsyncSession,
+    meal_id: int,
+    meal_data: Dict[str, Any],
+    reload: bool = False
+) -> Optional[Meal]:
+    """
+    Update a meal.
+
+    fooditem_ids and category_ids replace the current lists, diffed
+    against the existing rows as in update_recipe().
 
+    Returns:
+        None if the meal does not exist. Otherwise the meal with all nested
+        data freshly loaded when ``reload`` is set, else the updated Meal
+        row without loaded relationships (not for serializing).
+    """
     # Extract nested data
     fooditem_ids = meal_data.pop('fooditem_ids', None)
     category_ids = meal_data.pop('category_ids', None)
 
+    # Load the meal with just the food item rows diffed below
+    stmt = (
+        select(Meal)
+        .where(Meal.meal_id == meal_id)
+        .options(
+            noload(Meal.food_items),
+            selectinload(Meal.meal_food_items).lazyload('*') if fooditem_ids is not None
+            else lazyload(Meal.meal_food_items),
+            lazyload(Meal.categories),
+        )
+    )
+    result = await db.execute(stmt)
+    meal = result.scalar_one_or_none()
+    if not meal:
+        return None
+
     # Update scalar fields
     for key, value in meal_data.items():
         if hasattr(meal, key):
             setattr(meal, key, value)
 
-    # Update food items (delete/recreate pattern)
+    # Update food items (diffed by fooditem_id)
     if fooditem_ids is not None:
-        await db.execute(
-            sql_delete(MealFoodItem).where(MealFoodItem.mf_meal_id == meal_id)
+        await _sync_children(
+            db, meal.meal_food_items, [{"mf_fooditem_id": fooditem_id} for fooditem_id in fooditem_ids],
+            ("mf_fooditem_id",), lambda data: MealFoodItem(mf_meal_id=meal_id, **data)
         )
-        for fooditem_id in fooditem_ids:
-            meal_food_item = MealFoodItem(
-                mf_meal_id=meal_id,
-                mf_fooditem_id=fooditem_id
-            )
-            db.add(meal_food_item)
 
-    # Update categories (delete/recreate pattern)
-    if category_ids is not None:
-        await db.execute(
-            sql_delete(MealCategory).where(MealCategory.meal_id == meal_id)
-        )
-        for category_id in category_ids:
-            meal_category = MealCategory(
-                meal_id=meal_id,
-                category_id=category_id
-            )
-            db.add(meal_category)
+    # Update categories (diffed by category_id)
+    categories_changed = category_ids is not None and await _sync_junction(
+        db, MealCategory, MealCategory.meal_id, meal_id, MealCategory.category_id, category_ids
+    )
 
     await db.commit()
-    await db.refresh(meal)
-
-    # Reload with nested data
-    return await get_meal_by_id(db, meal_id)
+    if 'meal_name' in meal_data:
+        _record_name("meal", meal_id, meal_data['meal_name'])
+    if categories_changed:
+        category_tree.invalidate()
+
+    if not reload:
+        return meal
+    # populate_existing: the loaded collections predate the diff
+    result = await db.execute(
+        select(Meal).where(Meal.meal_id == meal_id).options(*_meal_load_options()),
+        execution_options={"populate_existing": True}
+    )
+    return result.scalar_one()
 
 
 async def delete_meal(db: AsyncSession, meal_id: int) -> bool:
@@ -670,6 +1493,9 @@ async def delete_meal(db: AsyncSession, meal_id: int) -> bool:
 
     await db.delete(meal)
     await db.commit()
+    count_cache.invalidate('Meal')
+    _forget_names("meal", meal_id)
+    category_tree.invalidate()
     return True
 
 
@@ -677,9 +1503,22 @@ async def delete_meal(db: AsyncSession, meal_id: int) -> bool:
 # UnitType Operations
 # ============================================================================
 
-async def get_all_unit_types(db: AsyncSession) -> List[UnitType]:
-    """Get all unit types."""
-    stmt = select(UnitType)
+async def get_all_unit_types(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after_id: Optional[int] = None
+) -> List[UnitType]:
+    """
+    Get all unit types, ordered by primary key.
+
+    Args:
+        limit: Maximum number of rows to return (None for no limit).
+        offset: Number of rows to skip (limit/offset mode).
+        after_id: Return only rows with a primary key greater than this
+                  (cursor mode).
+    """
+    stmt = apply_page(select(UnitType), UnitType.id, limit, offset, after_id)
     result = await db.execute(stmt)
     return result.scalars().all()
 
@@ -690,26 +1529,45 @@ async def get_unit_type_by_id(db: AsyncSession, unit_type_id: int) -> Optional[U
 
 
 async def create_unit_type(db: AsyncSession, unit_type_data: Dict[str, Any]) -> UnitType:
-    """Create a new unit type."""
+    """
+    Create a new unit type.
+
+    Raises:
+        ValueError: If unit_dimension / unit_base_factor are invalid (see
+                    units.validate_unit()).
+    """
+    units.validate_unit(unit_type_data.get('unit_dimension'), unit_type_data.get('unit_base_factor'))
     unit_type = UnitType(**unit_type_data)
     db.add(unit_type)
     await db.commit()
-    await db.refresh(unit_type)
+    count_cache.invalidate('UnitType')
+    units.invalidate()
+    await _load_server_values(db, unit_type)
     return unit_type
 
 
 async def update_unit_type(db: AsyncSession, unit_type_id: int, unit_type_data: Dict[str, Any]) -> Optional[UnitType]:
-    """Update a unit type."""
-    unit_type = await db.get(UnitType, unit_type_id)
+    """
+    Update a unit type.
+
+    Raises:
+        ValueError: If the resulting unit_dimension / unit_base_factor are
+                    invalid (see units.validate_unit()).
+    """
+    unit_type = await _update_row(db, UnitType, [UnitType.id == unit_type_id], unit_type_data)
     if not unit_type:
         return None
 
-    for key, value in unit_type_data.items():
-        if hasattr(unit_type, key):
-            setattr(unit_type, key, value)
+    # Checked on the updated row, which merges the request with the stored values
+    try:
+        units.validate_unit(unit_type.unit_dimension, unit_type.unit_base_factor)
+    except ValueError:
+        await db.rollback()
+        raise
 
     await db.commit()
-    await db.refresh(unit_type)
+    response_cache.invalidate(tag("unit_type", unit_type_id))
+    units.invalidate()
     return unit_type
 
 
@@ -721,88 +1579,173 @@ async def delete_unit_type(db: AsyncSession, unit_type_id: int) -> bool:
 
     await db.delete(unit_type)
     await db.commit()
+    count_cache.invalidate('UnitType')
+    response_cache.invalidate(tag("unit_type", unit_type_id))
+    units.invalidate()
     return True
 
 
 # ============================================================================
 # Search Operations
 # ============================================================================
-
-async def search_recipes(db: AsyncSession, q: str) -> List[Recipe]:
-    """Search recipes by name."""
-    stmt = (
-        select(Recipe)
-        .where(Recipe.recipe_name.like(f"%{q}%"))
-        .options(
-            selectinload(Recipe.ingredients),
-            selectinload(Recipe.instructions),
-            selectinload(Recipe.categories)
-        )
-    )
+#
+# Each search first asks the full-text index (search.py) for ranked ids and
+# loads those rows; without an index the original LIKE '%q%' scan is used.
+# The two paths match differently:
+# - full-text: every query word must start a word of the name or
+#   description ("chick" finds "Chicken Soup", "icken" does not), and
+#   recipes are matched on their description as well as their name;
+# - LIKE: the whole query is a substring of one column ("icken" finds
+#   "Chicken Soup"), recipes by name only, as before the index existed.
+# ``limit`` is applied in SQL on both paths. With ``fuzzy=True`` the ids come
+# from trigram similarity on the name instead (fuzzy.py), which tolerates
+# typos ("spagetti") that neither the index nor LIKE can match.
+
+# entity -> (model, primary key column, columns matched by the LIKE fallback)
+_SEARCH_TARGETS = {
+    "recipe": (Recipe, Recipe.recipe_id, (Recipe.recipe_name,)),
+    "meal": (Meal, Meal.meal_id, (Meal.meal_name, Meal.meal_description)),
+    "fooditem": (FoodItem, FoodItem.fooditem_id, (FoodItem.fooditem_name, FoodItem.fooditem_description)),
+    "ingredient": (Ingredient, Ingredient.ingredient_id, (Ingredient.ingredient_name, Ingredient.ingredient_description)),
+}
+
+
+def _record_name(entity: str, entity_id: int, name: Optional[str]) -> None:
+    """Update the in-process name indexes (fuzzy, autocomplete) after a create or rename."""
+    fuzzy_search.record(entity, entity_id, name)
+    autocomplete.record(entity, entity_id, name)
+
+
+def _forget_names(entity: str, *entity_ids: int) -> None:
+    """Remove deleted rows from the in-process name indexes."""
+    fuzzy_search.forget(entity, *entity_ids)
+    autocomplete.forget(entity, *entity_ids)
+
+
+def _like_condition(entity: str, q: str):
+    """LIKE '%q%' condition over an entity's searchable columns."""
+    _, _, columns = _SEARCH_TARGETS[entity]
+    return or_(*(column.like(f"%{q}%") for column in columns))
+
+
+async def _search(
+    db: AsyncSession,
+    entity: str,
+    q: str,
+    options: List,
+    limit: Optional[int],
+    fuzzy: bool = False
+) -> List[Any]:
+    """Run one search: fuzzy or full-text ranked ids when available, LIKE otherwise."""
+    model, key, _ = _SEARCH_TARGETS[entity]
+    stmt = select(model).options(*options)
+
+    if fuzzy:
+        ids = await fuzzy_search.search_ids(db, entity, q, limit)
+    else:
+        ids = await search.search_ids(db, entity, q, limit)
+    if ids == []:
+        return []
+    if ids is not None:
+        result = await db.execute(stmt.where(key.in_(ids)))
+        rank = {row_id: position for position, row_id in enumerate(ids)}
+        return sorted(result.scalars().all(), key=lambda row: rank[getattr(row, key.key)])
+
+    stmt = stmt.where(_like_condition(entity, q)).order_by(key)
+    if limit is not None:
+        stmt = stmt.limit(limit)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
-async def search_meals(db: AsyncSession, q: str) -> List[Meal]:
+async def search_recipes(
+    db: AsyncSession,
+    q: str,
+    include: Optional[Collection[str]] = None,
+    limit: Optional[int] = None,
+    fuzzy: bool = False
+) -> List[Recipe]:
+    """
+    Search recipes by name.
+
+    With the full-text index, query words match word prefixes of the name
+    or the description; without it, the query matches any substring of
+    the name (see Search Operations above).
+    """
+    return await _search(db, "recipe", q, _recipe_load_options(include), limit, fuzzy)
+
+
+async def search_meals(
+    db: AsyncSession,
+    q: str,
+    include: Optional[Collection[str]] = None,
+    limit: Optional[int] = None,
+    fuzzy: bool = False
+) -> List[Meal]:
     """Search meals by name or description."""
-    stmt = (
-        select(Meal)
-        .where(
-            or_(
-                Meal.meal_name.like(f"%{q}%"),
-                Meal.meal_description.like(f"%{q}%")
-            )
-        )
-        .options(
-            selectinload(Meal.meal_food_items).selectinload(MealFoodItem.food_item),
-            selectinload(Meal.categories)
-        )
-    )
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    return await _search(db, "meal", q, _meal_load_options(include), limit, fuzzy)
 
 
-async def search_food_items(db: AsyncSession, q: str) -> List[FoodItem]:
-    """Search food items by name or description."""
-    stmt = (
-        select(FoodItem)
-        .where(
-            or_(
-                FoodItem.fooditem_name.like(f"%{q}%"),
-                FoodItem.fooditem_description.like(f"%{q}%")
-            )
-        )
-        .options(selectinload(FoodItem.recipes))
-    )
-    result = await db.execute(stmt)
-    return result.scalars().all()
+async def search_food_items(
+    db: AsyncSession,
+    q: str,
+    limit: Optional[int] = None,
+    fuzzy: bool = False
+) -> List[FoodItem]:
+    """Search food items by name or description (with their recipes' basic info)."""
+    return await _search(db, "fooditem", q, [_food_item_recipes_option()], limit, fuzzy)
 
 
-async def search_ingredients(db: AsyncSession, q: str) -> List[Ingredient]:
+async def search_ingredients(
+    db: AsyncSession,
+    q: str,
+    limit: Optional[int] = None,
+    fuzzy: bool = False
+) -> List[Ingredient]:
     """Search ingredients by name or description."""
-    stmt = (
-        select(Ingredient)
-        .where(
-            or_(
-                Ingredient.ingredient_name.like(f"%{q}%"),
-                Ingredient.ingredient_description.like(f"%{q}%")
-            )
-        )
-    )
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    return await _search(db, "ingredient", q, [], limit, fuzzy)
+
+
+async def count_search_matches(db: AsyncSession, entity: str, q: str, fuzzy: bool = False) -> int:
+    """
+    Count the matches of a search without loading them.
+
+    Args:
+        entity: "recipe", "meal", "fooditem" or "ingredient".
+        fuzzy: Count trigram-similar names (see search_recipes()).
+    """
+    if fuzzy:
+        return await fuzzy_search.count_matches(db, entity, q)
+    total = await search.count_matches(db, entity, q)
+    if total is None:
+        model, _, _ = _SEARCH_TARGETS[entity]
+        result = await db.execute(select(func.count()).select_from(model).where(_like_condition(entity, q)))
+        total = result.scalar_one()
+    return total
 
 
 # ============================================================================
 # Utility Operations
 # ============================================================================
 
-async def get_recipes_by_category(db: AsyncSession, category_id: int) -> List[Recipe]:
-    """Get all recipes in a specific category."""
+async def get_recipes_by_category(
+    db: AsyncSession,
+    category_id: int,
+    include_descendants: bool = False
+) -> List[Recipe]:
+    """
+    Get all recipes in a specific category.
+
+    With include_descendants, recipes in any subcategory (at any depth)
+    are included too, each once.
+    """
+    in_category = select(RecipeCategory.recipe_id).where(
+        _in_category(RecipeCategory.category_id, category_id, include_descendants)
+    )
     stmt = (
         select(Recipe)
-        .join(RecipeCategory)
-        .where(RecipeCategory.category_id == category_id)
+        .where(Recipe.recipe_id.in_(in_category))
+        .order_by(Recipe.recipe_id)
         .options(
             selectinload(Recipe.ingredients),
             selectinload(Recipe.instructions),
@@ -828,3 +1771,50 @@ async def get_recipes_by_food_item_id(db: AsyncSession, food_item_id: int) -> Li
     )
     result = await db.execute(stmt)
     return result.scalars().all()
+
+
+async def get_meals_by_category(
+    db: AsyncSession,
+    category_id: int,
+    include_descendants: bool = False
+) -> List[Meal]:
+    """Get all meals in a category (and its subcategories, see get_recipes_by_category())."""
+    in_category = select(MealCategory.meal_id).where(
+        _in_category(MealCategory.category_id, category_id, include_descendants)
+    )
+    stmt = select(Meal).where(Meal.meal_id.in_(in_category)).order_by(Meal.meal_id).options(*_meal_load_options())
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+async def get_ingredients_by_category(
+    db: AsyncSession,
+    category_id: int,
+    include_descendants: bool = False
+) -> List[Ingredient]:
+    """Get all ingredients in a category (and its subcategories, see get_recipes_by_category())."""
+    in_category = select(IngredientCategory.ingredient_id).where(
+        _in_category(IngredientCategory.category_id, category_id, include_descendants)
+    )
+    stmt = select(Ingredient).where(Ingredient.ingredient_id.in_(in_category)).order_by(Ingredient.ingredient_id)
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+# ============================================================================
+# Pagination Helpers
+# ============================================================================
+
+async def count_rows(db: AsyncSession, model) -> int:
+    """
+    Count the rows of a model's table, using the shared TTL count cache.
+
+    Used for the X-Total-Count header on list endpoints.
+    """
+    key = model.__tablename__
+    total = count_cache.get(key)
+    if total is None:
+        result = await db.execute(select(func.count()).select_from(model))
+        total = result.scalar_one()
+        count_cache.set(key, total)
+    return total
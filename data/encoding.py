@@ -0,0 +1,53 @@
+"""
+Fast JSON response encoding for RecipeFirst application.
+
+Serializer output is encoded straight to bytes with pydantic-core's Rust
+encoder (installed with pydantic), skipping FastAPI's jsonable_encoder pass
+over the already-plain dicts. datetime values are encoded natively in the
+same ISO 8601 form as datetime.isoformat(), and the output is compact UTF-8
+exactly like FastAPI's JSONResponse.
+
+The only textual difference from json.dumps() is float exponent notation
+(``1e-7`` rather than ``1e-07``); the values are identical. NaN and
+infinite floats, which JSON cannot represent, are encoded as null rather
+than as bare ``NaN`` / ``Infinity`` tokens.
+
+loads() is the matching decoder for request bodies that are read by hand
+rather than through FastAPI's Body() (POST /recipes/bulk).
+"""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import from_json, to_json
+
+
+def dumps(content: Any) -> bytes:
+    """Encode serializer output (dicts, lists, scalars, datetimes) to JSON bytes."""
+    return to_json(content, inf_nan_mode="null")
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decode JSON bytes with pydantic-core's parser.
+
+    Raises:
+        ValueError: If the data is not valid JSON.
+    """
+    return from_json(data)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response that bypasses jsonable_encoder.
+
+    Routes return this directly with serializer output (or with bytes that
+    were already encoded, e.g. from the response cache).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,360 @@
+"""
+Compound-recipe expansion behind /recipes/{id}/expanded.
+
+A RecipeIngredient row may use a FoodItem instead of an Ingredient, and
+that FoodItem is produced by other recipes, so recipes form a DAG over
+food items. Expanding a recipe resolves every food item row through its
+producing recipe down to raw ingredients, multiplying quantities along
+the way: a recipe is taken to yield one unit of its food item, so 2 of
+"dough" contributes twice the dough recipe's ingredients.
+
+Rules:
+- when several recipes produce a food item, the one with the lowest
+  recipe_id is used, so expansions are deterministic
+- a food item no recipe produces (bought ready-made) is a leaf and is
+  reported under "food_items"
+- totals are summed per (ingredient, unit type); quantities in different
+  units of one ingredient are listed separately
+- a food item that (transitively) requires itself raises RecipeCycleError
+
+Each food item's expansion is memoized together with the set of food
+items it was resolved through, and dropped when a recipe producing any of
+them changes (see invalidate()). The graph below the uncached food items
+is read with one recursive CTE, so an expansion costs a bounded number of
+queries however deep the nesting.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from .models import Recipe, RecipeIngredient, Ingredient, FoodItem, UnitType
+from .queries import get_names
+
+logger = logging.getLogger(__name__)
+
+# (ingredient_id or fooditem_id, unit_type_id); unit_type_id is None for a
+# food item counted in units of itself (see expand())
+AmountKey = Tuple[int, Optional[int]]
+
+# (ri_ingredient_id, ri_fooditem_id, ri_unit_type_id, ri_quantity)
+Row = Tuple[Optional[int], Optional[int], int, float]
+
+
+class RecipeCycleError(ValueError):
+    """A food item requires itself through its producing recipes."""
+
+    def __init__(self, cycle: List[int]):
+        self.cycle = cycle
+        path = " -> ".join(str(fooditem_id) for fooditem_id in cycle)
+        super().__init__(f"Recipe cycle through food items {path}")
+
+
+class Expansion(NamedTuple):
+    """Raw requirements for one unit of a food item (or one recipe batch)."""
+
+    ingredients: Dict[AmountKey, float]
+    leaves: Dict[AmountKey, float]
+    # fooditem_id -> recipe_id used to produce it
+    producers: Dict[int, int]
+    # Food items this expansion was resolved through (itself included)
+    depends: FrozenSet[int]
+
+
+class _Graph:
+    """Producing recipes and ingredient rows read from the database."""
+
+    def __init__(self):
+        # fooditem_id -> lowest producing recipe_id
+        self.producer: Dict[int, int] = {}
+        # recipe_id -> ingredient rows
+        self.rows: Dict[int, List[Row]] = defaultdict(list)
+
+
+# fooditem_id -> memoized expansion
+_memo: Dict[int, Expansion] = {}
+
+# Bumped by invalidate(), so expansions computed during a write are not kept
+_generation = 0
+
+
+def invalidate(*fooditem_ids: int) -> None:
+    """
+    Drop memoized expansions resolved through any of the given food items.
+
+    Call with the food item produced by a created, edited or deleted
+    recipe (both ids when a recipe switches food items). Without ids the
+    whole memo is dropped.
+    """
+    global _generation
+    _generation += 1
+    if not fooditem_ids:
+        _memo.clear()
+        return
+    changed = set(fooditem_ids)
+    for fooditem_id in [key for key, expansion in _memo.items() if not changed.isdisjoint(expansion.depends)]:
+        del _memo[fooditem_id]
+
+
+async def invalidate_recipe(db: AsyncSession, recipe_id: int) -> None:
+    """invalidate() for the food item a recipe produces (one lookup, skipped while the memo is empty)."""
+    if not _memo:
+        return
+    result = await db.execute(select(Recipe.recipe_fooditem_id).where(Recipe.recipe_id == recipe_id))
+    fooditem_id = result.scalar_one_or_none()
+    if fooditem_id is None:
+        invalidate()
+    else:
+        invalidate(fooditem_id)
+
+
+async def _load_graph(db: AsyncSession, graph: _Graph, fooditem_ids: Iterable[int]) -> None:
+    """
+    Read every recipe reachable from the producers of the given food items.
+
+    One recursive CTE collects the reachable recipe ids (UNION stops at
+    cycles); one more query reads their producers and ingredient rows.
+    """
+    fooditem_ids = set(fooditem_ids)
+    if not fooditem_ids:
+        return
+
+    used = aliased(RecipeIngredient)
+    producer = aliased(Recipe)
+    reachable = (
+        select(Recipe.recipe_id)
+        .where(Recipe.recipe_fooditem_id.in_(fooditem_ids))
+        .cte("reachable", recursive=True)
+    )
+    reachable = reachable.union(
+        select(producer.recipe_id)
+        .select_from(reachable)
+        .join(used, used.ri_recipe_id == reachable.c.recipe_id)
+        .join(producer, producer.recipe_fooditem_id == used.ri_fooditem_id)
+    )
+
+    result = await db.execute(
+        select(
+            Recipe.recipe_id,
+            Recipe.recipe_fooditem_id,
+            RecipeIngredient.ri_ingredient_id,
+            RecipeIngredient.ri_fooditem_id,
+            RecipeIngredient.ri_unit_type_id,
+            RecipeIngredient.ri_quantity,
+        )
+        .outerjoin(RecipeIngredient, RecipeIngredient.ri_recipe_id == Recipe.recipe_id)
+        .where(Recipe.recipe_id.in_(select(reachable.c.recipe_id)))
+        .order_by(Recipe.recipe_id, RecipeIngredient.ri_id)
+    )
+    for recipe_id, produces, ingredient_id, fooditem_id, unit_type_id, quantity in result:
+        # Rows arrive by recipe_id, so the first producer seen is the lowest
+        graph.producer.setdefault(produces, recipe_id)
+        if ingredient_id is not None or fooditem_id is not None:
+            graph.rows[recipe_id].append((ingredient_id, fooditem_id, unit_type_id, quantity))
+
+
+def _expand_rows(graph: _Graph, rows: List[Row], path: List[int]) -> Expansion:
+    """Sum the expansions of one recipe's ingredient rows."""
+    ingredients: Dict[AmountKey, float] = defaultdict(float)
+    leaves: Dict[AmountKey, float] = defaultdict(float)
+    producers: Dict[int, int] = {}
+    depends = set()
+
+    for ingredient_id, fooditem_id, unit_type_id, quantity in rows:
+        if ingredient_id is not None:
+            ingredients[(ingredient_id, unit_type_id)] += quantity
+            continue
+        depends.add(fooditem_id)
+        if fooditem_id not in graph.producer and fooditem_id not in _memo:
+            leaves[(fooditem_id, unit_type_id)] += quantity
+            continue
+        sub = _expand_food(graph, fooditem_id, path)
+        for key, amount in sub.ingredients.items():
+            ingredients[key] += amount * quantity
+        for key, amount in sub.leaves.items():
+            leaves[key] += amount * quantity
+        producers.update(sub.producers)
+        depends |= sub.depends
+
+    return Expansion(dict(ingredients), dict(leaves), producers, frozenset(depends))
+
+
+def _expand_food(graph: _Graph, fooditem_id: int, path: List[int]) -> Expansion:
+    """Expansion of one unit of a food item, memoized."""
+    expansion = _memo.get(fooditem_id)
+    if expansion is not None:
+        return expansion
+    if fooditem_id in path:
+        raise RecipeCycleError(path[path.index(fooditem_id):] + [fooditem_id])
+
+    recipe_id = graph.producer[fooditem_id]
+    path.append(fooditem_id)
+    expansion = _expand_rows(graph, graph.rows.get(recipe_id, []), path)
+    path.pop()
+
+    expansion = Expansion(
+        expansion.ingredients,
+        expansion.leaves,
+        {**expansion.producers, fooditem_id: recipe_id},
+        expansion.depends | {fooditem_id},
+    )
+    _memo[fooditem_id] = expansion
+    return expansion
+
+
+async def _load_recipes(db: AsyncSession, recipe_ids: Iterable[int]) -> Dict[int, Tuple[str, int, List[Row]]]:
+    """Map recipe_id -> (recipe_name, recipe_fooditem_id, ingredient rows) for existing recipes."""
+    recipe_ids = set(recipe_ids)
+    if not recipe_ids:
+        return {}
+    result = await db.execute(
+        select(Recipe.recipe_id, Recipe.recipe_name, Recipe.recipe_fooditem_id)
+        .where(Recipe.recipe_id.in_(recipe_ids))
+    )
+    recipes = {recipe_id: (name, fooditem_id, []) for recipe_id, name, fooditem_id in result}
+    result = await db.execute(
+        select(
+            RecipeIngredient.ri_recipe_id,
+            RecipeIngredient.ri_ingredient_id,
+            RecipeIngredient.ri_fooditem_id,
+            RecipeIngredient.ri_unit_type_id,
+            RecipeIngredient.ri_quantity,
+        )
+        .where(RecipeIngredient.ri_recipe_id.in_(list(recipes)))
+        .order_by(RecipeIngredient.ri_id)
+    )
+    for recipe_id, *row in result:
+        recipes[recipe_id][2].append(tuple(row))
+    return recipes
+
+
+async def expand(
+    db: AsyncSession,
+    recipe_ids: Iterable[int] = (),
+    fooditem_ids: Iterable[int] = ()
+) -> Tuple[Dict[int, Tuple[str, int, Expansion]], Dict[int, Expansion]]:
+    """
+    Expand several recipes (one batch each) and food items (one unit each) at once.
+
+    The graph below all of them is read with a single _load_graph() call.
+
+    Returns:
+        Tuple of (recipe_id -> (recipe_name, recipe_fooditem_id,
+        expansion) for the recipes that exist, fooditem_id -> expansion).
+        A food item no recipe produces expands to itself as a leaf with
+        unit_type_id None.
+
+    Raises:
+        RecipeCycleError: If a food item involved requires itself.
+    """
+    recipes = await _load_recipes(db, recipe_ids)
+    fooditem_ids = set(fooditem_ids)
+
+    generation = _generation
+    graph = _Graph()
+    needed = {fooditem_id for _, _, rows in recipes.values() for _, fooditem_id, _, _ in rows if fooditem_id is not None}
+    await _load_graph(db, graph, {fooditem_id for fooditem_id in needed | fooditem_ids if fooditem_id not in _memo})
+
+    try:
+        recipe_expansions = {}
+        for recipe_id, (name, recipe_fooditem_id, rows) in recipes.items():
+            # The recipe's own food item starts the path: using it (through
+            # the recipe chosen to produce it) would make the recipe require itself
+            path = [recipe_fooditem_id] if graph.producer.get(recipe_fooditem_id) == recipe_id else []
+            recipe_expansions[recipe_id] = (name, recipe_fooditem_id, _expand_rows(graph, rows, path))
+
+        food_expansions = {}
+        for fooditem_id in fooditem_ids:
+            if fooditem_id in _memo or fooditem_id in graph.producer:
+                food_expansions[fooditem_id] = _expand_food(graph, fooditem_id, [])
+            else:
+                food_expansions[fooditem_id] = Expansion({}, {(fooditem_id, None): 1.0}, {}, frozenset({fooditem_id}))
+    finally:
+        if generation != _generation:
+            # A write raced with the graph read; do not keep what was built on it
+            invalidate()
+    return recipe_expansions, food_expansions
+
+
+async def describe_amounts(
+    db: AsyncSession,
+    ingredients: Dict[AmountKey, float],
+    leaves: Dict[AmountKey, float]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Turn ingredient and leaf food item totals into named rows.
+
+    Returns:
+        Tuple of (ingredient rows {"ingredient_id", "ingredient_name",
+        "unit_type_id", "unit_type", "quantity"}, food item rows in the same
+        shape keyed by fooditem_id), each sorted by id then unit.
+    """
+    ingredient_names = await get_names(db, Ingredient.ingredient_id, Ingredient.ingredient_name, (i for i, _ in ingredients))
+    fooditem_names = await get_names(db, FoodItem.fooditem_id, FoodItem.fooditem_name, (f for f, _ in leaves))
+    unit_names = await get_names(
+        db, UnitType.id, UnitType.unit_type,
+        (u for _, u in list(ingredients) + list(leaves) if u is not None)
+    )
+
+    def by_key(amounts):
+        return sorted(amounts.items(), key=lambda item: (item[0][0], item[0][1] is not None, item[0][1] or 0))
+
+    return (
+        [
+            {
+                "ingredient_id": ingredient_id,
+                "ingredient_name": ingredient_names.get(ingredient_id),
+                "unit_type_id": unit_type_id,
+                "unit_type": unit_names.get(unit_type_id),
+                "quantity": quantity,
+            }
+            for (ingredient_id, unit_type_id), quantity in by_key(ingredients)
+        ],
+        [
+            {
+                "fooditem_id": fooditem_id,
+                "fooditem_name": fooditem_names.get(fooditem_id),
+                "unit_type_id": unit_type_id,
+                "unit_type": unit_names.get(unit_type_id),
+                "quantity": quantity,
+            }
+            for (fooditem_id, unit_type_id), quantity in by_key(leaves)
+        ],
+    )
+
+
+async def expand_recipe(db: AsyncSession, recipe_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a recipe down to raw ingredients.
+
+    Returns:
+        None if the recipe does not exist, otherwise {"recipe_id",
+        "recipe_name", "recipe_fooditem_id", "ingredients", "food_items",
+        "sub_recipes"}: ingredient totals and leaf food items as returned
+        by describe_amounts(), and the producing recipe chosen for each
+        food item resolved on the way as {"fooditem_id", "recipe_id"}.
+
+    Raises:
+        RecipeCycleError: If a food item the recipe uses requires itself.
+    """
+    recipes, _ = await expand(db, [recipe_id])
+    if recipe_id not in recipes:
+        return None
+    recipe_name, recipe_fooditem_id, expansion = recipes[recipe_id]
+    ingredients, food_items = await describe_amounts(db, expansion.ingredients, expansion.leaves)
+
+    return {
+        "recipe_id": recipe_id,
+        "recipe_name": recipe_name,
+        "recipe_fooditem_id": recipe_fooditem_id,
+        "ingredients": ingredients,
+        "food_items": food_items,
+        "sub_recipes": [
+            {"fooditem_id": fooditem_id, "recipe_id": producer_id}
+            for fooditem_id, producer_id in sorted(expansion.producers.items())
+        ],
+    }
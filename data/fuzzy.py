@@ -0,0 +1,260 @@
+"""
+Trigram fuzzy (typo-tolerant) search for RecipeFirst search operations.
+
+Names are compared by trigram similarity, the measure pg_trgm uses: each
+word is lower-cased and padded ("  word "), split into 3-character
+grams, and two names score shared / (total distinct grams). "spagetti"
+scores 0.58 against "spaghetti"; matches below
+``settings.fuzzy_search_threshold`` are dropped and the rest are ranked
+by score.
+
+Backends:
+- PostgreSQL with migration 005: pg_trgm GIN indexes on the name columns,
+  queried with the ``%`` operator and similarity()
+- anything else (SQLite): an in-process TrigramIndex per entity, built from
+  the name columns at startup (or on first use) and updated by the crud
+  write operations. Lookups read only the posting lists that can reach
+  the threshold (see TrigramIndex), never every name.
+"""
+
+import heapq
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .models import Recipe, Meal, FoodItem, Ingredient
+
+logger = logging.getLogger(__name__)
+
+# entity -> (model, primary key column, name column)
+FUZZY_TARGETS = {
+    "recipe": (Recipe, Recipe.recipe_id, Recipe.recipe_name),
+    "meal": (Meal, Meal.meal_id, Meal.meal_name),
+    "fooditem": (FoodItem, FoodItem.fooditem_id, FoodItem.fooditem_name),
+    "ingredient": (Ingredient, Ingredient.ingredient_id, Ingredient.ingredient_name),
+}
+
+# Word characters as pg_trgm sees them (letters and digits)
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(value: str) -> Set[str]:
+    """Return the pg_trgm-style trigram set of a string."""
+    grams = set()
+    for word in _WORD_RE.findall(value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    In-process inverted index from trigrams to ids, bucketed by trigram count.
+
+    Lookups never scan all names. For a query of n trigrams and a name of
+    m trigrams, similarity >= t requires at least
+    k = ceil(t * (n + m) / (1 + t)) shared trigrams. So within the bucket
+    of names with m trigrams, a match must appear in one of the n - k + 1
+    shortest posting lists of the query trigrams, and only ids from those
+    lists are scored. Only buckets with t * n <= m <= n / t can match.
+    Buckets are visited best possible score first, so a lookup with a
+    limit stops once the remaining buckets cannot beat the results it
+    already has.
+    """
+
+    def __init__(self):
+        # trigram -> trigram count of the name -> ids
+        self._postings: Dict[str, Dict[int, Set[int]]] = {}
+        self._grams: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def add(self, entity_id: int, name: Optional[str]) -> None:
+        """Index (or re-index) one name."""
+        self.remove(entity_id)
+        grams = trigrams(name or "")
+        self._grams[entity_id] = grams
+        size = len(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, {}).setdefault(size, set()).add(entity_id)
+
+    def remove(self, entity_id: int) -> None:
+        """Drop one id from the index (no-op if it is not indexed)."""
+        grams = self._grams.pop(entity_id, None)
+        if grams is None:
+            return
+        size = len(grams)
+        for gram in grams:
+            buckets = self._postings[gram]
+            ids = buckets[size]
+            ids.discard(entity_id)
+            if not ids:
+                del buckets[size]
+                if not buckets:
+                    del self._postings[gram]
+
+    def search(self, q: str, threshold: float, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Find ids whose names are at least ``threshold`` similar to q.
+
+        Returns:
+            List of (id, similarity), best first (ties by id).
+        """
+        query = trigrams(q)
+        if not query:
+            return []
+
+        n = len(query)
+        buckets = [self._postings.get(gram, {}) for gram in query]
+        sizes = range(max(1, math.ceil(threshold * n)), int(n / threshold) + 1)
+        # Best possible similarity of a name with m trigrams is min(n, m) / max(n, m)
+        sizes = sorted(sizes, key=lambda m: min(n, m) / max(n, m), reverse=True)
+
+        matches = []
+        best = []  # min-heap of the top ``limit`` scores so far
+        for m in sizes:
+            # Stop once the limit-th best score beats anything this bucket
+            # (and every later one) could score; ties continue so the id
+            # tie-break stays exact
+            if limit is not None and len(best) == limit and best[0] > min(n, m) / max(n, m):
+                break
+
+            needed = math.ceil(threshold * (n + m) / (1 + threshold) - 1e-9)
+            lists = sorted((bucket.get(m, ()) for bucket in buckets), key=len)
+            split = n - needed + 1
+            if split <= 0:
+                continue
+
+            counts = Counter()
+            for ids in lists[:split]:
+                counts.update(ids)
+            rest = lists[split:]
+
+            for entity_id, shared in counts.items():
+                for ids in rest:
+                    if entity_id in ids:
+                        shared += 1
+                if shared >= needed:
+                    score = shared / (n + m - shared)
+                    if score >= threshold:
+                        matches.append((entity_id, score))
+                        if limit is not None:
+                            if len(best) < limit:
+                                heapq.heappush(best, score)
+                            elif score > best[0]:
+                                heapq.heapreplace(best, score)
+
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:limit] if limit is not None else matches
+
+
+# entity -> in-process index (only populated when pg_trgm is not used)
+_indexes: Dict[str, TrigramIndex] = {}
+
+# dialect name -> whether migration 005 (pg_trgm indexes) has been applied
+_pg_trgm_available: Dict[str, bool] = {}
+
+
+async def uses_pg_trgm(db: AsyncSession) -> bool:
+    """Check (once per process) whether the pg_trgm indexes can be used."""
+    dialect = db.bind.dialect.name
+    if dialect != "postgresql":
+        return False
+    if dialect not in _pg_trgm_available:
+        result = await db.execute(text("SELECT 1 FROM pg_indexes WHERE indexname = 'idx_recipe_name_trgm'"))
+        _pg_trgm_available[dialect] = result.first() is not None
+    return _pg_trgm_available[dialect]
+
+
+async def build_indexes(db: AsyncSession) -> None:
+    """Build the in-process indexes from the name columns (unless pg_trgm is used)."""
+    if await uses_pg_trgm(db):
+        return
+    for entity, (_, key, name) in FUZZY_TARGETS.items():
+        index = TrigramIndex()
+        result = await db.execute(select(key, name))
+        for entity_id, value in result:
+            index.add(entity_id, value)
+        _indexes[entity] = index
+    logger.info("Built trigram indexes: %s", {entity: len(index) for entity, index in _indexes.items()})
+
+
+def record(entity: str, entity_id: int, name: Optional[str]) -> None:
+    """Index a created or renamed row (no-op until the indexes are built)."""
+    index = _indexes.get(entity)
+    if index is not None:
+        index.add(entity_id, name)
+
+
+def forget(entity: str, *entity_ids: int) -> None:
+    """Remove deleted rows from the index (no-op until the indexes are built)."""
+    index = _indexes.get(entity)
+    if index is not None:
+        for entity_id in entity_ids:
+            index.remove(entity_id)
+
+
+async def _set_pg_threshold(db: AsyncSession) -> None:
+    """
+    Apply the similarity threshold to the pg_trgm ``%`` operator.
+
+    ``%`` (the form the GIN index can serve) reads its threshold from this
+    setting; is_local=true scopes it to the current transaction.
+    """
+    await db.execute(
+        text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+        {"threshold": str(settings.fuzzy_search_threshold)}
+    )
+
+
+async def _matches(db: AsyncSession, entity: str, q: str, limit: Optional[int]) -> List[Tuple[int, float]]:
+    """Ranked (id, similarity) matches from whichever backend applies."""
+    if await uses_pg_trgm(db):
+        model, key, name = FUZZY_TARGETS[entity]
+        await _set_pg_threshold(db)
+        sql = (
+            f'SELECT {key.key}, similarity({name.key}, :q) AS score FROM "{model.__tablename__}" '
+            f"WHERE {name.key} % :q ORDER BY score DESC, {key.key}"
+        )
+        params = {"q": q}
+        if limit is not None:
+            sql += " LIMIT :limit"
+            params["limit"] = limit
+        result = await db.execute(text(sql), params)
+        return [(row[0], row[1]) for row in result]
+
+    if entity not in _indexes:
+        await build_indexes(db)
+    return _indexes[entity].search(q, settings.fuzzy_search_threshold, limit)
+
+
+async def search_ids(db: AsyncSession, entity: str, q: str, limit: Optional[int] = None) -> List[int]:
+    """
+    Find the ids of one entity type whose names fuzzily match q, best first.
+
+    Args:
+        entity: Key of FUZZY_TARGETS ("recipe", "meal", "fooditem",
+                "ingredient").
+        q: Raw user query (may be misspelled).
+        limit: Maximum number of ids to return (None for all matches).
+    """
+    return [entity_id for entity_id, _ in await _matches(db, entity, q, limit)]
+
+
+async def count_matches(db: AsyncSession, entity: str, q: str) -> int:
+    """Count the rows of one entity type whose names fuzzily match q."""
+    if await uses_pg_trgm(db):
+        model, _, name = FUZZY_TARGETS[entity]
+        await _set_pg_threshold(db)
+        result = await db.execute(
+            text(f'SELECT count(*) FROM "{model.__tablename__}" WHERE {name.key} % :q'), {"q": q}
+        )
+        return result.scalar_one()
+    return len(await _matches(db, entity, q, None))
@@ -0,0 +1,247 @@
+"""
+Inverted ingredient index behind /recipes/filter.
+
+Answers "recipes that use all of these ingredients and none of those"
+without touching RecipeIngredient. Each ingredient (and each food item
+used as an ingredient) maps to a posting list of the recipes using it,
+stored as a bitmap: a Python int with bit ``recipe_id`` set. Include
+filters are bitwise ANDs, exclude filters AND NOT, counting is
+int.bit_count(), and a page is read from the lowest set bits up, so
+results come out in recipe_id order for keyset paging.
+
+A bitmap costs max(recipe_id) / 8 bytes at most (12.5 KB at 100k recipes).
+
+The index is built at startup (or on first use) and kept current by the
+crud recipe and recipe-ingredient write operations: a changed recipe has
+its bit re-set from its committed rows, a deleted recipe is cleared from
+every posting list, and a deleted ingredient or food item drops its list.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Recipe, RecipeIngredient
+
+logger = logging.getLogger(__name__)
+
+# ("ingredient", ingredient_id) or ("fooditem", fooditem_id)
+Key = Tuple[str, int]
+
+
+def _row_keys(ingredient_id: Optional[int], fooditem_id: Optional[int]) -> List[Key]:
+    """Index keys of one RecipeIngredient row."""
+    keys = []
+    if ingredient_id is not None:
+        keys.append(("ingredient", ingredient_id))
+    if fooditem_id is not None:
+        keys.append(("fooditem", fooditem_id))
+    return keys
+
+
+class IngredientIndex:
+    """Posting-list bitmaps from ingredient / food item to recipe ids."""
+
+    def __init__(self):
+        self._postings: Dict[Key, int] = {}
+        self._recipe_keys: Dict[int, Set[Key]] = {}
+        self._all = 0
+
+    def __len__(self) -> int:
+        return len(self._recipe_keys)
+
+    @classmethod
+    def build(cls, recipe_keys: Dict[int, List[Key]]) -> "IngredientIndex":
+        """
+        Build an index from recipe_id -> keys.
+
+        Each bitmap is assembled in a bytearray and converted once; OR-ing
+        bits into an int one recipe at a time would copy it per recipe.
+        """
+        index = cls()
+        postings: Dict[Key, List[int]] = {}
+        for recipe_id, keys in recipe_keys.items():
+            keys = set(keys)
+            index._recipe_keys[recipe_id] = keys
+            for key in keys:
+                postings.setdefault(key, []).append(recipe_id)
+        index._postings = {key: _bitmap(ids) for key, ids in postings.items()}
+        index._all = _bitmap(recipe_keys)
+        return index
+
+    def set_recipe(self, recipe_id: int, keys: Iterable[Key]) -> None:
+        """Index a recipe with exactly the given ingredient keys."""
+        keys = set(keys)
+        old = self._recipe_keys.get(recipe_id, set())
+        bit = 1 << recipe_id
+        for key in old - keys:
+            self._clear(key, bit)
+        for key in keys - old:
+            self._postings[key] = self._postings.get(key, 0) | bit
+        self._recipe_keys[recipe_id] = keys
+        self._all |= bit
+
+    def remove_recipe(self, recipe_id: int) -> None:
+        """Drop a deleted recipe (no-op if it is not indexed)."""
+        keys = self._recipe_keys.pop(recipe_id, None)
+        if keys is None:
+            return
+        bit = 1 << recipe_id
+        for key in keys:
+            self._clear(key, bit)
+        self._all &= ~bit
+
+    def remove_key(self, key: Key) -> None:
+        """Drop a deleted ingredient or food item from every recipe."""
+        bitmap = self._postings.pop(key, 0)
+        for recipe_id in _bits(bitmap):
+            self._recipe_keys[recipe_id].discard(key)
+
+    def _clear(self, key: Key, bit: int) -> None:
+        bitmap = self._postings.get(key, 0) & ~bit
+        if bitmap:
+            self._postings[key] = bitmap
+        else:
+            self._postings.pop(key, None)
+
+    def match(self, include: Iterable[Key] = (), exclude: Iterable[Key] = ()) -> int:
+        """
+        Bitmap of the recipes using every ``include`` key and no ``exclude`` key.
+
+        Include keys are intersected smallest posting list first, so an
+        unused ingredient ends the search immediately.
+        """
+        result = self._all
+        for bitmap in sorted((self._postings.get(key, 0) for key in include), key=int.bit_count):
+            result &= bitmap
+            if not result:
+                return 0
+        for key in exclude:
+            result &= ~self._postings.get(key, 0)
+        return result
+
+
+def _bitmap(ids: Iterable[int]) -> int:
+    """Build a bitmap with the given bits set."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, "little")
+
+
+# Bitmaps are scanned in chunks of this many bits (see _bits())
+_CHUNK_BITS = 4096
+_CHUNK_MASK = (1 << _CHUNK_BITS) - 1
+
+
+def _bits(bitmap: int) -> Iterable[int]:
+    """
+    Yield the positions of the set bits of a bitmap, lowest first.
+
+    Works a chunk at a time: each chunk is one shift of the bitmap plus a
+    scan of its bin() string, where peeling bits one by one would copy the
+    whole bitmap per bit.
+    """
+    base = 0
+    while bitmap:
+        chunk = bitmap & _CHUNK_MASK
+        if chunk:
+            digits = bin(chunk)[:1:-1]
+            position = digits.find("1")
+            while position != -1:
+                yield base + position
+                position = digits.find("1", position + 1)
+        bitmap >>= _CHUNK_BITS
+        base += _CHUNK_BITS
+
+
+def page(bitmap: int, limit: int, offset: int = 0, after_id: Optional[int] = None) -> List[int]:
+    """
+    Read one page of recipe ids from a match() bitmap, in recipe_id order.
+
+    Paging works as in pagination.apply_page(): ``after_id`` skips ids up to
+    and including it, ``offset`` skips that many more.
+    """
+    if after_id is not None:
+        bitmap &= ~((1 << (after_id + 1)) - 1)
+    ids = []
+    for recipe_id in _bits(bitmap):
+        if offset:
+            offset -= 1
+            continue
+        ids.append(recipe_id)
+        if len(ids) == limit:
+            break
+    return ids
+
+
+# Process-wide index; None until built
+_index: Optional[IngredientIndex] = None
+
+
+async def build_index(db: AsyncSession) -> None:
+    """Build the index from the Recipe and RecipeIngredient tables."""
+    global _index
+    recipe_keys: Dict[int, List[Key]] = {}
+    result = await db.execute(select(Recipe.recipe_id))
+    for recipe_id in result.scalars():
+        recipe_keys[recipe_id] = []
+    result = await db.execute(
+        select(RecipeIngredient.ri_recipe_id, RecipeIngredient.ri_ingredient_id, RecipeIngredient.ri_fooditem_id)
+    )
+    for recipe_id, ingredient_id, fooditem_id in result:
+        recipe_keys.setdefault(recipe_id, []).extend(_row_keys(ingredient_id, fooditem_id))
+    _index = IngredientIndex.build(recipe_keys)
+    logger.info("Built ingredient index: %d recipes, %d keys", len(_index), len(_index._postings))
+
+
+async def get_index(db: AsyncSession) -> IngredientIndex:
+    """Return the index, building it first if startup did not."""
+    if _index is None:
+        await build_index(db)
+    return _index
+
+
+def record_recipe(recipe_id: int, ingredients: Iterable[Dict]) -> None:
+    """
+    Re-index a recipe from the ingredient dicts it was created or updated with.
+
+    No-op until the index is built.
+    """
+    if _index is not None:
+        keys = []
+        for data in ingredients:
+            keys.extend(_row_keys(data.get("ri_ingredient_id"), data.get("ri_fooditem_id")))
+        _index.set_recipe(recipe_id, keys)
+
+
+async def refresh_recipe(db: AsyncSession, recipe_id: int) -> None:
+    """Re-read one recipe's ingredient rows into the index (no-op until built)."""
+    if _index is None:
+        return
+    result = await db.execute(
+        select(RecipeIngredient.ri_ingredient_id, RecipeIngredient.ri_fooditem_id)
+        .where(RecipeIngredient.ri_recipe_id == recipe_id)
+    )
+    keys = []
+    for ingredient_id, fooditem_id in result:
+        keys.extend(_row_keys(ingredient_id, fooditem_id))
+    _index.set_recipe(recipe_id, keys)
+
+
+def forget_recipes(*recipe_ids: int) -> None:
+    """Remove deleted recipes from the index (no-op until built)."""
+    if _index is not None:
+        for recipe_id in recipe_ids:
+            _index.remove_recipe(recipe_id)
+
+
+def forget_key(kind: str, key_id: int) -> None:
+    """Remove a deleted ingredient ("ingredient") or food item ("fooditem")."""
+    if _index is not None:
+        _index.remove_key((kind, key_id))
@@ -55,6 +55,11 @@ class UnitType(Base, TimestampMixin):
 
     id = Column(Integer, primary_key=True)
     unit_type = Column(Text, nullable=False, unique=True)
+    # 'mass', 'volume' or 'count'; NULL for units that convert to nothing
+    # (slice, can, ...). unit_base_factor is the size of one unit in the
+    # dimension's base unit (gram, milliliter, piece). See units.py.
+    unit_dimension = Column(Text)
+    unit_base_factor = Column(Float)
 
     # Relationships
     recipe_ingredients = relationship("RecipeIngredient", back_populates="unit_type")
@@ -94,6 +99,28 @@ class Category(Base, TimestampMixin):
         return f"<Category(id={self.category_id}, name='{self.category_name}')>"
 
 
+class CategoryClosure(Base):
+    """
+    Closure table of the category hierarchy: one row per (ancestor, descendant) pair.
+
+    Every category is its own ancestor at depth 0, so "everything under
+    Italian" is the rows with ancestor_id = Italian. Maintained by the crud
+    category operations; see crud.rebuild_category_closure() for bulk loads.
+    """
+    __tablename__ = 'CategoryClosure'
+
+    ancestor_id = Column(Integer, ForeignKey('Category.category_id', ondelete='CASCADE'), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey('Category.category_id', ondelete='CASCADE'), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index('idx_category_closure_descendant', 'descendant_id'),
+    )
+
+    def __repr__(self):
+        return f"<CategoryClosure(ancestor_id={self.ancestor_id}, descendant_id={self.descendant_id}, depth={self.depth})>"
+
+
 class Ingredient(Base, TimestampMixin):
     """Raw ingredients used in recipes (salt, pepper, flour, etc.)."""
     __tablename__ = 'Ingredient'
@@ -102,6 +129,8 @@ class Ingredient(Base, TimestampMixin):
     ingredient_name = Column(Text, nullable=False)
     ingredient_description = Column(Text)
     ingredient_notes = Column(Text)
+    # Grams per milliliter, for mass <-> volume conversion (NULL if unknown)
+    ingredient_density = Column(Float)
 
     # Relationships
     recipe_ingredients = relationship(
@@ -174,7 +203,8 @@ class Recipe(Base, TimestampMixin):
         "RecipeIngredient",
         back_populates="recipe",
         lazy="selectin",  # Eager load to avoid N+1
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        order_by="RecipeIngredient.ri_id"
     )
 
     instructions = relationship(
@@ -189,7 +219,8 @@ class Recipe(Base, TimestampMixin):
         "Category",
         secondary="RecipeCategory",
         back_populates="recipes",
-        lazy="selectin"  # Eager load to avoid N+1
+        lazy="selectin",  # Eager load to avoid N+1
+        order_by="Category.category_id"
     )
 
     def __repr__(self):
@@ -246,6 +277,7 @@ class RecipeIngredient(Base, TimestampMixin):
             '(ri_ingredient_id IS NULL AND ri_fooditem_id IS NOT NULL)',
             name='ck_ri_source'
         ),
+        Index('idx_recipe_ingredient_recipe_id', 'ri_recipe_id'),
     )
 
     # Note: Removed @validates decorator to prevent interference with cascade deletes.
@@ -298,14 +330,16 @@ class Meal(Base, TimestampMixin):
         "MealFoodItem",
         back_populates="meal",
         lazy="selectin",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        order_by="MealFoodItem.mf_id"
     )
 
     categories = relationship(
         "Category",
         secondary="MealCategory",
         back_populates="meals",
-        lazy="selectin"
+        lazy="selectin",
+        order_by="Category.category_id"
     )
 
     def __repr__(self):
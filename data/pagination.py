@@ -0,0 +1,211 @@
+"""
+Pagination helpers for RecipeFirst list endpoints.
+
+Cursors are opaque to clients: they are URL-safe base64 encodings of a small
+JSON object holding the keyset position of the last row on a page. Clients
+should only ever pass back the ``next_cursor`` value they were given.
+
+This module provides:
+- Cursor encoding/decoding
+- A TTL cache for the X-Total-Count header
+- The PageParams dependency shared by all list endpoints
+- Ordering and paging of select() statements
+- Parsing of the ``ids`` multi-get parameter
+"""
+
+import base64
+import binascii
+import json
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, Query
+
+from .config import settings
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """
+    Encode a keyset position into an opaque cursor string.
+
+    Args:
+        position: JSON-serializable dictionary describing the last row
+                  returned (e.g. ``{"id": 42}``).
+
+    Returns:
+        str: URL-safe base64 cursor without padding.
+    """
+    raw = json.dumps(position, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode an opaque cursor string back into its keyset position.
+
+    Raises:
+        ValueError: If the cursor is malformed or was not produced by
+                    encode_cursor().
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
+
+
+class CountCache:
+    """
+    Small TTL cache for table row counts.
+
+    Counting a large table is a full index scan on most databases, so list
+    endpoints reuse a recent count for the X-Total-Count header instead of
+    issuing COUNT(*) on every page. Write operations that add or remove rows
+    call invalidate() so counts are exact between TTL expiries.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, int]] = {}
+
+    def get(self, key: str) -> Optional[int]:
+        """Return the cached count for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: int) -> None:
+        """Store a count for key."""
+        self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop cached counts for the given keys."""
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+# Global count cache shared by all list endpoints
+count_cache = CountCache(settings.count_cache_ttl)
+
+
+class PageParams:
+    """
+    FastAPI dependency that parses the shared pagination query parameters.
+
+    Supports both limit/offset and cursor (``after``) modes. The page size
+    is always capped at ``settings.max_page_size``.
+
+    Usage in routes:
+        @router.get("/ingredients")
+        async def get_ingredients(page: PageParams = Depends()):
+            ...
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, gt=0, description="Page size"),
+        offset: int = Query(0, ge=0, description="Rows to skip (limit/offset mode)"),
+        after: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    ):
+        self.limit = min(limit or settings.max_page_size, settings.max_page_size)
+        self.offset = offset
+        self.after_id: Optional[int] = None
+
+        if after:
+            if offset:
+                raise HTTPException(status_code=400, detail="Use either offset or after, not both")
+            try:
+                self.after_id = int(decode_cursor(after)["id"])
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def split(self, rows: List[Any], key: str) -> Tuple[List[Any], Optional[str]]:
+        """
+        Trim a result fetched with ``limit + 1`` rows down to one page.
+
+        Args:
+            rows: Rows returned by the query (at most limit + 1), either ORM
+                  instances or serialized dicts.
+            key: Name of the primary key attribute (or dict key) the rows
+                 are ordered by.
+
+        Returns:
+            Tuple of (page rows, next_cursor or None on the last page).
+        """
+        if len(rows) <= self.limit:
+            return rows, None
+        rows = rows[:self.limit]
+        last = rows[-1]
+        position = last[key] if isinstance(last, dict) else getattr(last, key)
+        return rows, encode_cursor({"id": position})
+
+
+def apply_page(stmt, key_column, limit: Optional[int] = None, offset: int = 0, after_id: Optional[int] = None):
+    """
+    Order a select() by its primary key and apply limit/offset or keyset paging.
+
+    Callers that need to know whether another page exists should pass
+    ``limit + 1`` and check the number of rows returned.
+    """
+    stmt = stmt.order_by(key_column)
+    if after_id is not None:
+        stmt = stmt.where(key_column > after_id)
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def parse_ids(ids: Optional[str], name: str = "ids") -> Optional[List[int]]:
+    """
+    Parse a comma-separated ``ids`` query value for a multi-get request.
+
+    ``name`` is the query parameter named in error messages, for other
+    parameters that take an id list.
+
+    Duplicates are dropped, keeping the first occurrence, so the result is
+    in request order.
+
+    Returns:
+        List of ids, or None when the parameter was not given.
+
+    Raises:
+        HTTPException: 400 if an id is not a positive integer, or if more
+                       than ``settings.max_batch_ids`` ids are requested.
+    """
+    if ids is None:
+        return None
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be comma-separated integers")
+    if not parsed or min(parsed) < 1:
+        raise HTTPException(status_code=400, detail=f"{name} must be comma-separated positive integers")
+
+    parsed = list(dict.fromkeys(parsed))
+    if len(parsed) > settings.max_batch_ids:
+        raise HTTPException(status_code=400, detail=f"At most {settings.max_batch_ids} ids in {name}")
+    return parsed
+
+
+def in_request_order(rows: Iterable[Dict[str, Any]], ids: List[int], key: str) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Order serialized rows of a multi-get as the ids were requested.
+
+    Returns:
+        Tuple of (rows in request order, requested ids that were not found).
+    """
+    by_id = {row[key]: row for row in rows}
+    found = [by_id[i] for i in ids if i in by_id]
+    missing = [i for i in ids if i not in by_id]
+    return found, missing
@@ -0,0 +1,246 @@
+"""
+Pantry coverage ranking behind /recipes/match.
+
+Given the ingredients (and food items) a user has on hand, every recipe
+is scored by coverage: the fraction of its RecipeIngredient rows the
+pantry satisfies. A food item row is satisfied when the food item is in
+the pantry or when some recipe producing it (Recipe.recipe_fooditem_id)
+is itself fully covered, so a pantry holding flour, water and yeast
+satisfies "bread" in a sandwich recipe.
+
+The whole catalog is scored per request, so it is held as a sparse
+recipe x requirement matrix in CSR form (NumPy arrays): one entry per
+RecipeIngredient row, ordered by recipe. Scoring is vectorized: a gather
+of the pantry bit per entry and a bincount per recipe, repeated while
+newly producible food items appear (once per level of recipe nesting).
+
+The matrix is built on first use and rebuilt on the next request after
+a write that changes recipes or their ingredient rows (see invalidate()).
+A build that overlaps such a write serves its own request but is not
+kept, so the next request reads the committed rows again.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Recipe, RecipeIngredient, Ingredient, FoodItem
+from .queries import get_names
+
+logger = logging.getLogger(__name__)
+
+
+class PantryMatrix:
+    """
+    CSR matrix of recipe requirements.
+
+    Requirement columns are ingredient ids followed by food item ids
+    (``food_offset + fooditem_id``). Recipe rows are positions in
+    ``recipe_ids``; the entries of row r are ``indptr[r]:indptr[r + 1]``.
+    """
+
+    def __init__(
+        self,
+        recipes: List[Tuple[int, int]],
+        entries: List[Tuple[int, int, Optional[int], Optional[int]]]
+    ):
+        """
+        Args:
+            recipes: (recipe_id, recipe_fooditem_id) rows ordered by recipe_id.
+            entries: (recipe_id, ri_id, ri_ingredient_id, ri_fooditem_id)
+                     rows ordered by (recipe_id, ri_id).
+        """
+        self.recipe_ids = np.array([recipe_id for recipe_id, _ in recipes], dtype=np.int64)
+        produces = np.array([fooditem_id for _, fooditem_id in recipes], dtype=np.int64)
+        table = np.array(
+            [(recipe_id, ri_id, ingredient_id or 0, fooditem_id or 0)
+             for recipe_id, ri_id, ingredient_id, fooditem_id in entries],
+            dtype=np.int64
+        ).reshape(-1, 4)
+
+        # Map recipe ids to row positions; entries of recipes missing from
+        # ``recipes`` (deleted between the two reads) are dropped
+        rows = np.searchsorted(self.recipe_ids, table[:, 0])
+        known = rows < len(self.recipe_ids)
+        known[known] = self.recipe_ids[rows[known]] == table[known, 0]
+        rows, table = rows[known], table[known]
+        self._entry_ids = table[:, 1]
+        entry_ingredients = table[:, 2]
+        entry_foods = table[:, 3]
+
+        max_ingredient = int(entry_ingredients.max(initial=0))
+        self.food_offset = max_ingredient + 1
+        self.columns = np.where(entry_ingredients > 0, entry_ingredients, self.food_offset + entry_foods)
+        self.width = self.food_offset + int(max(entry_foods.max(initial=0), produces.max(initial=0))) + 1
+        self._produces = self.food_offset + produces
+
+        self._rows = rows
+        self.required = np.bincount(rows, minlength=len(self.recipe_ids))
+        self.indptr = np.searchsorted(rows, np.arange(len(self.recipe_ids) + 1))
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    def score(self, ingredient_ids: Iterable[int], fooditem_ids: Iterable[int] = ()) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every recipe against a pantry.
+
+        Returns:
+            Tuple of (satisfied count per recipe row, satisfied flag per
+            entry).
+        """
+        have = np.zeros(self.width, dtype=bool)
+        ingredients = np.fromiter(ingredient_ids, dtype=np.int64)
+        have[ingredients[(ingredients > 0) & (ingredients < self.food_offset)]] = True
+        foods = self.food_offset + np.fromiter(fooditem_ids, dtype=np.int64)
+        have[foods[(foods > self.food_offset) & (foods < self.width)]] = True
+
+        while True:
+            satisfied = have[self.columns]
+            counts = np.bincount(self._rows, weights=satisfied, minlength=len(self.recipe_ids)).astype(np.int64)
+            complete = (counts == self.required) & (self.required > 0)
+            produced = self._produces[complete]
+            produced = produced[~have[produced]]
+            if not produced.size:
+                return counts, satisfied
+            have[produced] = True
+
+    def rank(
+        self,
+        counts: np.ndarray,
+        limit: int,
+        min_coverage: float = 0.0
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Pick the best ``limit`` recipe rows by coverage.
+
+        Ties are broken by fewer missing rows, then recipe_id. Recipes with
+        no ingredient rows, no satisfied rows, or coverage below
+        min_coverage are left out.
+
+        Returns:
+            Tuple of (recipe rows, best first; number of qualifying recipes).
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverage = np.where(self.required > 0, counts / self.required, 0.0)
+        candidates = np.flatnonzero((counts > 0) & (coverage >= min_coverage))
+        total = len(candidates)
+        if total > limit:
+            # Keep everything tied with the limit-th best coverage, then sort exactly
+            kth = np.partition(-coverage[candidates], limit - 1)[limit - 1]
+            candidates = candidates[-coverage[candidates] <= kth]
+        order = np.lexsort((
+            self.recipe_ids[candidates],
+            self.required[candidates] - counts[candidates],
+            -coverage[candidates],
+        ))
+        return candidates[order][:limit], total
+
+    def missing(self, row: int, satisfied: np.ndarray) -> List[Tuple[int, Optional[int], Optional[int]]]:
+        """Unsatisfied entries of one recipe row as (ri_id, ingredient_id, fooditem_id)."""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        result = []
+        for entry in np.flatnonzero(~satisfied[start:end]) + start:
+            column = int(self.columns[entry])
+            if column < self.food_offset:
+                result.append((int(self._entry_ids[entry]), column, None))
+            else:
+                result.append((int(self._entry_ids[entry]), None, column - self.food_offset))
+        return result
+
+
+# Process-wide matrix; None until built or after invalidate()
+_matrix: Optional[PantryMatrix] = None
+
+# Bumped by invalidate(), so a build that raced with a write is not kept
+_generation = 0
+
+
+def invalidate() -> None:
+    """Drop the matrix after a recipe or recipe-ingredient write."""
+    global _matrix, _generation
+    _matrix = None
+    _generation += 1
+
+
+async def get_matrix(db: AsyncSession) -> PantryMatrix:
+    """Return the current matrix, (re)building it from the database if needed."""
+    global _matrix
+    if _matrix is not None:
+        return _matrix
+
+    generation = _generation
+    result = await db.execute(
+        select(Recipe.recipe_id, Recipe.recipe_fooditem_id).order_by(Recipe.recipe_id)
+    )
+    recipes = result.all()
+    result = await db.execute(
+        select(
+            RecipeIngredient.ri_recipe_id,
+            RecipeIngredient.ri_id,
+            RecipeIngredient.ri_ingredient_id,
+            RecipeIngredient.ri_fooditem_id,
+        ).order_by(RecipeIngredient.ri_recipe_id, RecipeIngredient.ri_id)
+    )
+    matrix = PantryMatrix(recipes, result.all())
+    logger.info("Built pantry matrix: %d recipes, %d entries", len(matrix), len(matrix.columns))
+    if generation == _generation:
+        _matrix = matrix
+    return matrix
+
+
+async def match_recipes(
+    db: AsyncSession,
+    ingredient_ids: List[int],
+    fooditem_ids: List[int],
+    limit: int,
+    min_coverage: float = 0.0
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Rank recipes by how much of them the pantry covers.
+
+    Returns:
+        Tuple of (matches, number of qualifying recipes). Each match is
+        {"recipe_id", "recipe_name", "coverage", "satisfied", "required",
+        "missing"}; ``missing`` lists the unsatisfied RecipeIngredient rows
+        as {"ri_id", "ri_ingredient_id", "ri_fooditem_id", "name"}.
+    """
+    matrix = await get_matrix(db)
+    counts, satisfied = matrix.score(ingredient_ids, fooditem_ids)
+    rows, total = matrix.rank(counts, limit, min_coverage)
+
+    missing = {int(row): matrix.missing(row, satisfied) for row in rows}
+    entries = [entry for row_entries in missing.values() for entry in row_entries]
+    recipe_names = await get_names(db, Recipe.recipe_id, Recipe.recipe_name, (int(matrix.recipe_ids[row]) for row in rows))
+    ingredient_names = await get_names(
+        db, Ingredient.ingredient_id, Ingredient.ingredient_name,
+        (ingredient_id for _, ingredient_id, _ in entries if ingredient_id is not None)
+    )
+    fooditem_names = await get_names(
+        db, FoodItem.fooditem_id, FoodItem.fooditem_name,
+        (fooditem_id for _, _, fooditem_id in entries if fooditem_id is not None)
+    )
+
+    matches = []
+    for row in rows:
+        recipe_id = int(matrix.recipe_ids[row])
+        matches.append({
+            "recipe_id": recipe_id,
+            "recipe_name": recipe_names.get(recipe_id),
+            "coverage": float(counts[row] / matrix.required[row]),
+            "satisfied": int(counts[row]),
+            "required": int(matrix.required[row]),
+            "missing": [
+                {
+                    "ri_id": ri_id,
+                    "ri_ingredient_id": ingredient_id,
+                    "ri_fooditem_id": fooditem_id,
+                    "name": ingredient_names.get(ingredient_id) if ingredient_id is not None else fooditem_names.get(fooditem_id),
+                }
+                for ri_id, ingredient_id, fooditem_id in missing[int(row)]
+            ],
+        })
+    return matches, total
@@ -0,0 +1,316 @@
+"""
+Read-only Core query layer for RecipeFirst list endpoints.
+
+The ORM path in crud.py hydrates a Recipe (or Meal) instance per row plus
+one instance per child row, registers each in the identity map and tracks
+it for changes, only for serializers.py to turn them straight back into
+dicts. List endpoints never modify what they read, so this module selects
+plain column tuples with Core select()s and assembles the serialized
+structure directly:
+
+- one query for the page of parent rows
+- one query per requested relationship, joined to its lookup tables and
+  ordered by (parent id, child key)
+
+Rows are folded into their parents in a single pass. The output is the
+same as serializers.serialize_recipe() / serialize_meal() (without field
+picking, see serializers.pick_fields()), with child rows in a fixed order.
+
+get_names() is the id -> name lookup shared by the reports that return
+ids from an in-memory structure (pantry.py, expansion.py).
+
+Organization:
+- Recipe reads (2 functions)
+- Meal reads (2 functions)
+- Name lookups (1 function)
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any, Collection, Iterable
+
+from .models import (
+    Recipe, Ingredient, FoodItem, Meal, Category, UnitType,
+    RecipeIngredient, RecipeInstruction, MealFoodItem,
+    RecipeCategory, MealCategory
+)
+from .pagination import apply_page
+
+# Category columns in serialize_category() key order
+_CATEGORY_COLUMNS = (
+    Category.category_id,
+    Category.category_name,
+    Category.category_description,
+    Category.parent_category_id,
+    Category.created_at,
+    Category.updated_at,
+)
+
+
+def _category(row) -> Dict[str, Any]:
+    """Build a serialize_category() dict from the trailing category columns of a row."""
+    category_id, name, description, parent_id, created_at, updated_at = row[-6:]
+    return {
+        "category_id": category_id,
+        "category_name": name,
+        "category_description": description,
+        "parent_category_id": parent_id,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+
+
+# ============================================================================
+# Recipe Reads
+# ============================================================================
+
+async def get_recipes_page(
+    db: AsyncSession,
+    limit: int,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+    include: Optional[Collection[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get one page of serialized recipes ordered by recipe_id.
+
+    Paging works as in crud.get_recipes_page(). ``include`` limits the
+    relationships fetched (None fetches all); each requested relationship
+    costs exactly one extra query, whatever the page size.
+
+    Returns:
+        List of dicts shaped like serialize_recipe() output.
+    """
+    stmt = apply_page(_recipe_select(), Recipe.recipe_id, limit, offset, after_id)
+    return await _load_recipes(db, stmt, include)
+
+
+async def get_recipes_by_ids(
+    db: AsyncSession,
+    recipe_ids: Collection[int],
+    include: Optional[Collection[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get the serialized recipes with the given IDs (multi-get).
+
+    All recipes are read with one ``WHERE recipe_id IN (...)`` and share the
+    relationship queries. Results are ordered by recipe_id; unknown IDs are
+    simply absent.
+    """
+    stmt = _recipe_select().where(Recipe.recipe_id.in_(recipe_ids)).order_by(Recipe.recipe_id)
+    return await _load_recipes(db, stmt, include)
+
+
+def _recipe_select():
+    """Core select() of the Recipe columns emitted by serialize_recipe()."""
+    return select(
+        Recipe.recipe_id,
+        Recipe.recipe_name,
+        Recipe.recipe_description,
+        Recipe.recipe_fooditem_id,
+        Recipe.created_at,
+        Recipe.updated_at,
+    )
+
+
+async def _load_recipes(db: AsyncSession, stmt, include: Optional[Collection[str]]) -> List[Dict[str, Any]]:
+    """Run a _recipe_select() statement and attach the requested relationships."""
+    result = await db.execute(stmt)
+
+    recipes = {}
+    for recipe_id, name, description, fooditem_id, created_at, updated_at in result:
+        recipes[recipe_id] = {
+            "recipe_id": recipe_id,
+            "recipe_name": name,
+            "recipe_description": description,
+            "recipe_fooditem_id": fooditem_id,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+    if not recipes:
+        return []
+    ids = list(recipes)
+
+    if include is None or "ingredients" in include:
+        for data in recipes.values():
+            data["ingredients"] = []
+        stmt = (
+            select(
+                RecipeIngredient.ri_id,
+                RecipeIngredient.ri_recipe_id,
+                RecipeIngredient.ri_ingredient_id,
+                RecipeIngredient.ri_fooditem_id,
+                RecipeIngredient.ri_unit_type_id,
+                RecipeIngredient.ri_quantity,
+                RecipeIngredient.created_at,
+                RecipeIngredient.updated_at,
+                Ingredient.ingredient_name,
+                Ingredient.ingredient_description,
+                Ingredient.ingredient_notes,
+                FoodItem.fooditem_name,
+                FoodItem.fooditem_description,
+                UnitType.unit_type,
+            )
+            .outerjoin(Ingredient, RecipeIngredient.ri_ingredient_id == Ingredient.ingredient_id)
+            .outerjoin(FoodItem, RecipeIngredient.ri_fooditem_id == FoodItem.fooditem_id)
+            .outerjoin(UnitType, RecipeIngredient.ri_unit_type_id == UnitType.id)
+            .where(RecipeIngredient.ri_recipe_id.in_(ids))
+            .order_by(RecipeIngredient.ri_recipe_id, RecipeIngredient.ri_id)
+        )
+        result = await db.execute(stmt)
+        for row in result:
+            recipes[row[1]]["ingredients"].append({
+                "ri_id": row[0],
+                "ri_recipe_id": row[1],
+                "ri_ingredient_id": row[2],
+                "ri_fooditem_id": row[3],
+                "ri_unit_type_id": row[4],
+                "ri_quantity": row[5],
+                "created_at": row[6],
+                "updated_at": row[7],
+                "ingredient_name": row[8],
+                "ingredient_description": row[9],
+                "ingredient_notes": row[10],
+                "fooditem_name": row[11],
+                "fooditem_description": row[12],
+                "unit_type": row[13],
+            })
+
+    if include is None or "instructions" in include:
+        for data in recipes.values():
+            data["instructions"] = []
+        stmt = (
+            select(RecipeInstruction.recipe_id, RecipeInstruction.step_number, RecipeInstruction.instruction_text)
+            .where(RecipeInstruction.recipe_id.in_(ids))
+            .order_by(RecipeInstruction.recipe_id, RecipeInstruction.step_number)
+        )
+        result = await db.execute(stmt)
+        for recipe_id, step_number, instruction_text in result:
+            recipes[recipe_id]["instructions"].append({
+                "step_number": step_number,
+                "instruction_text": instruction_text,
+            })
+
+    if include is None or "categories" in include:
+        for data in recipes.values():
+            data["categories"] = []
+        stmt = (
+            select(RecipeCategory.recipe_id, *_CATEGORY_COLUMNS)
+            .join(Category, RecipeCategory.category_id == Category.category_id)
+            .where(RecipeCategory.recipe_id.in_(ids))
+            .order_by(RecipeCategory.recipe_id, Category.category_id)
+        )
+        result = await db.execute(stmt)
+        for row in result:
+            recipes[row[0]]["categories"].append(_category(row))
+
+    return list(recipes.values())
+
+
+# ============================================================================
+# Meal Reads
+# ============================================================================
+
+async def get_meals_page(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+    include: Optional[Collection[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get one page of serialized meals ordered by meal_id.
+
+    Paging and ``include`` work as in get_recipes_page().
+
+    Returns:
+        List of dicts shaped like serialize_meal() output.
+    """
+    stmt = apply_page(_meal_select(), Meal.meal_id, limit, offset, after_id)
+    return await _load_meals(db, stmt, include)
+
+
+async def get_meals_by_ids(
+    db: AsyncSession,
+    meal_ids: Collection[int],
+    include: Optional[Collection[str]] = None
+) -> List[Dict[str, Any]]:
+    """Get the serialized meals with the given IDs (see get_recipes_by_ids())."""
+    stmt = _meal_select().where(Meal.meal_id.in_(meal_ids)).order_by(Meal.meal_id)
+    return await _load_meals(db, stmt, include)
+
+
+def _meal_select():
+    """Core select() of the Meal columns emitted by serialize_meal()."""
+    return select(Meal.meal_id, Meal.meal_name, Meal.meal_description, Meal.created_at, Meal.updated_at)
+
+
+async def _load_meals(db: AsyncSession, stmt, include: Optional[Collection[str]]) -> List[Dict[str, Any]]:
+    """Run a _meal_select() statement and attach the requested relationships."""
+    result = await db.execute(stmt)
+
+    meals = {}
+    for meal_id, name, description, created_at, updated_at in result:
+        meals[meal_id] = {
+            "meal_id": meal_id,
+            "meal_name": name,
+            "meal_description": description,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+    if not meals:
+        return []
+    ids = list(meals)
+
+    if include is None or "food_items" in include:
+        for data in meals.values():
+            data["food_items"] = []
+        stmt = (
+            select(MealFoodItem.mf_meal_id, FoodItem.fooditem_id, FoodItem.fooditem_name, FoodItem.fooditem_description)
+            .join(FoodItem, MealFoodItem.mf_fooditem_id == FoodItem.fooditem_id)
+            .where(MealFoodItem.mf_meal_id.in_(ids))
+            .order_by(MealFoodItem.mf_meal_id, MealFoodItem.mf_id)
+        )
+        result = await db.execute(stmt)
+        for meal_id, fooditem_id, name, description in result:
+            meals[meal_id]["food_items"].append({
+                "fooditem_id": fooditem_id,
+                "fooditem_name": name,
+                "fooditem_description": description,
+            })
+
+    if include is None or "categories" in include:
+        for data in meals.values():
+            data["categories"] = []
+        stmt = (
+            select(MealCategory.meal_id, *_CATEGORY_COLUMNS)
+            .join(Category, MealCategory.category_id == Category.category_id)
+            .where(MealCategory.meal_id.in_(ids))
+            .order_by(MealCategory.meal_id, Category.category_id)
+        )
+        result = await db.execute(stmt)
+        for row in result:
+            meals[row[0]]["categories"].append(_category(row))
+
+    return list(meals.values())
+
+
+# ============================================================================
+# Name Lookups
+# ============================================================================
+
+async def get_names(db: AsyncSession, key, name, ids: Iterable[int]) -> Dict[int, str]:
+    """
+    Map ids to names for one table with a single IN query.
+
+    Args:
+        key: Primary key column (e.g. Ingredient.ingredient_id).
+        name: Name column of the same table.
+        ids: Ids to look up; repeats are fine. Unknown ids are absent
+             from the result, and no query is made when there are none.
+    """
+    ids = set(ids)
+    if not ids:
+        return {}
+    result = await db.execute(select(key, name).where(key.in_(ids)))
+    return dict(result.all())
@@ -0,0 +1,322 @@
+"""
+FoodItem dependency graph guarding compound recipes against cycles.
+
+A recipe producing food item v that uses food item u puts an edge u -> v
+("v requires u") in the graph. A write that would make a food item
+require itself, directly or through other recipes, would send every
+traversal of the recipe graph (expansion.py, pantry.py) into a loop, so
+the crud recipe writes run it through DependencyGraph.set_recipe() first
+and roll back on RecipeCycleError. The graph is changed before the write
+is committed, so a commit that fails puts the recipe's previous entry
+back (DependencyGraph.restore_recipe()).
+
+The graph keeps a topological order of its food items and maintains it
+incrementally (Pearce & Kelly, "A Dynamic Topological Sort Algorithm for
+Directed Acyclic Graphs"): an edge that already agrees with the order is
+accepted in O(1); otherwise only the food items ordered between its two
+ends are searched and reordered, and the graph is never re-walked from
+the database.
+"""
+
+import logging
+from collections import Counter, defaultdict, deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .expansion import RecipeCycleError
+from .models import Recipe, RecipeIngredient
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyGraph:
+    """Food item graph with an incrementally maintained topological order."""
+
+    def __init__(self):
+        # fooditem_id -> position in the topological order
+        self._order: Dict[int, int] = {}
+        self._next = 0
+        # u -> {v: number of recipes producing v that use u}, and the reverse
+        self._out: Dict[int, Counter] = defaultdict(Counter)
+        self._in: Dict[int, Counter] = defaultdict(Counter)
+        # recipe_id -> (produced fooditem_id, used fooditem_ids)
+        self._recipes: Dict[int, Tuple[int, FrozenSet[int]]] = {}
+        # fooditem_id -> recipe_ids producing it
+        self._producers: Dict[int, Set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._recipes)
+
+    @classmethod
+    def build(cls, recipes: Dict[int, Tuple[int, Iterable[int]]]) -> "DependencyGraph":
+        """
+        Build a graph from recipe_id -> (produced fooditem_id, used fooditem_ids).
+
+        The order comes from one Kahn topological sort. Recipes that
+        already form a cycle in the data cannot be ordered; they are added
+        one at a time instead, and those closing a cycle are left out
+        (logged) until they are next written.
+        """
+        graph = cls()
+        edges = Counter()
+        for recipe_id, (produces, uses) in recipes.items():
+            uses = frozenset(uses)
+            graph._recipes[recipe_id] = (produces, uses)
+            graph._producers[produces].add(recipe_id)
+            edges.update((u, produces) for u in uses)
+
+        nodes = set()
+        for (u, v), count in edges.items():
+            graph._out[u][v] = count
+            graph._in[v][u] = count
+            nodes.update((u, v))
+        nodes.update(produces for produces, _ in graph._recipes.values())
+
+        pending = {node: len(graph._in.get(node, ())) for node in nodes}
+        ready = deque(sorted(node for node, count in pending.items() if count == 0))
+        while ready:
+            node = ready.popleft()
+            graph._order[node] = graph._next
+            graph._next += 1
+            for v in graph._out.get(node, ()):
+                pending[v] -= 1
+                if pending[v] == 0:
+                    ready.append(v)
+
+        if len(graph._order) < len(nodes):
+            logger.warning("Recipe data already contains cycles; ordering recipes one at a time")
+            return cls._build_incrementally(recipes)
+        return graph
+
+    @classmethod
+    def _build_incrementally(cls, recipes: Dict[int, Tuple[int, Iterable[int]]]) -> "DependencyGraph":
+        """Build by set_recipe() per recipe, leaving out recipes that close a cycle."""
+        graph = cls()
+        for recipe_id, (produces, uses) in sorted(recipes.items()):
+            try:
+                graph.set_recipe(recipe_id, produces, uses)
+            except RecipeCycleError as e:
+                logger.warning("Recipe %d left out of the dependency graph: %s", recipe_id, e)
+        return graph
+
+    def set_recipe(self, recipe_id: int, produces: int, uses: Iterable[int]) -> None:
+        """
+        Record what a recipe produces and uses, replacing its previous entry.
+
+        Raises:
+            RecipeCycleError: If the recipe would make a food item require
+                              itself. The graph is left unchanged.
+        """
+        uses = frozenset(uses)
+        old = self._recipes.get(recipe_id)
+        if old is not None:
+            self._remove_edges(*old)
+
+        added = []
+        try:
+            for u in sorted(uses):
+                self._add_edge(u, produces)
+                added.append(u)
+        except RecipeCycleError:
+            self._remove_edges(produces, added)
+            if old is not None:
+                # The old edges came from an acyclic graph, so this cannot fail
+                for u in old[1]:
+                    self._add_edge(u, old[0])
+            raise
+
+        if old is not None:
+            self._producers[old[0]].discard(recipe_id)
+        self._recipes[recipe_id] = (produces, uses)
+        self._producers[produces].add(recipe_id)
+
+    def entry(self, recipe_id: int) -> Optional[Tuple[int, FrozenSet[int]]]:
+        """What a recipe produces and uses as recorded (None if it is not in the graph)."""
+        return self._recipes.get(recipe_id)
+
+    def restore_recipe(self, recipe_id: int, entry: Optional[Tuple[int, FrozenSet[int]]]) -> None:
+        """
+        Put back a recipe's entry after a write to it was not committed.
+
+        ``entry`` is what entry() returned before the write; None removes
+        the recipe. If writes made since would turn the old entry into a
+        cycle, the recipe is left out (logged) until it is next written,
+        as in build().
+        """
+        if entry is None:
+            self.remove_recipe(recipe_id)
+            return
+        try:
+            self.set_recipe(recipe_id, *entry)
+        except RecipeCycleError as e:
+            self.remove_recipe(recipe_id)
+            logger.warning("Recipe %d left out of the dependency graph: %s", recipe_id, e)
+
+    def remove_recipe(self, recipe_id: int) -> None:
+        """Drop a deleted recipe (no-op if it is not in the graph)."""
+        recipe = self._recipes.pop(recipe_id, None)
+        if recipe is not None:
+            self._remove_edges(*recipe)
+            self._producers[recipe[0]].discard(recipe_id)
+
+    def remove_fooditem(self, fooditem_id: int) -> None:
+        """
+        Drop a deleted food item.
+
+        Mirrors ON DELETE CASCADE: recipes producing it are removed, and it
+        disappears from the ingredients of recipes using it.
+        """
+        for recipe_id in list(self._producers.get(fooditem_id, ())):
+            self.remove_recipe(recipe_id)
+        self._producers.pop(fooditem_id, None)
+        for v in list(self._out.get(fooditem_id, ())):
+            for recipe_id in list(self._producers.get(v, ())):
+                produces, uses = self._recipes[recipe_id]
+                if fooditem_id in uses:
+                    self.set_recipe(recipe_id, produces, uses - {fooditem_id})
+        self._order.pop(fooditem_id, None)
+        self._out.pop(fooditem_id, None)
+        self._in.pop(fooditem_id, None)
+
+    def _position(self, node: int) -> int:
+        """Order position of a food item, appending unseen ones at the end."""
+        position = self._order.get(node)
+        if position is None:
+            position = self._order[node] = self._next
+            self._next += 1
+        return position
+
+    def _remove_edges(self, produces: int, uses: Iterable[int]) -> None:
+        for u in uses:
+            self._out[u][produces] -= 1
+            self._in[produces][u] -= 1
+            if self._out[u][produces] <= 0:
+                del self._out[u][produces]
+                del self._in[produces][u]
+
+    def _add_edge(self, u: int, v: int) -> None:
+        """Add one use of u by a recipe producing v, reordering if needed."""
+        if u == v:
+            raise RecipeCycleError([v, v])
+        lower, upper = self._position(v), self._position(u)
+        if self._out[u][v] == 0 and lower < upper:
+            self._reorder(u, v, lower, upper)
+        self._out[u][v] += 1
+        self._in[v][u] += 1
+
+    def _reorder(self, u: int, v: int, lower: int, upper: int) -> None:
+        """
+        Make room for u -> v when u is currently ordered after v.
+
+        Searches forward from v and backward from u, visiting only food
+        items positioned between the two, then gives the backward set the
+        lowest of their combined positions.
+        """
+        forward = self._search(v, self._out, lambda position: position <= upper, target=u)
+        backward = self._search(u, self._in, lambda position: position >= lower)
+
+        affected = sorted(backward, key=self._order.get) + sorted(forward, key=self._order.get)
+        positions = sorted(self._order[node] for node in affected)
+        for node, position in zip(affected, positions):
+            self._order[node] = position
+
+    def _search(self, start: int, edges: Dict[int, Counter], within, target: Optional[int] = None) -> List[int]:
+        """
+        Depth-first search from start over edges, staying within a window.
+
+        Raises:
+            RecipeCycleError: If ``target`` is reached (only for the forward
+                              search, where that means u already requires v).
+        """
+        parent = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for nxt in edges.get(node, ()):
+                if nxt == target:
+                    path = [target, node]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    # path runs target <- ... <- start; report it as
+                    # start requires target requires ... requires start
+                    raise RecipeCycleError([start] + path)
+                if nxt not in parent and within(self._order[nxt]):
+                    parent[nxt] = node
+                    stack.append(nxt)
+        return list(parent)
+
+
+# Process-wide graph; None until built
+_graph: Optional[DependencyGraph] = None
+
+
+async def build_graph(db: AsyncSession) -> None:
+    """Build the graph from the Recipe and RecipeIngredient tables."""
+    global _graph
+    recipes: Dict[int, Tuple[int, List[int]]] = {}
+    result = await db.execute(select(Recipe.recipe_id, Recipe.recipe_fooditem_id))
+    for recipe_id, fooditem_id in result:
+        recipes[recipe_id] = (fooditem_id, [])
+    result = await db.execute(
+        select(RecipeIngredient.ri_recipe_id, RecipeIngredient.ri_fooditem_id)
+        .where(RecipeIngredient.ri_fooditem_id.is_not(None))
+    )
+    for recipe_id, fooditem_id in result:
+        if recipe_id in recipes:
+            recipes[recipe_id][1].append(fooditem_id)
+    _graph = DependencyGraph.build(recipes)
+    logger.info("Built recipe dependency graph: %d recipes", len(_graph))
+
+
+async def get_graph(db: AsyncSession) -> DependencyGraph:
+    """Return the graph, building it first if startup did not."""
+    if _graph is None:
+        await build_graph(db)
+    return _graph
+
+
+def ingredient_fooditem_ids(ingredients: Iterable[Dict]) -> Set[int]:
+    """Food items used by a list of recipe ingredient dicts."""
+    return {data["ri_fooditem_id"] for data in ingredients if data.get("ri_fooditem_id") is not None}
+
+
+async def refresh_recipe(db: AsyncSession, recipe_id: int) -> None:
+    """
+    Re-read what one recipe produces and uses into the graph.
+
+    Run before committing a change to the recipe. The graph is built
+    (if needed) before the session's pending changes are flushed, so the
+    change is checked against the committed state.
+
+    Raises:
+        RecipeCycleError: If the recipe now closes a cycle.
+    """
+    graph = await get_graph(db)
+    await db.flush()
+    result = await db.execute(select(Recipe.recipe_fooditem_id).where(Recipe.recipe_id == recipe_id))
+    produces = result.scalar_one_or_none()
+    if produces is None:
+        graph.remove_recipe(recipe_id)
+        return
+    result = await db.execute(
+        select(RecipeIngredient.ri_fooditem_id).where(
+            RecipeIngredient.ri_recipe_id == recipe_id,
+            RecipeIngredient.ri_fooditem_id.is_not(None)
+        )
+    )
+    graph.set_recipe(recipe_id, produces, result.scalars().all())
+
+
+def forget_recipes(*recipe_ids: int) -> None:
+    """Remove deleted recipes from the graph (no-op until built)."""
+    if _graph is not None:
+        for recipe_id in recipe_ids:
+            _graph.remove_recipe(recipe_id)
+
+
+def forget_fooditem(fooditem_id: int) -> None:
+    """Remove a deleted food item from the graph (no-op until built)."""
+    if _graph is not None:
+        _graph.remove_fooditem(fooditem_id)
@@ -5,21 +5,45 @@ Updated to use SQLAlchemy ORM instead of raw SQL while maintaining
 exact same API response format for backward compatibility.
 """
 
-from fastapi import APIRouter, HTTPException, Body, Path, Query, Depends
+from fastapi import APIRouter, HTTPException, Body, Path, Query, Depends, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
 import logging
+import math
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import old db module for schema operations (keep for now)
 from . import db
 
 # Import new SQLAlchemy infrastructure
-from .database import get_db
+from .database import get_db, AsyncSessionLocal
+from .config import settings
 from . import crud
+from . import autocomplete
+from . import bulk_import
+from . import category_tree
+from . import expansion
+from . import ingredient_index
+from . import pantry
+from . import scaling
+from . import shopping
+from . import units
+from . import queries
 from . import serializers
+from .pagination import PageParams, parse_ids, in_request_order
+from .cache import response_cache, recipe_tags, recipe_data_tags, RECIPE_LIST_TAG
+from . import conditional
+from . import versions
+from . import encoding
+from .encoding import FastJSONResponse
 from .schemas import UserCreate, UserResponse, LoginRequest, Token
 from .security import verify_password, create_access_token
 from .dependencies import get_current_user
-from .models import User
+from .models import (
+    User, Recipe, Ingredient, Category, FoodItem, Meal, UnitType,
+    RecipeIngredient, RecipeInstruction, RecipeCategory, MealFoodItem, MealCategory
+)
 
 router = APIRouter()
 
@@ -27,6 +51,139 @@ logger = logging.getLogger(__name__)
 
 MAX_RECIPES = 1000
 
+# Response header carrying the (cached) total row count on list endpoints
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Number of recipes loaded and serialized per chunk by /recipes/export
+EXPORT_BATCH_SIZE = 500
+
+# Default number of results per entity type returned by /search
+OMNI_SEARCH_LIMIT = 5
+
+# Default number of suggestions returned by /autocomplete
+AUTOCOMPLETE_LIMIT = 10
+
+# Default number of recipes ranked by /recipes/match
+PANTRY_MATCH_LIMIT = 20
+
+# Maximum number of meal and recipe entries in one /shopping-list request
+SHOPPING_LIST_MAX_ENTRIES = 500
+
+# Bounds of /recipes/{id}/scaled and /recipes/scale requests
+SCALE_MAX_RECIPES = 100
+SCALE_MAX_FACTOR = 1000.0
+
+# Tables whose rows appear in each representation (for ETags)
+RECIPE_TABLES = (
+    Recipe, RecipeIngredient, RecipeInstruction, RecipeCategory,
+    Ingredient, FoodItem, UnitType, Category,
+)
+MEAL_TABLES = (Meal, MealFoodItem, FoodItem, MealCategory, Category)
+FOOD_ITEM_TABLES = (FoodItem, Recipe)
+
+FIELDS_DESCRIPTION = "Comma-separated top-level keys to return"
+INCLUDE_DESCRIPTION = "Comma-separated relationships to embed (empty for none)"
+FUZZY_DESCRIPTION = "Match names by trigram similarity, tolerating typos"
+DESCENDANTS_DESCRIPTION = "Also match items in subcategories at any depth"
+IDS_DESCRIPTION = "Comma-separated ids to fetch in one request (pagination is ignored)"
+
+
+def _conditional(request: Request, version, *parts):
+    """
+    Build validator headers for a version and check If-None-Match.
+
+    Returns:
+        Tuple of (validator headers, 304 response if the client's copy is
+        current, else None).
+    """
+    etag = conditional.make_etag(*parts, *version)
+    headers = conditional.validator_headers(etag, version[0])
+    if conditional.is_not_modified(request, etag):
+        return headers, conditional.not_modified_response(headers)
+    return headers, None
+
+
+async def _gather_reads(session: AsyncSession, *reads):
+    """
+    Run independent read-only calls concurrently and return their results.
+
+    Each read is an ``async def read(db)``; with a connection pool every
+    read gets its own session (and connection), so the total latency is
+    that of the slowest read. SQLite shares a single connection
+    (StaticPool), so there the reads run one after another on the request
+    session.
+    """
+    if session.bind.dialect.name == "sqlite":
+        return [await read(session) for read in reads]
+
+    async def run(read):
+        async with AsyncSessionLocal() as own_session:
+            return await read(own_session)
+
+    return await asyncio.gather(*(run(read) for read in reads))
+
+
+def _servings(entries, id_key: str):
+    """
+    Parse [{<id_key>: int, "servings": number}, ...] from a request body.
+
+    servings defaults to 1; repeated ids add up. Malformed entries, and
+    servings adding up to more than a float can hold, are a 400.
+    """
+    if entries is None:
+        return {}
+    if not isinstance(entries, list):
+        raise HTTPException(status_code=400, detail=f"Expected a list of {{{id_key}, servings}} objects")
+
+    servings = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise HTTPException(status_code=400, detail=f"Expected a list of {{{id_key}, servings}} objects")
+        entry_id = entry.get(id_key)
+        count = entry.get("servings", 1)
+        if isinstance(entry_id, bool) or not isinstance(entry_id, int) or entry_id <= 0:
+            raise HTTPException(status_code=400, detail=f"{id_key} must be a positive integer")
+        if isinstance(count, bool) or not isinstance(count, (int, float)) or not count > 0:
+            raise HTTPException(status_code=400, detail="servings must be a positive number")
+        total = servings.get(entry_id, 0) + count
+        if not math.isfinite(total):
+            raise HTTPException(status_code=400, detail="servings must add up to a finite number")
+        servings[entry_id] = total
+    return servings
+
+
+def _scale_entries(entries):
+    """
+    Parse [{"recipe_id": int, "factor": number}, ...] from a request body.
+
+    Entries are kept in order, repeats included. Malformed entries are a 400.
+    """
+    if not isinstance(entries, list) or not entries:
+        raise HTTPException(status_code=400, detail="Expected a non-empty list of {recipe_id, factor} objects")
+    if len(entries) > SCALE_MAX_RECIPES:
+        raise HTTPException(status_code=400, detail=f"At most {SCALE_MAX_RECIPES} recipes per request")
+
+    parsed = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise HTTPException(status_code=400, detail="Expected a non-empty list of {recipe_id, factor} objects")
+        recipe_id = entry.get("recipe_id")
+        factor = entry.get("factor")
+        if isinstance(recipe_id, bool) or not isinstance(recipe_id, int) or recipe_id <= 0:
+            raise HTTPException(status_code=400, detail="recipe_id must be a positive integer")
+        if isinstance(factor, bool) or not isinstance(factor, (int, float)) or not 0 < factor <= SCALE_MAX_FACTOR:
+            raise HTTPException(status_code=400, detail=f"factor must be a number in (0, {SCALE_MAX_FACTOR:g}]")
+        parsed.append((recipe_id, float(factor)))
+    return parsed
+
+
+def _field_selection(fields, include, all_fields, relationships):
+    """Resolve ?fields=/?include= for a route, mapping bad names to a 400."""
+    try:
+        return serializers.select_fields(fields, include, all_fields, relationships)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 
 # ============================================================================
 # Auth Endpoints
@@ -71,22 +228,307 @@ async def root():
 # ============================================================================
 
 @router.get("/recipes")
-async def get_recipes(session: AsyncSession = Depends(get_db)):
-    """Get all recipes with ingredients, instructions, and categories."""
-    recipes = await crud.get_all_recipes(session)
-    return {"recipes": serializers.serialize_recipes(recipes)}
+async def get_recipes(
+    request: Request,
+    page: PageParams = Depends(),
+    ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Get a page of recipes with ingredients, instructions, and categories.
+
+    Supports limit/offset and keyset pagination on recipe_id: pass the
+    returned ``next_cursor`` as ``after`` to fetch the following page.
+    ``next_cursor`` is null on the last page. Pages are capped at MAX_RECIPES.
+    ``fields`` and ``include`` trim the payload; relationships that are not
+    requested are not queried. Encoded pages are served from the response
+    cache until a write touches one of the recipes on them.
+
+    ``ids`` turns the request into a multi-get: the listed recipes are
+    loaded together and returned in request order, with unknown ids under
+    ``missing``.
+    """
+    selected = _field_selection(fields, include, serializers.RECIPE_FIELDS, serializers.RECIPE_RELATIONSHIPS)
+    requested = parse_ids(ids)
+    if requested is not None:
+        headers, not_modified = _conditional(
+            request, versions.get_version(*RECIPE_TABLES),
+            "recipes", "ids", tuple(requested), fields, include
+        )
+        if not_modified:
+            return not_modified
+
+        recipes = await queries.get_recipes_by_ids(
+            session, requested,
+            include=serializers.loaded_relationships(selected, serializers.RECIPE_RELATIONSHIPS)
+        )
+        recipes, missing = in_request_order(recipes, requested, "recipe_id")
+        return FastJSONResponse({
+            "recipes": [serializers.pick_fields(recipe, selected) for recipe in recipes],
+            "missing": missing
+        }, headers=headers)
+
+    page.limit = min(page.limit, MAX_RECIPES)
+
+    version = versions.get_version(*RECIPE_TABLES)
+    headers, not_modified = _conditional(
+        request, version, "recipes", page.limit, page.offset, page.after_id, fields, include
+    )
+    if not_modified:
+        return not_modified
+
+    key = ("recipes", page.limit, page.offset, page.after_id, fields, include)
+    body = response_cache.get(key)
+    if body is None:
+        # Fetch one extra row to learn whether another page exists
+        recipes = await queries.get_recipes_page(
+            session, page.limit + 1, offset=page.offset, after_id=page.after_id,
+            include=serializers.loaded_relationships(selected, serializers.RECIPE_RELATIONSHIPS)
+        )
+        recipes, next_cursor = page.split(recipes, "recipe_id")
+
+        tags = {RECIPE_LIST_TAG}
+        for recipe in recipes:
+            tags |= recipe_data_tags(recipe)
+        body = encoding.dumps({
+            "recipes": [serializers.pick_fields(recipe, selected) for recipe in recipes],
+            "next_cursor": next_cursor
+        })
+        # A write committed while the page was read has already dropped
+        # its tags; caching the body read before it would keep it stale
+        if versions.get_version(*RECIPE_TABLES) == version:
+            response_cache.set(key, body, tags)
+
+    headers[TOTAL_COUNT_HEADER] = str(await crud.count_rows(session, Recipe))
+    return FastJSONResponse(body, headers=headers)
+
+
+@router.get("/recipes/export")
+async def export_recipes(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$", description="ndjson or json")
+):
+    """
+    Stream the full recipe catalog.
+
+    Recipes are read in batches with a server-side cursor and written out as
+    they are serialized (same shape as GET /recipes/{id}), so memory use does
+    not grow with the catalog. ``format=ndjson`` emits one recipe per line;
+    ``format=json`` emits a single JSON array.
+    """
+    def encode(recipe) -> str:
+        return encoding.dumps(serializers.serialize_recipe(recipe)).decode("utf-8")
+
+    async def generate():
+        # Own session: the stream outlives the request-scoped get_db session
+        async with AsyncSessionLocal() as session:
+            first = True
+            if format == "json":
+                yield "["
+            async for batch in crud.stream_recipe_batches(session, EXPORT_BATCH_SIZE):
+                if format == "json":
+                    chunk = ",".join(encode(recipe) for recipe in batch)
+                    yield chunk if first else "," + chunk
+                else:
+                    yield "".join(encode(recipe) + "\n" for recipe in batch)
+                first = False
+            if format == "json":
+                yield "]"
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(generate(), media_type=media_type)
+
+
+@router.get("/recipes/filter")
+async def filter_recipes(
+    page: PageParams = Depends(),
+    with_ingredients: Optional[str] = Query(None, alias="with", description="Comma-separated ingredient ids the recipe must use (all of them)"),
+    without_ingredients: Optional[str] = Query(None, alias="without", description="Comma-separated ingredient ids the recipe must not use"),
+    with_food_items: Optional[str] = Query(None, description="Comma-separated food item ids the recipe must use (all of them)"),
+    without_food_items: Optional[str] = Query(None, description="Comma-separated food item ids the recipe must not use"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Get recipes by the ingredients they use and do not use.
+
+    ``/recipes/filter?with=3,7&without=12`` returns the recipes that use
+    both ingredients 3 and 7 and not ingredient 12. Matching is answered
+    by the in-memory ingredient index (see ingredient_index.py); only the
+    page of matching recipes is read from the database. Paging, ``fields``
+    and ``include`` work as on GET /recipes; X-Total-Count is the number of
+    matching recipes.
+    """
+    required = [("ingredient", i) for i in parse_ids(with_ingredients, "with") or []]
+    required += [("fooditem", i) for i in parse_ids(with_food_items, "with_food_items") or []]
+    excluded = [("ingredient", i) for i in parse_ids(without_ingredients, "without") or []]
+    excluded += [("fooditem", i) for i in parse_ids(without_food_items, "without_food_items") or []]
+    if not required and not excluded:
+        raise HTTPException(
+            status_code=400,
+            detail="Give at least one of with, without, with_food_items or without_food_items"
+        )
+
+    selected = _field_selection(fields, include, serializers.RECIPE_FIELDS, serializers.RECIPE_RELATIONSHIPS)
+    page.limit = min(page.limit, MAX_RECIPES)
+
+    index = await ingredient_index.get_index(session)
+    matched = index.match(required, excluded)
+    # Fetch one extra id to learn whether another page exists
+    recipe_ids = ingredient_index.page(matched, page.limit + 1, page.offset, page.after_id)
+    recipes = []
+    if recipe_ids:
+        recipes = await queries.get_recipes_by_ids(
+            session, recipe_ids,
+            include=serializers.loaded_relationships(selected, serializers.RECIPE_RELATIONSHIPS)
+        )
+    recipes, next_cursor = page.split(recipes, "recipe_id")
+
+    return FastJSONResponse({
+        "recipes": [serializers.pick_fields(recipe, selected) for recipe in recipes],
+        "next_cursor": next_cursor
+    }, headers={TOTAL_COUNT_HEADER: str(matched.bit_count())})
+
+
+@router.get("/recipes/match")
+async def match_pantry(
+    ingredients: Optional[str] = Query(None, description="Comma-separated ingredient ids on hand"),
+    food_items: Optional[str] = Query(None, description="Comma-separated food item ids on hand"),
+    min_coverage: float = Query(0.0, ge=0.0, le=1.0, description="Minimum fraction of ingredient rows covered"),
+    limit: int = Query(PANTRY_MATCH_LIMIT, ge=1, le=100, description="Recipes to return"),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Rank recipes by how much of them the given pantry covers.
+
+    ``coverage`` is the fraction of a recipe's ingredient rows satisfied by
+    the pantry; a food item row also counts when a recipe producing that
+    food item is fully covered. ``missing`` lists the rest. Every recipe in
+    the catalog is scored (see pantry.py); X-Total-Count is the number of
+    recipes with any coverage (at least ``min_coverage``).
+    """
+    ingredient_ids = parse_ids(ingredients, "ingredients") or []
+    fooditem_ids = parse_ids(food_items, "food_items") or []
+    if not ingredient_ids and not fooditem_ids:
+        raise HTTPException(status_code=400, detail="Give at least one of ingredients or food_items")
+
+    matches, total = await pantry.match_recipes(session, ingredient_ids, fooditem_ids, limit, min_coverage)
+    return FastJSONResponse({"matches": matches}, headers={TOTAL_COUNT_HEADER: str(total)})
+
+
+@router.get("/recipes/search")
+async def search_recipes(
+    q: str = Query(..., description="Search query", min_length=1, max_length=100),
+    fuzzy: bool = Query(False, description=FUZZY_DESCRIPTION),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Search recipes by name.
+
+    Where the full-text index is migrated, every query word must start a
+    word of the recipe's name or description ("chick sou" finds "Chicken
+    Soup"); otherwise ``q`` matches any substring of the name.
+    """
+    recipes = await crud.search_recipes(session, q, fuzzy=fuzzy)
+    return FastJSONResponse({"results": serializers.serialize_recipes(recipes)})
 
 
 @router.get("/recipes/{id}")
 async def get_recipe(
+    request: Request,
     id: int = Path(..., description="The ID of the recipe to retrieve", gt=0),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     session: AsyncSession = Depends(get_db)
 ):
-    """Get a single recipe by ID."""
-    recipe = await crud.get_recipe_by_id(session, id)
-    if recipe is None:
+    """Get a single recipe by ID (served from the response cache when possible)."""
+    selected = _field_selection(fields, include, serializers.RECIPE_FIELDS, serializers.RECIPE_RELATIONSHIPS)
+
+    version = versions.get_version(*RECIPE_TABLES)
+    headers, not_modified = _conditional(request, version, "recipe", id, fields, include)
+    if not_modified:
+        return not_modified
+
+    key = ("recipe", id, fields, include)
+    body = response_cache.get(key)
+    if body is None:
+        recipe = await crud.get_recipe_by_id(
+            session, id, include=serializers.loaded_relationships(selected, serializers.RECIPE_RELATIONSHIPS)
+        )
+        if recipe is None:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        body = encoding.dumps(serializers.serialize_recipe(recipe, selected))
+        # As in get_recipes(): not if a write committed during the read
+        if versions.get_version(*RECIPE_TABLES) == version:
+            response_cache.set(key, body, recipe_tags(recipe))
+
+    return FastJSONResponse(body, headers=headers)
+
+
+@router.get("/recipes/{id}/expanded")
+async def get_expanded_recipe(
+    id: int = Path(..., description="The ID of the recipe to expand", gt=0),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Resolve a recipe down to raw ingredients.
+
+    Food items used as ingredients are replaced by the ingredients of the
+    recipe producing them (lowest recipe_id when several do), recursively,
+    with quantities multiplied through. Food items no recipe produces are
+    listed under "food_items".
+    """
+    try:
+        expanded = await expansion.expand_recipe(session, id)
+    except expansion.RecipeCycleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if expanded is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return FastJSONResponse(expanded)
+
+
+@router.get("/recipes/{id}/scaled")
+async def get_scaled_recipe(
+    id: int = Path(..., description="The ID of the recipe to scale", gt=0),
+    factor: float = Query(..., gt=0, le=SCALE_MAX_FACTOR, description="Multiplier for every ingredient quantity"),
+    normalize: bool = Query(False, description="Move quantities to display units (1500 gram -> 1.5 kilogram)"),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Get a recipe with its ingredient quantities multiplied by ``factor``.
+
+    Same shape as GET /recipes/{id}, plus "scale_factor". Quantities are
+    rounded for display (see scaling.py).
+    """
+    recipes, _ = await scaling.scale_recipes(session, [(id, factor)], normalize)
+    if not recipes:
         raise HTTPException(status_code=404, detail="Recipe not found")
-    return serializers.serialize_recipe(recipe)
+    return FastJSONResponse(recipes[0])
+
+
+@router.post("/recipes/scale")
+async def scale_recipes(
+    request_data = Body(...),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Scale several recipes in one request.
+
+    Body: {"recipes": [{"recipe_id", "factor"}], "normalize": false}.
+    Returns the scaled recipes in request order (as GET
+    /recipes/{id}/scaled), with unknown ids under "missing".
+    """
+    if not isinstance(request_data, dict):
+        raise HTTPException(status_code=400, detail="Expected an object with recipes")
+    entries = _scale_entries(request_data.get("recipes"))
+    normalize = request_data.get("normalize", False)
+    if not isinstance(normalize, bool):
+        raise HTTPException(status_code=400, detail="normalize must be a boolean")
+
+    recipes, missing = await scaling.scale_recipes(session, entries, normalize)
+    return FastJSONResponse({"recipes": recipes, "missing": missing})
 
 
 @router.post("/recipes")
@@ -119,18 +561,60 @@ async def create_recipe(
     if 'recipe_fooditem_id' not in mapped_data:
         raise HTTPException(status_code=400, detail="Recipe fooditem_id is required")
 
-    recipe = await crud.create_recipe(session, mapped_data)
-    return serializers.serialize_recipe(recipe)
+    try:
+        recipe = await crud.create_recipe(session, mapped_data)
+    except expansion.RecipeCycleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return FastJSONResponse(serializers.serialize_recipe(recipe))
+
+
+@router.post("/recipes/bulk")
+async def create_recipes_bulk(
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+    _: User = Depends(get_current_user)
+):
+    """
+    Create many recipes in one request.
+
+    Body: a JSON array of recipes in the POST /recipes shape, or one recipe
+    per line with ``Content-Type: application/x-ndjson`` (consumed as it
+    streams). Recipes are written in transactions of
+    ``settings.bulk_import_chunk_size``. Returns {"created", "failed",
+    "recipe_ids", "errors"}: the new id per input position (null where the
+    recipe failed) and an {"index", "detail"} entry per failure, which does
+    not affect the other recipes.
+    """
+    if bulk_import.is_ndjson(request.headers.get("content-type")):
+        items = bulk_import.read_ndjson(request.stream())
+    else:
+        try:
+            items = encoding.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Malformed JSON body")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected an array of recipes")
+
+    report = await bulk_import.import_recipes(session, items, settings.bulk_import_chunk_size)
+    if not report["recipe_ids"]:
+        raise HTTPException(status_code=400, detail="No recipes given")
+    return FastJSONResponse(report)
 
 
 @router.put("/recipes/{id}")
 async def update_recipe(
+    request: Request,
     id: int = Path(..., gt=0),
     recipe_data = Body(...),
     session: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user)
 ):
-    """Update an existing recipe."""
+    """
+    Update an existing recipe.
+
+    Returns the updated recipe instead of a message when the request
+    carries ``Prefer: return=representation``.
+    """
     # Map frontend field names to database field names
     mapped_data = {}
     if 'name' in recipe_data:
@@ -148,9 +632,16 @@ async def update_recipe(
     if 'category_ids' in recipe_data:
         mapped_data['category_ids'] = recipe_data['category_ids']
 
-    updated = await crud.update_recipe(session, id, mapped_data)
+    try:
+        updated = await crud.update_recipe(
+            session, id, mapped_data, reload=conditional.prefers_representation(request)
+        )
+    except expansion.RecipeCycleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not updated:
         raise HTTPException(status_code=404, detail="Recipe not found")
+    if conditional.prefers_representation(request):
+        return FastJSONResponse(serializers.serialize_recipe(updated), headers=conditional.REPRESENTATION_APPLIED)
     return {"message": "Recipe updated successfully"}
 
 
@@ -172,10 +663,45 @@ async def delete_recipe(
 # ============================================================================
 
 @router.get("/ingredients")
-async def get_ingredients(session: AsyncSession = Depends(get_db)):
-    """Get all ingredients."""
-    ingredients = await crud.get_all_ingredients(session)
-    return {"ingredients": serializers.serialize_ingredients(ingredients)}
+async def get_ingredients(
+    request: Request,
+    page: PageParams = Depends(),
+    ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_db)
+):
+    """Get a page of ingredients (limit/offset or cursor pagination), or the ingredients listed in ``ids``."""
+    requested = parse_ids(ids)
+    if requested is not None:
+        headers, not_modified = _conditional(
+            request, versions.get_version(Ingredient),
+            "ingredients", "ids", tuple(requested)
+        )
+        if not_modified:
+            return not_modified
+
+        ingredients = await crud.get_ingredients_by_ids(session, requested)
+        ingredients, missing = in_request_order(
+            serializers.serialize_ingredients(ingredients), requested, "ingredient_id"
+        )
+        return FastJSONResponse({"ingredients": ingredients, "missing": missing}, headers=headers)
+
+    headers, not_modified = _conditional(
+        request, versions.get_version(Ingredient),
+        "ingredients", page.limit, page.offset, page.after_id
+    )
+    if not_modified:
+        return not_modified
+
+    ingredients = await crud.get_all_ingredients(
+        session, limit=page.limit + 1, offset=page.offset, after_id=page.after_id
+    )
+    ingredients, next_cursor = page.split(ingredients, "ingredient_id")
+
+    headers[TOTAL_COUNT_HEADER] = str(await crud.count_rows(session, Ingredient))
+    return FastJSONResponse({
+        "ingredients": serializers.serialize_ingredients(ingredients),
+        "next_cursor": next_cursor
+    }, headers=headers)
 
 
 @router.get("/ingredients/{id}")
@@ -187,7 +713,7 @@ async def get_ingredient(
     ingredient = await crud.get_ingredient_by_id(session, id)
     if ingredient is None:
         raise HTTPException(status_code=404, detail="Ingredient not found")
-    return serializers.serialize_ingredient(ingredient)
+    return FastJSONResponse(serializers.serialize_ingredient(ingredient))
 
 
 @router.post("/ingredients")
@@ -202,23 +728,32 @@ async def create_ingredient(
     if 'ingredient_name' not in ingredient_data or not ingredient_data['ingredient_name']:
         raise HTTPException(status_code=400, detail="Ingredient name is required")
 
-    ingredient = await crud.create_ingredient(session, ingredient_data)
-    return serializers.serialize_ingredient(ingredient)
+    try:
+        ingredient = await crud.create_ingredient(session, ingredient_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(serializers.serialize_ingredient(ingredient))
 
 
 @router.put("/ingredients/{id}")
 async def update_ingredient(
+    request: Request,
     id: int = Path(..., gt=0),
     ingredient_data = Body(...),
     session: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user)
 ):
-    """Update an existing ingredient."""
+    """Update an existing ingredient (returned with Prefer: return=representation)."""
     # Frontend already sends correct field names (ingredient_name, ingredient_description, ingredient_notes)
     # No mapping needed
-    updated = await crud.update_ingredient(session, id, ingredient_data)
+    try:
+        updated = await crud.update_ingredient(session, id, ingredient_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
         raise HTTPException(status_code=404, detail="Ingredient not found")
+    if conditional.prefers_representation(request):
+        return FastJSONResponse(serializers.serialize_ingredient(updated), headers=conditional.REPRESENTATION_APPLIED)
     return {"message": "Ingredient updated successfully"}
 
 
@@ -250,7 +785,7 @@ async def get_recipe_ingredients(
         raise HTTPException(status_code=404, detail="Recipe not found")
 
     ingredients = await crud.get_recipe_ingredients(session, id)
-    return {"ingredients": [serializers.serialize_recipe_ingredient(ri) for ri in ingredients]}
+    return FastJSONResponse({"ingredients": [serializers.serialize_recipe_ingredient(ri) for ri in ingredients]})
 
 
 @router.post("/recipes/{id}/ingredients")
@@ -265,22 +800,35 @@ async def add_recipe_ingredient(
     if recipe is None:
         raise HTTPException(status_code=404, detail="Recipe not found")
 
-    recipe_ingredient = await crud.add_ingredient_to_recipe(session, id, ingredient_data)
-    return serializers.serialize_recipe_ingredient(recipe_ingredient)
+    try:
+        recipe_ingredient = await crud.add_ingredient_to_recipe(session, id, ingredient_data)
+    except expansion.RecipeCycleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return FastJSONResponse(serializers.serialize_recipe_ingredient(recipe_ingredient))
 
 
 @router.put("/recipes/{id}/ingredients/{ingredient_id}")
 async def update_recipe_ingredient(
+    request: Request,
     id: int = Path(..., gt=0),
     ingredient_id: int = Path(..., gt=0),
     update_data = Body(...),
     session: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user)
 ):
-    """Update a recipe ingredient."""
-    updated = await crud.update_recipe_ingredient(session, id, ingredient_id, update_data)
+    """Update a recipe ingredient (returned with Prefer: return=representation)."""
+    try:
+        updated = await crud.update_recipe_ingredient(
+            session, id, ingredient_id, update_data, reload=conditional.prefers_representation(request)
+        )
+    except expansion.RecipeCycleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not updated:
         raise HTTPException(status_code=404, detail="Recipe or ingredient not found")
+    if conditional.prefers_representation(request):
+        return FastJSONResponse(
+            serializers.serialize_recipe_ingredient(updated), headers=conditional.REPRESENTATION_APPLIED
+        )
     return {"message": "Recipe ingredient updated successfully"}
 
 
@@ -303,10 +851,41 @@ async def remove_recipe_ingredient(
 # ============================================================================
 
 @router.get("/categories")
-async def get_categories(session: AsyncSession = Depends(get_db)):
-    """Get all categories."""
-    categories = await crud.get_all_categories(session)
-    return {"categories": serializers.serialize_categories(categories)}
+async def get_categories(
+    request: Request,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_db)
+):
+    """Get a page of categories (limit/offset or cursor pagination)."""
+    headers, not_modified = _conditional(
+        request, versions.get_version(Category),
+        "categories", page.limit, page.offset, page.after_id
+    )
+    if not_modified:
+        return not_modified
+
+    categories = await crud.get_all_categories(
+        session, limit=page.limit + 1, offset=page.offset, after_id=page.after_id
+    )
+    categories, next_cursor = page.split(categories, "category_id")
+
+    headers[TOTAL_COUNT_HEADER] = str(await crud.count_rows(session, Category))
+    return FastJSONResponse({
+        "categories": serializers.serialize_categories(categories),
+        "next_cursor": next_cursor
+    }, headers=headers)
+
+
+@router.get("/categories/tree")
+async def get_category_tree(session: AsyncSession = Depends(get_db)):
+    """
+    Get the whole category hierarchy as a nested tree.
+
+    Each node carries recipe_count, meal_count and ingredient_count for the
+    category and all of its descendants. Served from memory until the next
+    category write.
+    """
+    return FastJSONResponse(await category_tree.get_tree_body(session))
 
 
 @router.get("/categories/{id}")
@@ -318,7 +897,7 @@ async def get_category(
     category = await crud.get_category_by_id(session, id)
     if category is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    return serializers.serialize_category(category)
+    return FastJSONResponse(serializers.serialize_category(category))
 
 
 @router.post("/categories")
@@ -342,22 +921,28 @@ async def create_category(
         raise HTTPException(status_code=500, detail=str(e))
 
     logger.info("Created category id=%s", getattr(category, 'category_id', None))
-    return serializers.serialize_category(category)
+    return FastJSONResponse(serializers.serialize_category(category))
 
 
 @router.put("/categories/{id}")
 async def update_category(
+    request: Request,
     id: int = Path(..., gt=0),
     category_data = Body(...),
     session: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user)
 ):
-    """Update an existing category."""
+    """Update an existing category (returned with Prefer: return=representation)."""
     # Frontend already sends correct field names (category_name, category_description, parent_category_id)
     # No mapping needed
-    updated = await crud.update_category(session, id, category_data)
+    try:
+        updated = await crud.update_category(session, id, category_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
         raise HTTPException(status_code=404, detail="Category not found")
+    if conditional.prefers_representation(request):
+        return FastJSONResponse(serializers.serialize_category(updated), headers=conditional.REPRESENTATION_APPLIED)
     return {"message": "Category updated successfully"}
 
 
@@ -379,10 +964,45 @@ async def delete_category(
 # ============================================================================
 
 @router.get("/food-items")
-async def get_food_items(session: AsyncSession = Depends(get_db)):
-    """Get all food items."""
-    food_items = await crud.get_all_food_items(session)
-    return {"food_items": serializers.serialize_food_items(food_items)}
+async def get_food_items(
+    request: Request,
+    page: PageParams = Depends(),
+    ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_db)
+):
+    """Get a page of food items (limit/offset or cursor pagination), or the food items listed in ``ids``."""
+    requested = parse_ids(ids)
+    if requested is not None:
+        headers, not_modified = _conditional(
+            request, versions.get_version(*FOOD_ITEM_TABLES),
+            "food_items", "ids", tuple(requested)
+        )
+        if not_modified:
+            return not_modified
+
+        food_items = await crud.get_food_items_by_ids(session, requested)
+        food_items, missing = in_request_order(
+            serializers.serialize_food_items(food_items), requested, "fooditem_id"
+        )
+        return FastJSONResponse({"food_items": food_items, "missing": missing}, headers=headers)
+
+    headers, not_modified = _conditional(
+        request, versions.get_version(*FOOD_ITEM_TABLES),
+        "food_items", page.limit, page.offset, page.after_id
+    )
+    if not_modified:
+        return not_modified
+
+    food_items = await crud.get_all_food_items(
+        session, limit=page.limit + 1, offset=page.offset, after_id=page.after_id
+    )
+    food_items, next_cursor = page.split(food_items, "fooditem_id")
+
+    headers[TOTAL_COUNT_HEADER] = str(await crud.count_rows(session, FoodItem))
+    return FastJSONResponse({
+        "food_items": serializers.serialize_food_items(food_items),
+        "next_cursor": next_cursor
+    }, headers=headers)
 
 
 @router.get("/food-items/{id}/recipes")
@@ -396,19 +1016,24 @@ async def get_food_item_recipes(
         raise HTTPException(status_code=404, detail="Food item not found")
 
     recipes = await crud.get_recipes_by_food_item_id(session, id)
-    return {"recipes": serializers.serialize_recipes(recipes)}
+    return FastJSONResponse({"recipes": serializers.serialize_recipes(recipes)})
 
 
 @router.get("/food-items/{id}")
 async def get_food_item(
+    request: Request,
     id: int = Path(..., gt=0),
     session: AsyncSession = Depends(get_db)
 ):
     """Get a single food item by ID."""
+    headers, not_modified = _conditional(request, versions.get_version(*FOOD_ITEM_TABLES), "food_item", id)
+    if not_modified:
+        return not_modified
+
     food_item = await crud.get_food_item_by_id(session, id)
     if food_item is None:
         raise HTTPException(status_code=404, detail="Food item not found")
-    return serializers.serialize_food_item(food_item)
+    return FastJSONResponse(serializers.serialize_food_item(food_item), headers=headers)
 
 
 @router.post("/food-items")
@@ -424,22 +1049,27 @@ async def create_food_item(
         raise HTTPException(status_code=400, detail="Food item name is required")
 
     food_item = await crud.create_food_item(session, food_item_data)
-    return serializers.serialize_food_item(food_item)
+    return FastJSONResponse(serializers.serialize_food_item(food_item))
 
 
 @router.put("/food-items/{id}")
 async def update_food_item(
+    request: Request,
     id: int = Path(..., gt=0),
     food_item_data = Body(...),
     session: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user)
 ):
-    """Update an existing food item."""
+    """Update an existing food item (returned with Prefer: return=representation)."""
     # Frontend already sends correct field names (fooditem_name, fooditem_description)
     # No mapping needed
-    updated = await crud.update_food_item(session, id, food_item_data)
+    updated = await crud.update_food_item(
+        session, id, food_item_data, reload=conditional.prefers_representation(request)
+    )
     if not updated:
         raise HTTPException(status_code=404, detail="Food item not found")
+    if conditional.prefers_representation(request):
+        return FastJSONResponse(serializers.serialize_food_item(updated), headers=conditional.REPRESENTATION_APPLIED)
     return {"message": "Food item updated successfully"}
 
 
@@ -461,22 +1091,78 @@ async def delete_food_item(
 # ============================================================================
 
 @router.get("/meals")
-async def get_meals(session: AsyncSession = Depends(get_db)):
-    """Get all meals."""
-    meals = await crud.get_all_meals(session)
-    return {"meals": serializers.serialize_meals(meals)}
+async def get_meals(
+    request: Request,
+    page: PageParams = Depends(),
+    ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    session: AsyncSession = Depends(get_db)
+):
+    """Get a page of meals (limit/offset or cursor pagination), or the meals listed in ``ids``."""
+    selected = _field_selection(fields, include, serializers.MEAL_FIELDS, serializers.MEAL_RELATIONSHIPS)
+    requested = parse_ids(ids)
+    if requested is not None:
+        headers, not_modified = _conditional(
+            request, versions.get_version(*MEAL_TABLES),
+            "meals", "ids", tuple(requested), fields, include
+        )
+        if not_modified:
+            return not_modified
+
+        meals = await queries.get_meals_by_ids(
+            session, requested,
+            include=serializers.loaded_relationships(selected, serializers.MEAL_RELATIONSHIPS)
+        )
+        meals, missing = in_request_order(meals, requested, "meal_id")
+        return FastJSONResponse({
+            "meals": [serializers.pick_fields(meal, selected) for meal in meals],
+            "missing": missing
+        }, headers=headers)
+
+    headers, not_modified = _conditional(
+        request, versions.get_version(*MEAL_TABLES),
+        "meals", page.limit, page.offset, page.after_id, fields, include
+    )
+    if not_modified:
+        return not_modified
+
+    meals = await queries.get_meals_page(
+        session, limit=page.limit + 1, offset=page.offset, after_id=page.after_id,
+        include=serializers.loaded_relationships(selected, serializers.MEAL_RELATIONSHIPS)
+    )
+    meals, next_cursor = page.split(meals, "meal_id")
+
+    headers[TOTAL_COUNT_HEADER] = str(await crud.count_rows(session, Meal))
+    return FastJSONResponse({
+        "meals": [serializers.pick_fields(meal, selected) for meal in meals],
+        "next_cursor": next_cursor
+    }, headers=headers)
 
 
 @router.get("/meals/{id}")
 async def get_meal(
+    request: Request,
     id: int = Path(..., gt=0),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     session: AsyncSession = Depends(get_db)
 ):
     """Get a single meal by ID."""
-    meal = await crud.get_meal_by_id(session, id)
+    selected = _field_selection(fields, include, serializers.MEAL_FIELDS, serializers.MEAL_RELATIONSHIPS)
+
+    headers, not_modified = _conditional(
+        request, versions.get_version(*MEAL_TABLES), "meal", id, fields, include
+    )
+    if not_modified:
+        return not_modified
+
+    meal = await crud.get_meal_by_id(
+        session, id, include=serializers.loaded_relationships(selected, serializers.MEAL_RELATIONSHIPS)
+    )
     if meal is None:
         raise HTTPException(status_code=404, detail="Meal not found")
-    return serializers.serialize_meal(meal)
+    return FastJSONResponse(serializers.serialize_meal(meal, selected), headers=headers)
 
 
 @router.post("/meals")
@@ -492,22 +1178,27 @@ async def create_meal(
         raise HTTPException(status_code=400, detail="Meal name is required")
 
     meal = await crud.create_meal(session, meal_data)
-    return serializers.serialize_meal(meal)
+    return FastJSONResponse(serializers.serialize_meal(meal))
 
 
 @router.put("/meals/{id}")
 async def update_meal(
+    request: Request,
     id: int = Path(..., gt=0),
     meal_data = Body(...),
     session: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user)
 ):
-    """Update an existing meal."""
+    """Update an existing meal (returned with Prefer: return=representation)."""
     # Frontend already sends correct field names (meal_name, meal_description, fooditem_ids, category_ids)
     # No mapping needed
-    updated = await crud.update_meal(session, id, meal_data)
+    updated = await crud.update_meal(
+        session, id, meal_data, reload=conditional.prefers_representation(request)
+    )
     if not updated:
         raise HTTPException(status_code=404, detail="Meal not found")
+    if conditional.prefers_representation(request):
+        return FastJSONResponse(serializers.serialize_meal(updated), headers=conditional.REPRESENTATION_APPLIED)
     return {"message": "Meal updated successfully"}
 
 
@@ -524,53 +1215,173 @@ async def delete_meal(
     return {"message": "Meal deleted successfully"}
 
 
-# ============================================================================
-# Search & Utility Endpoints
-# ============================================================================
-
-@router.get("/recipes/search")
-async def search_recipes(
-    q: str = Query(..., description="Search query", min_length=1, max_length=100),
+@router.post("/shopping-list")
+async def get_shopping_list(
+    plan = Body(...),
     session: AsyncSession = Depends(get_db)
 ):
-    """Search recipes by name."""
-    recipes = await crud.search_recipes(session, q)
-    return {"results": serializers.serialize_recipes(recipes)}
+    """
+    Aggregate the raw ingredients needed for a set of meals and recipes.
+
+    Body: {"meals": [{"meal_id", "servings"}], "recipes": [{"recipe_id",
+    "servings"}]}. Each meal food item counts as one unit per serving and
+    each recipe as one batch per serving; compound food items are expanded
+    through their recipes. Quantities are summed per ingredient and unit
+    type. Food items no recipe produces are listed under "food_items", and
+    unknown ids under "missing".
+    """
+    if not isinstance(plan, dict):
+        raise HTTPException(status_code=400, detail="Expected an object with meals and/or recipes")
+    meal_servings = _servings(plan.get("meals"), "meal_id")
+    recipe_servings = _servings(plan.get("recipes"), "recipe_id")
+    if not meal_servings and not recipe_servings:
+        raise HTTPException(status_code=400, detail="At least one meal or recipe is required")
+    if len(meal_servings) + len(recipe_servings) > SHOPPING_LIST_MAX_ENTRIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {SHOPPING_LIST_MAX_ENTRIES} meals and recipes per shopping list"
+        )
+
+    try:
+        shopping_list = await shopping.build_shopping_list(session, meal_servings, recipe_servings)
+    except expansion.RecipeCycleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(shopping_list)
 
 
+# ============================================================================
+# Search & Utility Endpoints
+# ============================================================================
+
 @router.get("/search")
 async def omni_search(
     q: str = Query(..., description="Search query", min_length=1, max_length=100),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    limit: int = Query(OMNI_SEARCH_LIMIT, ge=1, le=50, description="Results per type"),
+    fuzzy: bool = Query(False, description=FUZZY_DESCRIPTION),
     session: AsyncSession = Depends(get_db)
 ):
     """
     Unified search across all entity types.
     Returns results grouped by type with limit per type.
-    """
-    recipes = await crud.search_recipes(session, q)
-    meals = await crud.search_meals(session, q)
-    food_items = await crud.search_food_items(session, q)
-    ingredients = await crud.search_ingredients(session, q)
 
-    return {
+    ``include`` names the recipe and meal relationships to embed; each
+    name applies to whichever of the two types has it. ``totals`` holds the
+    number of matches per type; only ``limit`` rows of each are loaded.
+    ``fuzzy=true`` matches names by trigram similarity instead, best match
+    first, so misspelled queries still find results. Otherwise matching is
+    as in /recipes/search: word prefixes of names and descriptions with the
+    full-text index, substrings without it.
+    The four searches run concurrently (see _gather_reads()).
+    """
+    recipe_fields = meal_fields = None
+    if include is not None:
+        requested = {name.strip() for name in include.split(",") if name.strip()}
+        unknown = requested - set(serializers.RECIPE_RELATIONSHIPS) - set(serializers.MEAL_RELATIONSHIPS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+        recipe_fields = _field_selection(
+            None, ",".join(requested & set(serializers.RECIPE_RELATIONSHIPS)),
+            serializers.RECIPE_FIELDS, serializers.RECIPE_RELATIONSHIPS
+        )
+        meal_fields = _field_selection(
+            None, ",".join(requested & set(serializers.MEAL_RELATIONSHIPS)),
+            serializers.MEAL_FIELDS, serializers.MEAL_RELATIONSHIPS
+        )
+
+    async def recipes(db):
+        found = await crud.search_recipes(
+            db, q, limit=limit, fuzzy=fuzzy,
+            include=serializers.loaded_relationships(recipe_fields, serializers.RECIPE_RELATIONSHIPS)
+        )
+        return serializers.serialize_recipes(found, recipe_fields), await crud.count_search_matches(db, "recipe", q, fuzzy)
+
+    async def meals(db):
+        found = await crud.search_meals(
+            db, q, limit=limit, fuzzy=fuzzy,
+            include=serializers.loaded_relationships(meal_fields, serializers.MEAL_RELATIONSHIPS)
+        )
+        return serializers.serialize_meals(found, meal_fields), await crud.count_search_matches(db, "meal", q, fuzzy)
+
+    async def food_items(db):
+        found = await crud.search_food_items(db, q, limit=limit, fuzzy=fuzzy)
+        return serializers.serialize_food_items(found), await crud.count_search_matches(db, "fooditem", q, fuzzy)
+
+    async def ingredients(db):
+        found = await crud.search_ingredients(db, q, limit=limit, fuzzy=fuzzy)
+        return serializers.serialize_ingredients(found), await crud.count_search_matches(db, "ingredient", q, fuzzy)
+
+    keys = ("recipes", "meals", "food_items", "ingredients")
+    found = await _gather_reads(session, recipes, meals, food_items, ingredients)
+
+    return FastJSONResponse({
         "query": q,
-        "results": {
-            "recipes": serializers.serialize_recipes(recipes[:5]),
-            "meals": serializers.serialize_meals(meals[:5]),
-            "food_items": serializers.serialize_food_items(food_items[:5]),
-            "ingredients": serializers.serialize_ingredients(ingredients[:5])
-        }
-    }
+        "results": {key: rows for key, (rows, _) in zip(keys, found)},
+        "totals": {key: total for key, (_, total) in zip(keys, found)}
+    })
+
+
+@router.get("/autocomplete")
+async def autocomplete_names(
+    q: str = Query(..., description="Name prefix typed so far", min_length=1, max_length=100),
+    types: Optional[str] = Query(None, description="Comma-separated types: recipe, meal, fooditem, ingredient (default all)"),
+    limit: int = Query(AUTOCOMPLETE_LIMIT, ge=1, le=50, description="Maximum suggestions")
+):
+    """
+    Suggest names starting with q, for search-as-you-type.
+
+    Served from the in-memory prefix index (see autocomplete.py) without a
+    database round trip. Names starting with q come first, then names with
+    a later word starting with q. Each result is {"type", "id", "name"}.
+    """
+    entities = list(autocomplete.AUTOCOMPLETE_TYPES)
+    if types is not None:
+        entities = list(dict.fromkeys(name.strip() for name in types.split(",") if name.strip()))
+        unknown = set(entities) - set(autocomplete.AUTOCOMPLETE_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown types: {', '.join(sorted(unknown))}")
+
+    if not autocomplete.is_built():
+        # Startup could not build the index (e.g. tables created afterwards)
+        async with AsyncSessionLocal() as session:
+            await autocomplete.build_indexes(session)
+
+    return FastJSONResponse({"query": q, "results": autocomplete.complete(q, entities, limit)})
 
 
 @router.get("/recipes/category/{category_id}")
 async def get_recipes_by_category(
     category_id: int = Path(..., gt=0),
+    descendants: bool = Query(False, description=DESCENDANTS_DESCRIPTION),
+    session: AsyncSession = Depends(get_db)
+):
+    """Get all recipes in a specific category (or its whole subtree)."""
+    recipes = await crud.get_recipes_by_category(session, category_id, include_descendants=descendants)
+    return FastJSONResponse({"recipes": serializers.serialize_recipes(recipes)})
+
+
+@router.get("/meals/category/{category_id}")
+async def get_meals_by_category(
+    category_id: int = Path(..., gt=0),
+    descendants: bool = Query(False, description=DESCENDANTS_DESCRIPTION),
+    session: AsyncSession = Depends(get_db)
+):
+    """Get all meals in a specific category (or its whole subtree)."""
+    meals = await crud.get_meals_by_category(session, category_id, include_descendants=descendants)
+    return FastJSONResponse({"meals": serializers.serialize_meals(meals)})
+
+
+@router.get("/ingredients/category/{category_id}")
+async def get_ingredients_by_category(
+    category_id: int = Path(..., gt=0),
+    descendants: bool = Query(False, description=DESCENDANTS_DESCRIPTION),
     session: AsyncSession = Depends(get_db)
 ):
-    """Get all recipes in a specific category."""
-    recipes = await crud.get_recipes_by_category(session, category_id)
-    return {"recipes": serializers.serialize_recipes(recipes)}
+    """Get all ingredients in a specific category (or its whole subtree)."""
+    ingredients = await crud.get_ingredients_by_category(session, category_id, include_descendants=descendants)
+    return FastJSONResponse({"ingredients": serializers.serialize_ingredients(ingredients)})
 
 
 # ============================================================================
@@ -578,10 +1389,60 @@ async def get_recipes_by_category(
 # ============================================================================
 
 @router.get("/unit-types")
-async def get_unit_types(session: AsyncSession = Depends(get_db)):
-    """Get all unit types."""
-    unit_types = await crud.get_all_unit_types(session)
-    return {"unit_types": serializers.serialize_unit_types(unit_types)}
+async def get_unit_types(
+    request: Request,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_db)
+):
+    """Get a page of unit types (limit/offset or cursor pagination)."""
+    headers, not_modified = _conditional(
+        request, versions.get_version(UnitType),
+        "unit_types", page.limit, page.offset, page.after_id
+    )
+    if not_modified:
+        return not_modified
+
+    unit_types = await crud.get_all_unit_types(
+        session, limit=page.limit + 1, offset=page.offset, after_id=page.after_id
+    )
+    unit_types, next_cursor = page.split(unit_types, "id")
+
+    headers[TOTAL_COUNT_HEADER] = str(await crud.count_rows(session, UnitType))
+    return FastJSONResponse({
+        "unit_types": serializers.serialize_unit_types(unit_types),
+        "next_cursor": next_cursor
+    }, headers=headers)
+
+
+@router.get("/unit-types/convert")
+async def convert_units(
+    quantity: float = Query(..., description="Quantity to convert"),
+    from_unit: int = Query(..., gt=0, description="UnitType id of the quantity"),
+    to_unit: int = Query(..., gt=0, description="UnitType id to convert to"),
+    ingredient_id: Optional[int] = Query(None, gt=0, description="Ingredient whose density allows mass <-> volume"),
+    session: AsyncSession = Depends(get_db)
+):
+    """Convert a quantity between unit types (400 if they are not convertible)."""
+    if not math.isfinite(quantity):
+        raise HTTPException(status_code=400, detail="quantity must be a finite number")
+
+    densities = None
+    if ingredient_id is not None:
+        ingredient = await crud.get_ingredient_by_id(session, ingredient_id)
+        if ingredient is None:
+            raise HTTPException(status_code=404, detail="Ingredient not found")
+        densities = ingredient.ingredient_density if ingredient.ingredient_density is not None else float("nan")
+
+    table = await units.get_table(session)
+    converted = float(table.convert(quantity, from_unit, to_unit, densities))
+    if converted != converted:  # NaN
+        raise HTTPException(status_code=400, detail="These units cannot be converted into each other")
+    return FastJSONResponse({
+        "quantity": quantity,
+        "from_unit": from_unit,
+        "to_unit": to_unit,
+        "converted_quantity": converted
+    })
 
 
 @router.get("/unit-types/{id}")
@@ -593,7 +1454,7 @@ async def get_unit_type(
     unit_type = await crud.get_unit_type_by_id(session, id)
     if unit_type is None:
         raise HTTPException(status_code=404, detail="Unit type not found")
-    return serializers.serialize_unit_type(unit_type)
+    return FastJSONResponse(serializers.serialize_unit_type(unit_type))
 
 
 @router.post("/unit-types")
@@ -602,22 +1463,31 @@ async def create_unit_type(
     session: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user)
 ):
-    """Create a new unit type."""
-    unit_type = await crud.create_unit_type(session, unit_type_data)
-    return serializers.serialize_unit_type(unit_type)
+    """Create a new unit type (optionally with unit_dimension and unit_base_factor)."""
+    try:
+        unit_type = await crud.create_unit_type(session, unit_type_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(serializers.serialize_unit_type(unit_type))
 
 
 @router.put("/unit-types/{id}")
 async def update_unit_type(
+    request: Request,
     id: int = Path(..., gt=0),
     unit_type_data = Body(...),
     session: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user)
 ):
-    """Update an existing unit type."""
-    updated = await crud.update_unit_type(session, id, unit_type_data)
+    """Update an existing unit type (returned with Prefer: return=representation)."""
+    try:
+        updated = await crud.update_unit_type(session, id, unit_type_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
         raise HTTPException(status_code=404, detail="Unit type not found")
+    if conditional.prefers_representation(request):
+        return FastJSONResponse(serializers.serialize_unit_type(updated), headers=conditional.REPRESENTATION_APPLIED)
     return {"message": "Unit type updated successfully"}
 
 
@@ -632,3 +1502,13 @@ async def delete_unit_type(
     if not deleted:
         raise HTTPException(status_code=404, detail="Unit type not found")
     return {"message": "Unit type deleted successfully"}
+
+
+# ============================================================================
+# Cache Endpoints
+# ============================================================================
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss/eviction counters for the recipe response cache."""
+    return response_cache.stats()
@@ -0,0 +1,115 @@
+"""
+Server-side recipe scaling behind /recipes/{id}/scaled and /recipes/scale.
+
+A scaled recipe is the serialize_recipe() payload of a recipe with every
+ri_quantity multiplied by the requested factor, optionally moved to a
+display unit (units.ConversionTable.normalize()), and rounded for
+display:
+
+- quantities in a count unit (piece, whole) are rounded to the nearest
+  COUNT_STEP, and never below it;
+- everything else is rounded to SIGNIFICANT_DIGITS significant digits.
+
+The ingredient rows of all requested recipes are scaled, normalized and
+rounded together as flat NumPy arrays, so a batch costs the queries of
+one multi-get plus one vectorized pass.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import queries
+from . import units
+
+# Rounding applied to scaled quantities
+SIGNIFICANT_DIGITS = 3
+COUNT_STEP = 0.25
+
+_COUNT = units.DIMENSIONS.index("count")
+
+
+def round_quantities(quantities: np.ndarray, dimensions: np.ndarray) -> np.ndarray:
+    """
+    Round scaled quantities for display.
+
+    Args:
+        quantities: Quantities to round.
+        dimensions: Dimension code of each quantity's unit (see
+                    units.ConversionTable.dimensions()).
+    """
+    quantities = np.asarray(quantities, dtype=np.float64)
+    finite = np.isfinite(quantities) & (quantities != 0)
+    safe = np.where(finite, np.abs(quantities), 1.0)
+
+    # Scale by an exact power of ten so the result is the nearest float to
+    # the rounded decimal (0.3, not 0.30000000000000004)
+    exponent = SIGNIFICANT_DIGITS - 1 - np.floor(np.log10(safe))
+    power = 10.0 ** np.abs(exponent)
+    rounded = np.where(
+        exponent >= 0,
+        np.round(quantities * power) / power,
+        np.round(quantities / power) * power
+    )
+    rounded = np.where(finite, rounded, quantities)
+
+    stepped = np.maximum(np.round(quantities / COUNT_STEP) * COUNT_STEP, COUNT_STEP)
+    counted = (np.asarray(dimensions) == _COUNT) & (quantities > 0)
+    return np.where(counted, stepped, rounded)
+
+
+async def scale_recipes(
+    db: AsyncSession,
+    requests: Sequence[Tuple[int, float]],
+    normalize: bool = False
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Scale recipes by per-recipe factors.
+
+    Args:
+        requests: (recipe_id, factor) pairs; a recipe may be requested
+                  several times with different factors.
+        normalize: Move quantities to display units.
+
+    Returns:
+        Tuple of (scaled recipes in request order, each a serialize_recipe()
+        dict with an added "scale_factor"; requested recipe ids that do not
+        exist).
+    """
+    found = {
+        recipe["recipe_id"]: recipe
+        for recipe in await queries.get_recipes_by_ids(db, {recipe_id for recipe_id, _ in requests})
+    }
+
+    scaled = []
+    missing = []
+    rows = []
+    factors = []
+    for recipe_id, factor in requests:
+        recipe = found.get(recipe_id)
+        if recipe is None:
+            missing.append(recipe_id)
+            continue
+        # Copies, so one recipe requested twice is scaled twice
+        ingredients = [dict(ri) for ri in recipe["ingredients"]]
+        scaled.append(dict(recipe, ingredients=ingredients, scale_factor=factor))
+        rows.extend(ingredients)
+        factors.extend([factor] * len(ingredients))
+
+    if rows:
+        table = await units.get_table(db)
+        quantities = np.fromiter((ri["ri_quantity"] for ri in rows), dtype=np.float64, count=len(rows))
+        quantities *= np.asarray(factors, dtype=np.float64)
+        unit_ids = np.fromiter((ri["ri_unit_type_id"] for ri in rows), dtype=np.int64, count=len(rows))
+        if normalize:
+            quantities, unit_ids = table.normalize(quantities, unit_ids)
+        quantities = round_quantities(quantities, table.dimensions(unit_ids))
+
+        for ri, quantity, unit_id in zip(rows, quantities.tolist(), unit_ids.tolist()):
+            ri["ri_quantity"] = quantity
+            if unit_id != ri["ri_unit_type_id"]:
+                ri["ri_unit_type_id"] = unit_id
+                ri["unit_type"] = table.names.get(unit_id)
+
+    return scaled, missing
@@ -0,0 +1,159 @@
+"""
+Full-text search backends for RecipeFirst search operations.
+
+Migration 004 builds a full-text index over the name and description of
+recipes, meals, food items and ingredients:
+
+- SQLite: an external-content FTS5 table per entity (``recipe_fts`` ...),
+  kept in sync with the base table by triggers, ranked with bm25()
+- PostgreSQL: a generated ``search_vector`` tsvector column per table with
+  a GIN index, ranked with ts_rank()
+
+Names are weighted above descriptions. Every query term is matched as a
+word prefix and all terms must match, so "chick sou" finds "Chicken Soup".
+Unlike the LIKE scan, a term never matches inside a word ("icken" does not
+find "Chicken"), and recipes are matched on their description too.
+
+search_ids() returns None whenever the index cannot be used (index not
+migrated, full-text search disabled, or no searchable terms in the query);
+the crud search functions then fall back to their LIKE '%q%' scan.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# entity -> (base table, primary key column, FTS5 table)
+INDEXED_TABLES = {
+    "recipe": ("Recipe", "recipe_id", "recipe_fts"),
+    "meal": ("Meal", "meal_id", "meal_fts"),
+    "fooditem": ("FoodItem", "fooditem_id", "fooditem_fts"),
+    "ingredient": ("Ingredient", "ingredient_id", "ingredient_fts"),
+}
+
+# bm25() column weights for (name, description); ts_rank uses labels A/B
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Letters and digits only: tokens can then be embedded in FTS5 / tsquery
+# syntax without escaping
+_TERM_RE = re.compile(r"[^\W_]+")
+
+# dialect name -> whether migration 004 has been applied
+_index_available: Dict[str, bool] = {}
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a user query into lower-cased word terms."""
+    return _TERM_RE.findall(q.lower())
+
+
+async def index_available(db: AsyncSession) -> bool:
+    """
+    Check (once per process and dialect) whether the full-text index exists.
+
+    Databases created with Base.metadata.create_all() instead of Alembic
+    have no index, and search keeps working through the LIKE fallback.
+    """
+    dialect = db.bind.dialect.name
+    if dialect not in _index_available:
+        if dialect == "sqlite":
+            stmt = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recipe_fts'")
+        elif dialect == "postgresql":
+            stmt = text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'Recipe' AND column_name = 'search_vector'"
+            )
+        else:
+            _index_available[dialect] = False
+            return False
+        result = await db.execute(stmt)
+        _index_available[dialect] = result.first() is not None
+        if not _index_available[dialect]:
+            logger.info("Full-text index not found; search uses LIKE scans")
+    return _index_available[dialect]
+
+
+def _match_sql(db: AsyncSession, entity: str, terms: List[str]):
+    """
+    Build the FROM/WHERE clause matching terms against one entity's index.
+
+    Returns:
+        Tuple of (SQL fragment, bind parameters, id expression, rank
+        ORDER BY expression).
+    """
+    table, key, fts_table = INDEXED_TABLES[entity]
+    if db.bind.dialect.name == "sqlite":
+        query = " ".join(f'"{term}"*' for term in terms)
+        return (
+            f"FROM {fts_table} WHERE {fts_table} MATCH :query",
+            {"query": query},
+            "rowid",
+            f"bm25({fts_table}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})",
+        )
+    query = " & ".join(f"{term}:*" for term in terms)
+    return (
+        f'FROM "{table}", to_tsquery(\'simple\', :query) AS query WHERE search_vector @@ query',
+        {"query": query},
+        key,
+        f"ts_rank(search_vector, query) DESC, {key}",
+    )
+
+
+async def search_ids(
+    db: AsyncSession,
+    entity: str,
+    q: str,
+    limit: Optional[int] = None
+) -> Optional[List[int]]:
+    """
+    Find the primary keys of one entity type matching q, best match first.
+
+    Args:
+        entity: Key of INDEXED_TABLES ("recipe", "meal", "fooditem",
+                "ingredient").
+        q: Raw user query.
+        limit: Maximum number of ids to return (None for all matches).
+
+    Returns:
+        Ranked list of ids, or None if the full-text index cannot answer
+        this query and the caller should fall back to LIKE.
+    """
+    if not settings.full_text_search:
+        return None
+    terms = search_terms(q)
+    if not terms or not await index_available(db):
+        return None
+
+    match, params, id_expr, rank = _match_sql(db, entity, terms)
+    sql = f"SELECT {id_expr} {match} ORDER BY {rank}"
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+
+    result = await db.execute(text(sql), params)
+    return [row[0] for row in result]
+
+
+async def count_matches(db: AsyncSession, entity: str, q: str) -> Optional[int]:
+    """
+    Count the rows of one entity type matching q, reading only the index.
+
+    Returns None under the same conditions as search_ids().
+    """
+    if not settings.full_text_search:
+        return None
+    terms = search_terms(q)
+    if not terms or not await index_available(db):
+        return None
+
+    match, params, _, _ = _match_sql(db, entity, terms)
+    result = await db.execute(text(f"SELECT count(*) {match}"), params)
+    return result.scalar_one()
@@ -3,10 +3,13 @@ Serialization helpers to convert SQLAlchemy ORM objects to API response format.
 
 These helpers ensure the new SQLAlchemy implementation returns the exact same
 JSON structure as the original raw SQL implementation for backward compatibility.
+
+Timestamps are left as datetime objects; the response encoder (encoding.py)
+renders them in ISO 8601 format natively, so no per-field isoformat() call
+is made here.
 """
 
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Collection, Set
 
 from .models import (
     Recipe, Ingredient, FoodItem, Meal, Category, UnitType,
@@ -14,9 +17,71 @@ from .models import (
 )
 
 
-def serialize_datetime(dt: datetime) -> str:
-    """Serialize datetime to ISO format string."""
-    return dt.isoformat() if dt else None
+# Top-level keys emitted by serialize_recipe() / serialize_meal(), and the
+# subset of those keys that are backed by relationships (and extra queries).
+RECIPE_FIELDS = (
+    "recipe_id", "recipe_name", "recipe_description", "recipe_fooditem_id",
+    "created_at", "updated_at", "ingredients", "instructions", "categories",
+)
+RECIPE_RELATIONSHIPS = ("ingredients", "instructions", "categories")
+
+MEAL_FIELDS = (
+    "meal_id", "meal_name", "meal_description",
+    "created_at", "updated_at", "food_items", "categories",
+)
+MEAL_RELATIONSHIPS = ("food_items", "categories")
+
+
+def select_fields(
+    fields: Optional[str],
+    include: Optional[str],
+    all_fields: Collection[str],
+    relationships: Collection[str]
+) -> Optional[Set[str]]:
+    """
+    Resolve ``?fields=`` and ``?include=`` query values into the keys to emit.
+
+    Both parameters are comma-separated lists. ``fields`` restricts the
+    top-level keys; ``include`` restricts which relationships are embedded
+    (an empty ``include=`` embeds none). Omitting both returns None, meaning
+    the full representation.
+
+    Raises:
+        ValueError: If either list names an unknown key.
+    """
+    if fields is None and include is None:
+        return None
+
+    selected = set(all_fields)
+    if fields is not None:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(all_fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        selected = requested
+
+    if include is not None:
+        requested = {name.strip() for name in include.split(",") if name.strip()}
+        unknown = requested - set(relationships)
+        if unknown:
+            raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}")
+        selected -= set(relationships) - requested
+
+    return selected
+
+
+def loaded_relationships(fields: Optional[Set[str]], relationships: Collection[str]) -> Optional[Set[str]]:
+    """Return the relationships a field selection needs loaded (None = all)."""
+    if fields is None:
+        return None
+    return fields & set(relationships)
+
+
+def pick_fields(data: Dict[str, Any], fields: Optional[Set[str]]) -> Dict[str, Any]:
+    """Drop keys not in fields, preserving the canonical key order."""
+    if fields is None:
+        return data
+    return {key: value for key, value in data.items() if key in fields}
 
 
 def serialize_recipe_ingredient(ri: RecipeIngredient) -> Dict[str, Any]:
@@ -33,8 +98,8 @@ def serialize_recipe_ingredient(ri: RecipeIngredient) -> Dict[str, Any]:
         "ri_fooditem_id": ri.ri_fooditem_id,
         "ri_unit_type_id": ri.ri_unit_type_id,
         "ri_quantity": ri.ri_quantity,
-        "created_at": serialize_datetime(ri.created_at),
-        "updated_at": serialize_datetime(ri.updated_at),
+        "created_at": ri.created_at,
+        "updated_at": ri.updated_at,
         # Joined fields
         "ingredient_name": ri.ingredient.ingredient_name if ri.ingredient else None,
         "ingredient_description": ri.ingredient.ingredient_description if ri.ingredient else None,
@@ -64,28 +129,34 @@ def serialize_category(cat: Category) -> Dict[str, Any]:
         "category_name": cat.category_name,
         "category_description": cat.category_description,
         "parent_category_id": cat.parent_category_id,
-        "created_at": serialize_datetime(cat.created_at),
-        "updated_at": serialize_datetime(cat.updated_at),
+        "created_at": cat.created_at,
+        "updated_at": cat.updated_at,
     }
 
 
-def serialize_recipe(recipe: Recipe) -> Dict[str, Any]:
+def serialize_recipe(recipe: Recipe, fields: Optional[Set[str]] = None) -> Dict[str, Any]:
     """
     Serialize Recipe with all nested data.
 
     Matches the format from get_all_recipes() / get_recipe_by_id().
+    When ``fields`` is given (see select_fields()), only those keys are
+    emitted and relationships outside it are never touched.
     """
-    return {
+    data = {
         "recipe_id": recipe.recipe_id,
         "recipe_name": recipe.recipe_name,
         "recipe_description": recipe.recipe_description,
         "recipe_fooditem_id": recipe.recipe_fooditem_id,
-        "created_at": serialize_datetime(recipe.created_at),
-        "updated_at": serialize_datetime(recipe.updated_at),
-        "ingredients": [serialize_recipe_ingredient(ri) for ri in recipe.ingredients],
-        "instructions": [serialize_recipe_instruction(inst) for inst in recipe.instructions],
-        "categories": [serialize_category(cat) for cat in recipe.categories],
+        "created_at": recipe.created_at,
+        "updated_at": recipe.updated_at,
     }
+    if fields is None or "ingredients" in fields:
+        data["ingredients"] = [serialize_recipe_ingredient(ri) for ri in recipe.ingredients]
+    if fields is None or "instructions" in fields:
+        data["instructions"] = [serialize_recipe_instruction(inst) for inst in recipe.instructions]
+    if fields is None or "categories" in fields:
+        data["categories"] = [serialize_category(cat) for cat in recipe.categories]
+    return pick_fields(data, fields)
 
 
 def serialize_ingredient(ingredient: Ingredient) -> Dict[str, Any]:
@@ -95,8 +166,9 @@ def serialize_ingredient(ingredient: Ingredient) -> Dict[str, Any]:
         "ingredient_name": ingredient.ingredient_name,
         "ingredient_description": ingredient.ingredient_description,
         "ingredient_notes": ingredient.ingredient_notes,
-        "created_at": serialize_datetime(ingredient.created_at),
-        "updated_at": serialize_datetime(ingredient.updated_at),
+        "ingredient_density": ingredient.ingredient_density,
+        "created_at": ingredient.created_at,
+        "updated_at": ingredient.updated_at,
     }
 
 
@@ -110,8 +182,8 @@ def serialize_food_item(food_item: FoodItem) -> Dict[str, Any]:
         "fooditem_id": food_item.fooditem_id,
         "fooditem_name": food_item.fooditem_name,
         "fooditem_description": food_item.fooditem_description,
-        "created_at": serialize_datetime(food_item.created_at),
-        "updated_at": serialize_datetime(food_item.updated_at),
+        "created_at": food_item.created_at,
+        "updated_at": food_item.updated_at,
         # Include recipes that produce this food item (basic info only)
         "recipes": [
             {
@@ -119,8 +191,8 @@ def serialize_food_item(food_item: FoodItem) -> Dict[str, Any]:
                 "recipe_name": recipe.recipe_name,
                 "recipe_description": recipe.recipe_description,
                 "recipe_fooditem_id": recipe.recipe_fooditem_id,
-                "created_at": serialize_datetime(recipe.created_at),
-                "updated_at": serialize_datetime(recipe.updated_at),
+                "created_at": recipe.created_at,
+                "updated_at": recipe.updated_at,
             }
             for recipe in food_item.recipes
         ] if food_item.recipes else []
@@ -136,17 +208,24 @@ def serialize_meal_food_item(mfi: MealFoodItem) -> Dict[str, Any]:
     }
 
 
-def serialize_meal(meal: Meal) -> Dict[str, Any]:
-    """Serialize Meal with nested food items and categories."""
-    return {
+def serialize_meal(meal: Meal, fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """
+    Serialize Meal with nested food items and categories.
+
+    ``fields`` works as in serialize_recipe().
+    """
+    data = {
         "meal_id": meal.meal_id,
         "meal_name": meal.meal_name,
         "meal_description": meal.meal_description,
-        "created_at": serialize_datetime(meal.created_at),
-        "updated_at": serialize_datetime(meal.updated_at),
-        "food_items": [serialize_meal_food_item(mfi) for mfi in meal.meal_food_items],
-        "categories": [serialize_category(cat) for cat in meal.categories],
+        "created_at": meal.created_at,
+        "updated_at": meal.updated_at,
     }
+    if fields is None or "food_items" in fields:
+        data["food_items"] = [serialize_meal_food_item(mfi) for mfi in meal.meal_food_items]
+    if fields is None or "categories" in fields:
+        data["categories"] = [serialize_category(cat) for cat in meal.categories]
+    return pick_fields(data, fields)
 
 
 def serialize_unit_type(unit_type: UnitType) -> Dict[str, Any]:
@@ -154,16 +233,18 @@ def serialize_unit_type(unit_type: UnitType) -> Dict[str, Any]:
     return {
         "id": unit_type.id,
         "unit_type": unit_type.unit_type,
-        "created_at": serialize_datetime(unit_type.created_at),
-        "updated_at": serialize_datetime(unit_type.updated_at),
+        "unit_dimension": unit_type.unit_dimension,
+        "unit_base_factor": unit_type.unit_base_factor,
+        "created_at": unit_type.created_at,
+        "updated_at": unit_type.updated_at,
     }
 
 
 # Collection serializers
 
-def serialize_recipes(recipes: List[Recipe]) -> List[Dict[str, Any]]:
+def serialize_recipes(recipes: List[Recipe], fields: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
     """Serialize a list of recipes."""
-    return [serialize_recipe(r) for r in recipes]
+    return [serialize_recipe(r, fields) for r in recipes]
 
 
 def serialize_ingredients(ingredients: List[Ingredient]) -> List[Dict[str, Any]]:
@@ -176,9 +257,9 @@ def serialize_food_items(food_items: List[FoodItem]) -> List[Dict[str, Any]]:
     return [serialize_food_item(fi) for fi in food_items]
 
 
-def serialize_meals(meals: List[Meal]) -> List[Dict[str, Any]]:
+def serialize_meals(meals: List[Meal], fields: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
     """Serialize a list of meals."""
-    return [serialize_meal(m) for m in meals]
+    return [serialize_meal(m, fields) for m in meals]
 
 
 def serialize_categories(categories: List[Category]) -> List[Dict[str, Any]]:
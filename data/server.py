@@ -1,12 +1,51 @@
+import gc
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from .routes import router
 from .config import settings
+from .database import AsyncSessionLocal
+from . import fuzzy, autocomplete, ingredient_index, recipe_graph, units
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the in-process search, autocomplete, ingredient, recipe graph and unit conversion indexes before serving requests.
+
+    These indexes and the caches beside them live in this process and are
+    kept current by the crud writes made through it, so the API is meant to
+    run as a single worker (the Dockerfile starts one uvicorn process).
+    With several workers, a write is only seen by the others' indexes when
+    they restart.
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            await fuzzy.build_indexes(session)
+            await autocomplete.build_indexes(session)
+            await ingredient_index.build_index(session)
+            await recipe_graph.build_graph(session)
+            await units.get_table(session)
+    except SQLAlchemyError:
+        # e.g. tables not created yet; each index is built on first use instead
+        logger.warning("Could not build in-memory indexes at startup", exc_info=True)
+    # The indexes are millions of long-lived objects; move them out of the
+    # cyclic GC's generations so full collections do not rescan them
+    # (a ~200ms pause per collection at 100k names)
+    gc.freeze()
+    yield
+
 
 app = FastAPI(
     title=settings.api_title,
-    version=settings.api_version
+    version=settings.api_version,
+    lifespan=lifespan
 )
 
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=["*"])
@@ -18,6 +57,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "ETag", "Last-Modified"],
 )
 
 app.include_router(router)
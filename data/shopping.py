@@ -0,0 +1,128 @@
+"""
+Shopping-list aggregation behind POST /shopping-list.
+
+A plan is a set of meals and recipes, each with a servings multiplier.
+Every recipe is expanded to raw ingredients through expansion.py (one
+batch per serving); every food item of a meal counts as one unit per
+serving and is expanded through the recipe producing it, or kept as a
+food item to buy when no recipe produces it.
+
+All expansions are flattened into parallel NumPy arrays of
+(ingredient_id, unit_type_id, quantity * servings) and summed with one
+np.unique / np.bincount group-by, so a week of meals costs one pass
+however many times the same ingredient recurs. Quantities are summed per
+unit type; different units of one ingredient are listed separately.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import expansion
+from .expansion import AmountKey
+from .models import Meal, MealFoodItem
+
+# Stands in for a None unit_type_id inside the integer key arrays
+_NO_UNIT = -1
+
+
+def aggregate(parts: Iterable[Tuple[Dict[AmountKey, float], float]]) -> Dict[AmountKey, float]:
+    """
+    Sum (amounts, multiplier) pairs per (id, unit_type_id) key.
+
+    Args:
+        parts: Amount dicts as held in an Expansion, each with the number
+               of times it is needed.
+    """
+    ids: List[int] = []
+    units: List[int] = []
+    quantities: List[float] = []
+    scales: List[float] = []
+    for amounts, scale in parts:
+        ids.extend(key for key, _ in amounts)
+        units.extend(_NO_UNIT if unit is None else unit for _, unit in amounts)
+        quantities.extend(amounts.values())
+        scales.extend([scale] * len(amounts))
+    if not ids:
+        return {}
+
+    keys, groups = np.unique(np.column_stack((ids, units)), axis=0, return_inverse=True)
+    # An overflow yields inf, which build_shopping_list() rejects
+    with np.errstate(over="ignore"):
+        totals = np.bincount(
+            groups.ravel(),
+            weights=np.asarray(quantities, dtype=np.float64) * np.asarray(scales, dtype=np.float64),
+            minlength=len(keys)
+        )
+    return {
+        (int(key_id), None if unit == _NO_UNIT else int(unit)): float(total)
+        for (key_id, unit), total in zip(keys, totals)
+    }
+
+
+async def build_shopping_list(
+    db: AsyncSession,
+    meal_servings: Dict[int, float],
+    recipe_servings: Dict[int, float]
+) -> Dict[str, Any]:
+    """
+    Aggregate the raw ingredients of a plan.
+
+    Args:
+        meal_servings: meal_id -> servings.
+        recipe_servings: recipe_id -> servings (batches).
+
+    Returns:
+        {"ingredients", "food_items", "missing"}: totals as returned by
+        expansion.describe_amounts(), and the requested meal and recipe ids
+        that do not exist as {"meal_ids", "recipe_ids"}.
+
+    Raises:
+        RecipeCycleError: If a food item involved requires itself.
+        ValueError: If a total overflows a float.
+    """
+    meal_foods: Dict[int, List[int]] = {}
+    if meal_servings:
+        result = await db.execute(select(Meal.meal_id).where(Meal.meal_id.in_(list(meal_servings))))
+        meal_foods = {meal_id: [] for meal_id in result.scalars()}
+        result = await db.execute(
+            select(MealFoodItem.mf_meal_id, MealFoodItem.mf_fooditem_id)
+            .where(MealFoodItem.mf_meal_id.in_(list(meal_foods)))
+        )
+        for meal_id, fooditem_id in result:
+            meal_foods[meal_id].append(fooditem_id)
+
+    recipes, foods = await expansion.expand(
+        db, recipe_servings, {fooditem_id for fooditem_ids in meal_foods.values() for fooditem_id in fooditem_ids}
+    )
+
+    parts = []
+    for recipe_id, (_, _, recipe_expansion) in recipes.items():
+        servings = recipe_servings[recipe_id]
+        parts.append((recipe_expansion.ingredients, servings))
+        parts.append((recipe_expansion.leaves, servings))
+    for meal_id, fooditem_ids in meal_foods.items():
+        servings = meal_servings[meal_id]
+        for fooditem_id in fooditem_ids:
+            parts.append((foods[fooditem_id].ingredients, servings))
+            parts.append((foods[fooditem_id].leaves, servings))
+
+    # Ingredient and food item ids share the arrays' id column, so the two
+    # kinds are aggregated separately
+    ingredients = aggregate(parts[0::2])
+    leaves = aggregate(parts[1::2])
+    if not all(math.isfinite(total) for totals in (ingredients, leaves) for total in totals.values()):
+        raise ValueError("Quantities are too large; reduce the servings")
+    ingredient_rows, food_rows = await expansion.describe_amounts(db, ingredients, leaves)
+
+    return {
+        "ingredients": ingredient_rows,
+        "food_items": food_rows,
+        "missing": {
+            "meal_ids": [meal_id for meal_id in meal_servings if meal_id not in meal_foods],
+            "recipe_ids": [recipe_id for recipe_id in recipe_servings if recipe_id not in recipes],
+        },
+    }
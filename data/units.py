@@ -0,0 +1,292 @@
+"""
+Unit conversion engine over UnitType.
+
+Every convertible unit has a dimension (mass, volume or count) and a base
+factor: the size of one unit in the dimension's base unit (gram,
+milliliter, piece). Converting within a dimension multiplies by
+from_factor / to_factor; converting between mass and volume also needs
+the ingredient's density (Ingredient.ingredient_density, g/ml). Units
+without a dimension (slice, can, ...) convert only to themselves.
+
+The factors of all units are precomputed into a dense unit x unit
+conversion matrix (NaN where no conversion exists), so
+ConversionTable.convert() handles whole arrays of (quantity, from_unit,
+to_unit) with a few NumPy gathers. Rows and columns are positions in the
+sorted unit ids rather than the ids themselves, so the matrix grows with
+the number of unit types however sparse their ids are.
+ConversionTable.normalize() moves quantities to a sensible display unit
+of the same measuring system (1500 gram -> 1.5 kilogram, 48 teaspoon ->
+1 cup) the same way. The table is built at startup (or on first use) and
+rebuilt on the next use after a unit type write.
+"""
+
+import logging
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import UnitType
+
+logger = logging.getLogger(__name__)
+
+# Accepted UnitType.unit_dimension values, and their base units
+DIMENSIONS = ("mass", "volume", "count")
+BASE_UNITS = {"mass": "gram", "volume": "milliliter", "count": "piece"}
+
+# Dimension and base factor of the units created by seed_data.py
+STANDARD_UNITS = {
+    "gram": ("mass", 1.0),
+    "kilogram": ("mass", 1000.0),
+    "ounce": ("mass", 28.349523125),
+    "pound": ("mass", 453.59237),
+    "milliliter": ("volume", 1.0),
+    "liter": ("volume", 1000.0),
+    "teaspoon": ("volume", 4.92892159375),
+    "tablespoon": ("volume", 14.78676478125),
+    "fluid ounce": ("volume", 29.5735295625),
+    "cup": ("volume", 236.5882365),
+    "pint": ("volume", 473.176473),
+    "quart": ("volume", 946.352946),
+    "gallon": ("volume", 3785.411784),
+    "pinch": ("volume", 0.30805759961),
+    "dash": ("volume", 0.61611519922),
+    "piece": ("count", 1.0),
+    "whole": ("count", 1.0),
+}
+
+# Display units by measuring system, smallest first. normalize() picks the
+# largest unit of a quantity's ladder that keeps it at 1 or more; units on
+# no ladder (pinch, piece, custom units) are left as they are.
+DISPLAY_LADDERS = (
+    ("gram", "kilogram"),
+    ("ounce", "pound"),
+    ("milliliter", "liter"),
+    ("teaspoon", "tablespoon", "cup", "quart", "gallon"),
+)
+
+_MASS = DIMENSIONS.index("mass")
+_VOLUME = DIMENSIONS.index("volume")
+_NONE = -1
+
+
+def validate_unit(dimension: Optional[str], base_factor: Optional[float]) -> None:
+    """
+    Check a unit type's dimension and base factor.
+
+    Raises:
+        ValueError: If the dimension is unknown, or a factor is missing,
+                    not positive, or given without a dimension.
+    """
+    if dimension is None:
+        if base_factor is not None:
+            raise ValueError("unit_base_factor requires a unit_dimension")
+        return
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"unit_dimension must be one of: {', '.join(DIMENSIONS)}")
+    if isinstance(base_factor, bool) or not isinstance(base_factor, (int, float)) or not base_factor > 0:
+        raise ValueError("unit_base_factor must be a positive number")
+
+
+def validate_density(density: Optional[float]) -> None:
+    """
+    Check an ingredient density (g/ml).
+
+    Raises:
+        ValueError: If it is given and not a positive number.
+    """
+    if density is not None and (isinstance(density, bool) or not isinstance(density, (int, float)) or not density > 0):
+        raise ValueError("ingredient_density must be a positive number (grams per milliliter)")
+
+
+class ConversionTable:
+    """
+    Dense conversion matrix over the known unit types.
+
+    Unit i of the arrays is ``unit_ids[i]`` (ids ascending); _index() maps
+    unit ids to these positions with a binary search.
+    """
+
+    def __init__(self, units: Iterable[Tuple[int, Optional[str], Optional[str], Optional[float]]]):
+        """
+        Args:
+            units: (id, unit_type, unit_dimension, unit_base_factor) rows.
+        """
+        units = sorted(units)
+        # One unused position when there are no units keeps gathers in bounds
+        size = max(len(units), 1)
+        self.unit_ids = np.array([unit_id for unit_id, _, _, _ in units], dtype=np.int64)
+        self.names = {unit_id: name for unit_id, name, _, _ in units}
+        self.dimension = np.full(size, _NONE, dtype=np.int8)
+        self.factor = np.full(size, np.nan)
+        for position, (_, _, dimension, factor) in enumerate(units):
+            if dimension in DIMENSIONS and factor:
+                self.dimension[position] = DIMENSIONS.index(dimension)
+                self.factor[position] = factor
+
+        # matrix[a, b] = quantity in unit b of one unit a
+        same = (self.dimension[:, None] == self.dimension[None, :]) & (self.dimension[:, None] != _NONE)
+        with np.errstate(invalid="ignore"):
+            self.matrix = np.where(same, self.factor[:, None] / self.factor[None, :], np.nan)
+        # Every unit converts to itself, dimension or not
+        np.fill_diagonal(self.matrix, 1.0)
+
+        self._build_ladders(units)
+
+    def _build_ladders(self, units) -> None:
+        """Resolve DISPLAY_LADDERS to table positions, ordered by base factor."""
+        by_name = {}
+        for position, (_, name, _, _) in enumerate(units):
+            if name:
+                by_name.setdefault(name.strip().lower(), position)
+
+        ladders = []
+        for names in DISPLAY_LADDERS:
+            # A unit only joins its ladder while it still has the standard dimension
+            dimension = DIMENSIONS.index(STANDARD_UNITS[names[0]][0])
+            ladder = [
+                by_name[name] for name in names
+                if name in by_name and self.dimension[by_name[name]] == dimension
+            ]
+            if len(ladder) > 1:
+                ladders.append(sorted(ladder, key=lambda position: self.factor[position]))
+
+        # ladder[position] = ladder index or -1; ladder_units / ladder_factors
+        # hold each ladder's unit ids, padded with -1 / NaN to a common width
+        width = max((len(ladder) for ladder in ladders), default=1)
+        self.ladder = np.full(len(self.factor), _NONE, dtype=np.int64)
+        self.ladder_units = np.full((max(len(ladders), 1), width), _NONE, dtype=np.int64)
+        self.ladder_factors = np.full((max(len(ladders), 1), width), np.nan)
+        for index, ladder in enumerate(ladders):
+            self.ladder[ladder] = index
+            self.ladder_units[index, :len(ladder)] = self.unit_ids[ladder]
+            self.ladder_factors[index, :len(ladder)] = self.factor[ladder]
+
+    def __len__(self) -> int:
+        return len(self.unit_ids)
+
+    def _index(self, unit_ids) -> Tuple[np.ndarray, np.ndarray]:
+        """Map unit ids to table positions, returning (positions, known-id mask)."""
+        unit_ids = np.asarray(unit_ids, dtype=np.int64)
+        if not len(self):
+            return np.zeros(unit_ids.shape, dtype=np.int64), np.zeros(unit_ids.shape, dtype=bool)
+        positions = np.minimum(np.searchsorted(self.unit_ids, unit_ids), len(self) - 1)
+        valid = self.unit_ids[positions] == unit_ids
+        return np.where(valid, positions, 0), valid
+
+    def dimensions(self, unit_ids) -> np.ndarray:
+        """Dimension codes (index into DIMENSIONS, -1 for none) of unit ids."""
+        index, valid = self._index(unit_ids)
+        return np.where(valid, self.dimension[index], _NONE)
+
+    def convert(self, quantities, from_units, to_units, densities=None) -> np.ndarray:
+        """
+        Convert quantities between units, element-wise.
+
+        Args:
+            quantities, from_units, to_units: Equal-length arrays (or
+                scalars, broadcast as usual).
+            densities: Optional g/ml per element (NaN where unknown), used
+                for mass <-> volume conversions.
+
+        Returns:
+            Converted quantities as floats; NaN where no conversion exists.
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        source, source_valid = self._index(from_units)
+        target, target_valid = self._index(to_units)
+        valid = source_valid & target_valid
+        result = quantities * np.where(valid, self.matrix[source, target], np.nan)
+
+        if densities is not None:
+            densities = np.asarray(densities, dtype=np.float64)
+            source_dimension = np.where(valid, self.dimension[source], _NONE)
+            target_dimension = np.where(valid, self.dimension[target], _NONE)
+            # volume -> mass: ml * g/ml = g; mass -> volume: g / (g/ml) = ml
+            with np.errstate(divide="ignore", invalid="ignore"):
+                to_mass = quantities * self.factor[source] * densities / self.factor[target]
+                to_volume = quantities * self.factor[source] / densities / self.factor[target]
+            result = np.where((source_dimension == _VOLUME) & (target_dimension == _MASS), to_mass, result)
+            result = np.where((source_dimension == _MASS) & (target_dimension == _VOLUME), to_volume, result)
+        return result
+
+    def to_base(self, quantities, units) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Express quantities in their dimension's base unit.
+
+        Returns:
+            Tuple of (quantities in gram / milliliter / piece, NaN for units
+            without a dimension; dimension codes).
+        """
+        index, valid = self._index(units)
+        factors = np.where(valid, self.factor[index], np.nan)
+        return np.asarray(quantities, dtype=np.float64) * factors, np.where(valid, self.dimension[index], _NONE)
+
+    def normalize(self, quantities, units) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Move quantities to their display unit, element-wise.
+
+        Each quantity on a DISPLAY_LADDERS unit is expressed in the largest
+        unit of that ladder in which it is at least 1 (the smallest unit if
+        none). Other quantities keep their unit.
+
+        Args:
+            quantities, units: Equal-length 1-D arrays.
+
+        Returns:
+            Tuple of (quantities, unit ids).
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        units = np.asarray(units, dtype=np.int64)
+        index, valid = self._index(units)
+        ladder = np.where(valid & np.isfinite(quantities), self.ladder[index], _NONE)
+        on_ladder = ladder != _NONE
+        if not on_ladder.any():
+            return quantities, units
+        ladder = np.where(on_ladder, ladder, 0)
+
+        # candidates[i, j] = quantity i expressed in unit j of its ladder
+        base = quantities * np.where(valid, self.factor[index], np.nan)
+        with np.errstate(invalid="ignore"):
+            candidates = base[:, None] / self.ladder_factors[ladder]
+            fits = candidates >= 1 - 1e-9
+        width = fits.shape[1]
+        column = np.where(fits.any(axis=1), width - 1 - np.argmax(fits[:, ::-1], axis=1), 0)
+
+        rows = np.arange(len(quantities))
+        return (
+            np.where(on_ladder, candidates[rows, column], quantities),
+            np.where(on_ladder, self.ladder_units[ladder, column], units),
+        )
+
+
+# Process-wide table; None until built or after invalidate()
+_table: Optional[ConversionTable] = None
+
+# Bumped by invalidate(), so a build that raced with a write is not kept
+_generation = 0
+
+
+def invalidate() -> None:
+    """Drop the table after a unit type write."""
+    global _table, _generation
+    _table = None
+    _generation += 1
+
+
+async def get_table(db: AsyncSession) -> ConversionTable:
+    """Return the conversion table, (re)building it from the UnitType table if needed."""
+    global _table
+    if _table is not None:
+        return _table
+
+    generation = _generation
+    result = await db.execute(
+        select(UnitType.id, UnitType.unit_type, UnitType.unit_dimension, UnitType.unit_base_factor)
+    )
+    table = ConversionTable(result.all())
+    logger.info("Built unit conversion table: %d unit types", len(table))
+    if generation == _generation:
+        _table = table
+    return table
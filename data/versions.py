@@ -0,0 +1,104 @@
+"""
+Per-table write generations behind the ETags of RecipeFirst read endpoints.
+
+Every committed session that wrote to a table bumps that table's
+generation. Each INSERT / UPDATE / DELETE executed on a session's
+connection is recorded, whether it comes from an ORM flush or a Core
+statement (bulk imports, _update_row(), closure table maintenance). The
+tables are collected on the session and only bumped in after_commit, so a
+rolled-back write changes no version.
+
+A representation's version is the generations of the tables embedded in
+it plus a token drawn at startup, so validators issued before a restart
+never match afterwards. Two writes always give two versions, even within
+the one-second resolution of SQLite timestamps, and reading a version
+costs no query.
+
+Writes that do not go through this process (seed_data.py,
+migrate_data.py, manual SQL, another worker) bump no generation. So the
+version also carries the current ``settings.etag_max_age`` period, and
+every validator expires at the end of its period at the latest. That
+bounds how long such a write can be answered with 304, as
+``response_cache_ttl`` does for cached bodies.
+"""
+
+import secrets
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import Dict, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+# (last modified, startup token, validity period, generation per table)
+Version = Tuple[datetime, str, int, Tuple[int, ...]]
+
+_TOKEN = secrets.token_hex(8)
+
+# Last-Modified of tables not written since startup
+_STARTED = datetime.now(timezone.utc)
+
+_generations: Dict[str, int] = {}
+_modified: Dict[str, datetime] = {}
+
+# Session.info key holding the tables written in the current transaction
+_WRITTEN = "written_tables"
+
+# Connection of each open session transaction -> its written tables. Keyed
+# by the Connection object rather than Connection.info, which belongs to
+# the pooled DBAPI connection that StaticPool shares between sessions.
+_written_by_connection: "weakref.WeakKeyDictionary[Connection, Set[str]]" = weakref.WeakKeyDictionary()
+
+
+def _table_name(model) -> str:
+    """Table name of a mapped class or Table."""
+    return getattr(model, "__table__", model).name
+
+
+def get_version(*models) -> Version:
+    """Get the version of the given tables (mapped classes or Tables)."""
+    names = [_table_name(model) for model in models]
+    modified = max((_modified.get(name, _STARTED) for name in names), default=_STARTED)
+    period = int(time.time() // settings.etag_max_age)
+    return modified, _TOKEN, period, tuple(_generations.get(name, 0) for name in names)
+
+
+def _bump(names: Set[str]) -> None:
+    """Record a committed write to the named tables."""
+    now = datetime.now(timezone.utc)
+    for name in names:
+        _generations[name] = _generations.get(name, 0) + 1
+        _modified[name] = now
+
+
+def _written(session: Session) -> Set[str]:
+    return session.info.setdefault(_WRITTEN, set())
+
+
+@event.listens_for(Session, "after_begin")
+def _track_connection(session: Session, transaction, connection: Connection) -> None:
+    _written_by_connection[connection] = _written(session)
+
+
+@event.listens_for(Engine, "after_execute")
+def _record_statement(conn: Connection, clauseelement, multiparams, params, execution_options, result) -> None:
+    if getattr(clauseelement, "is_dml", False):
+        written = _written_by_connection.get(conn)
+        if written is not None:
+            written.add(clauseelement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_written(session: Session) -> None:
+    written = session.info.pop(_WRITTEN, None)
+    if written:
+        _bump(written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written(session: Session) -> None:
+    session.info.pop(_WRITTEN, None)
@@ -32,6 +32,7 @@ from data.models import (
     RecipeInstruction, RecipeIngredient, Meal, MealFoodItem,
     RecipeCategory, IngredientCategory, MealCategory
 )
+from data.crud import rebuild_category_closure
 
 
 class DataMigrator:
@@ -136,6 +137,13 @@ class DataMigrator:
             count = await self.copy_table_data(model, sqlite_session, postgres_session)
             total_records += count
 
+        # Derived from Category.parent_category_id rather than copied, as
+        # older SQLite databases predate the table
+        async with postgres_session() as session:
+            await rebuild_category_closure(session)
+            await session.commit()
+        print("  ✓ Rebuilt CategoryClosure")
+
         print(f"\n=== Migration Complete ===")
         print(f"Total records migrated: {total_records}")
 
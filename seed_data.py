@@ -27,6 +27,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 from data.database import AsyncSessionLocal
 from data.models import UnitType, Category, Ingredient, User
 from data.security import get_password_hash
+from data.crud import rebuild_category_closure
+from data.units import STANDARD_UNITS
 
 
 # Seed Accounts
@@ -206,7 +208,9 @@ async def seed_database():
         existing_units = set()
 
         for unit_name in UNITS:
-            unit = UnitType(unit_type=unit_name)
+            # Units missing from STANDARD_UNITS (slice, can, ...) are not convertible
+            dimension, factor = STANDARD_UNITS.get(unit_name, (None, None))
+            unit = UnitType(unit_type=unit_name, unit_dimension=dimension, unit_base_factor=factor)
             session.add(unit)
             existing_units.add(unit_name)
 
@@ -226,6 +230,8 @@ async def seed_database():
             session.add(category)
             category_map[cat_data["name"]] = category
 
+        await session.flush()
+        await rebuild_category_closure(session)
         await session.commit()
         print(f"✓ Added {len(CATEGORIES)} categories\n")
 
@@ -0,0 +1,125 @@
+"""
+Shared fixtures for the RecipeFirst API tests.
+
+Every test runs against a fresh SQLite database created from the models
+(without the full-text and trigram migrations, so searches use the LIKE
+fallback) and seeded by seed_catalog(). The in-process indexes and caches
+are cleared between tests, and requests are authenticated as a fixed user.
+"""
+
+import os
+import tempfile
+
+# Must be set before data.config reads the environment
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='recipefirst-test-')}/test.db"
+
+import httpx
+import pytest
+
+from data import (
+    autocomplete, category_tree, expansion, fuzzy, ingredient_index, pantry, recipe_graph, search, units
+)
+from data.cache import response_cache
+from data.database import engine, AsyncSessionLocal
+from data.dependencies import get_current_user
+from data.models import (
+    Base, User, UnitType, Ingredient, FoodItem, Category, CategoryClosure, Recipe, RecipeIngredient,
+    RecipeInstruction, RecipeCategory, Meal, MealFoodItem
+)
+from data.pagination import count_cache
+from data.server import app
+
+app.dependency_overrides[get_current_user] = lambda: User(
+    user_id=1, username="tester", email="tester@example.com", hashed_password="x", is_active=1
+)
+
+
+async def seed_catalog(session) -> None:
+    """
+    Seed a small catalog.
+
+    - unit types 1 cup, 2 gram, 3 teaspoon, 4 kilogram, 5 piece (with
+      dimensions and base factors) and 6 slice (no dimension)
+    - ingredients 1-5 (1 "flour" has a density of 0.5 g/ml)
+    - food items 1-5, produced by recipes 1-3 ("Recipe n" makes food item
+      n from 1.5 cup of ingredient n + 1, in category 1 or 2)
+    - categories 1 Italian and 2 Pasta (a child of Italian)
+    - meal 1 serving food item 1
+    """
+    session.add_all([
+        UnitType(id=1, unit_type="cup", unit_dimension="volume", unit_base_factor=236.5882365),
+        UnitType(id=2, unit_type="gram", unit_dimension="mass", unit_base_factor=1.0),
+        UnitType(id=3, unit_type="teaspoon", unit_dimension="volume", unit_base_factor=4.92892159375),
+        UnitType(id=4, unit_type="kilogram", unit_dimension="mass", unit_base_factor=1000.0),
+        UnitType(id=5, unit_type="piece", unit_dimension="count", unit_base_factor=1.0),
+        UnitType(id=6, unit_type="slice"),
+    ])
+    session.add_all([
+        Ingredient(ingredient_id=i, ingredient_name=name, ingredient_density=0.5 if i == 1 else None)
+        for i, name in enumerate(["flour", "sugar", "butter", "egg", "milk"], start=1)
+    ])
+    session.add_all([FoodItem(fooditem_id=i, fooditem_name=f"food {i}") for i in range(1, 6)])
+    session.add_all([
+        Category(category_id=1, category_name="Italian"),
+        Category(category_id=2, category_name="Pasta", parent_category_id=1),
+    ])
+    session.add_all([
+        CategoryClosure(ancestor_id=1, descendant_id=1, depth=0),
+        CategoryClosure(ancestor_id=2, descendant_id=2, depth=0),
+        CategoryClosure(ancestor_id=1, descendant_id=2, depth=1),
+    ])
+    await session.flush()
+
+    for r in range(1, 4):
+        session.add(Recipe(recipe_id=r, recipe_name=f"Recipe {r}", recipe_fooditem_id=r))
+        session.add(RecipeIngredient(ri_recipe_id=r, ri_ingredient_id=r + 1, ri_unit_type_id=1, ri_quantity=1.5))
+        session.add(RecipeInstruction(recipe_id=r, step_number=1, instruction_text="Mix"))
+        session.add(RecipeCategory(recipe_id=r, category_id=1 + r % 2))
+    session.add(Meal(meal_id=1, meal_name="Dinner"))
+    await session.flush()
+    session.add(MealFoodItem(mf_meal_id=1, mf_fooditem_id=1))
+    await session.commit()
+
+
+def _reset_in_memory_state() -> None:
+    """Drop every in-process index and cache so each test starts cold."""
+    fuzzy._indexes.clear()
+    fuzzy._pg_trgm_available.clear()
+    autocomplete._indexes.clear()
+    ingredient_index._index = None
+    recipe_graph._graph = None
+    search._index_available.clear()
+    pantry.invalidate()
+    category_tree.invalidate()
+    expansion.invalidate()
+    units.invalidate()
+    response_cache.clear()
+    count_cache._entries.clear()
+
+
+@pytest.fixture(autouse=True)
+async def database():
+    """Recreate and seed the database around every test."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        await seed_catalog(session)
+    _reset_in_memory_state()
+    yield
+    # The pooled connection belongs to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session():
+    """A database session for calling crud functions directly."""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def client():
+    """An HTTP client talking to the app in-process."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
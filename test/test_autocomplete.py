@@ -0,0 +1,26 @@
+"""Tests for the in-memory /autocomplete prefix index."""
+
+async def suggest(client, q: str, **params):
+    response = await client.get("/autocomplete", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(item["type"], item["id"]) for item in response.json()["results"]]
+
+
+async def test_whole_name_matches_rank_first(client):
+    await client.put("/recipes/3", json={"name": "Quick Recipe"})
+    assert await suggest(client, "rec", types="recipe") == [("recipe", 1), ("recipe", 2), ("recipe", 3)]
+
+
+async def test_words_split_on_punctuation(client):
+    await client.put("/recipes/1", json={"name": "Chicken-Fried Steak"})
+    await client.put("/recipes/2", json={"name": "Mac&Cheese"})
+    assert await suggest(client, "fri", types="recipe") == [("recipe", 1)]
+    assert await suggest(client, "chee", types="recipe") == [("recipe", 2)]
+    assert await suggest(client, "mac & ch", types="recipe") == [("recipe", 2)]
+
+
+async def test_deleted_rows_are_forgotten(client):
+    assert await suggest(client, "flo") == [("ingredient", 1)]
+    response = await client.delete("/ingredients/1")
+    assert response.status_code == 200
+    assert await suggest(client, "flo") == []
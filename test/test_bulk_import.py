@@ -0,0 +1,112 @@
+"""Tests for POST /recipes/bulk."""
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from data import crud, encoding, recipe_graph
+from data.config import settings
+
+
+def recipe(name, fooditem_id=5, step_text="Mix", uses=None):
+    data = {
+        "name": name,
+        "fooditem_id": fooditem_id,
+        "instructions": [{"step_number": 1, "instruction_text": step_text}],
+    }
+    if uses is not None:
+        data["ingredients"] = [{"ri_fooditem_id": uses, "ri_unit_type_id": 5, "ri_quantity": 1}]
+    return data
+
+
+@pytest.fixture
+def chunks(monkeypatch):
+    """Use chunks of 2 and record the size of each chunk written."""
+    monkeypatch.setattr(settings, "bulk_import_chunk_size", 2)
+    sizes = []
+    create_recipes_bulk = crud.create_recipes_bulk
+
+    async def record(db, recipes):
+        sizes.append(len(recipes))
+        return await create_recipes_bulk(db, recipes)
+
+    monkeypatch.setattr(crud, "create_recipes_bulk", record)
+    return sizes
+
+
+async def instruction_text(client, recipe_id):
+    return (await client.get(f"/recipes/{recipe_id}")).json()["instructions"][0]["instruction_text"]
+
+
+async def test_ids_follow_input_order_across_chunks(client, chunks):
+    # Recipes with equal column values must still get their own child rows
+    items = [recipe("Same", step_text=f"step {index}") for index in range(5)]
+    response = await client.post("/recipes/bulk", json=items)
+    report = response.json()
+
+    assert chunks == [2, 2, 1]
+    assert report["created"] == 5 and report["failed"] == 0
+    assert report["recipe_ids"] == sorted(report["recipe_ids"])
+    for index, recipe_id in enumerate(report["recipe_ids"]):
+        assert await instruction_text(client, recipe_id) == f"step {index}"
+
+
+async def test_failures_are_reported_per_recipe(client, chunks):
+    items = [
+        recipe("Good"),
+        {"fooditem_id": 5},
+        recipe("Missing food item", fooditem_id=99),
+        recipe("Requires itself", fooditem_id=4, uses=4),
+        recipe("Also good"),
+    ]
+    report = (await client.post("/recipes/bulk", json=items)).json()
+
+    assert report["created"] == 2 and report["failed"] == 3
+    assert [recipe_id is not None for recipe_id in report["recipe_ids"]] == [True, False, False, False, True]
+    assert [error["index"] for error in report["errors"]] == [1, 2, 3]
+    assert report["errors"][1]["detail"] == "Food item 99 does not exist"
+
+
+async def test_failed_chunk_fails_only_its_recipes(client, chunks, monkeypatch):
+    commit = AsyncSession.commit
+    commits = []
+
+    async def fail_second_commit(self):
+        commits.append(self)
+        if len(commits) == 2:
+            raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+        return await commit(self)
+
+    monkeypatch.setattr(AsyncSession, "commit", fail_second_commit)
+    # The failed chunk's recipe 3 would make food item 4 require food item 1
+    items = [recipe("A"), recipe("B"), recipe("C", fooditem_id=4, uses=1), recipe("D"), recipe("E")]
+    report = (await client.post("/recipes/bulk", json=items)).json()
+    monkeypatch.undo()
+
+    assert [recipe_id is not None for recipe_id in report["recipe_ids"]] == [True, True, False, False, True]
+    assert [(error["index"], error["detail"]) for error in report["errors"]] == [
+        (2, "Batch could not be written"), (3, "Batch could not be written")
+    ]
+    assert (await client.get("/recipes")).headers["X-Total-Count"] == "6"
+    # Nothing of the failed chunk is left in the dependency graph
+    assert all(recipe_id > 0 for recipe_id in recipe_graph._graph._recipes)
+    response = await client.post(
+        "/recipes/1/ingredients", json={"ri_fooditem_id": 4, "ri_unit_type_id": 5, "ri_quantity": 1}
+    )
+    assert response.status_code == 200
+
+
+async def test_ndjson_body(client, chunks):
+    body = b"\n".join([encoding.dumps(recipe("One")), b"{not json", b"", encoding.dumps(recipe("Two"))])
+    response = await client.post(
+        "/recipes/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    report = response.json()
+    assert [recipe_id is not None for recipe_id in report["recipe_ids"]] == [True, False, True]
+    assert report["errors"][0]["index"] == 1
+    assert report["errors"][0]["detail"].startswith("Malformed JSON")
+
+
+async def test_empty_body_is_rejected(client):
+    response = await client.post("/recipes/bulk", json=[])
+    assert response.status_code == 400
@@ -0,0 +1,74 @@
+"""Tests for the encoded response cache of the recipe read endpoints."""
+
+from data import crud, queries
+from data.cache import response_cache
+from data.database import AsyncSessionLocal
+
+
+async def recipe(client, recipe_id: int):
+    return (await client.get(f"/recipes/{recipe_id}")).json()
+
+
+async def listed(client):
+    return {item["recipe_id"]: item for item in (await client.get("/recipes")).json()["recipes"]}
+
+
+async def test_reads_are_served_from_the_cache(client):
+    await recipe(client, 1)
+    hits = response_cache.hits
+    await recipe(client, 1)
+    assert response_cache.hits == hits + 1
+
+
+async def test_ingredient_rename_drops_embedding_bodies(client):
+    await recipe(client, 1)
+    await listed(client)
+    await client.put("/ingredients/2", json={"ingredient_name": "caster sugar"})
+
+    assert (await recipe(client, 1))["ingredients"][0]["ingredient_name"] == "caster sugar"
+    assert (await listed(client))[1]["ingredients"][0]["ingredient_name"] == "caster sugar"
+
+
+async def test_unit_type_update_drops_embedding_bodies(client):
+    await recipe(client, 2)
+    await listed(client)
+    await client.put("/unit-types/1", json={"unit_type": "mug"})
+
+    assert (await recipe(client, 2))["ingredients"][0]["unit_type"] == "mug"
+    assert (await listed(client))[2]["ingredients"][0]["unit_type"] == "mug"
+
+
+async def test_category_delete_drops_embedding_bodies(client):
+    assert [category["category_id"] for category in (await recipe(client, 1))["categories"]] == [2]
+    await listed(client)
+    response = await client.delete("/categories/2")
+    assert response.status_code == 200
+
+    assert (await recipe(client, 1))["categories"] == []
+    assert (await listed(client))[3]["categories"] == []
+
+
+async def rename_during(monkeypatch, module, name):
+    """Make the next call of module.name commit an ingredient rename before returning."""
+    original = getattr(module, name)
+
+    async def read_then_write(*args, **kwargs):
+        result = await original(*args, **kwargs)
+        monkeypatch.setattr(module, name, original)
+        async with AsyncSessionLocal() as session:
+            await crud.update_ingredient(session, 2, {"ingredient_name": "caster sugar"})
+        return result
+
+    monkeypatch.setattr(module, name, read_then_write)
+
+
+async def test_body_read_before_a_concurrent_write_is_not_cached(client, monkeypatch):
+    await rename_during(monkeypatch, crud, "get_recipe_by_id")
+    assert (await recipe(client, 1))["ingredients"][0]["ingredient_name"] == "sugar"
+    assert (await recipe(client, 1))["ingredients"][0]["ingredient_name"] == "caster sugar"
+
+
+async def test_page_read_before_a_concurrent_write_is_not_cached(client, monkeypatch):
+    await rename_during(monkeypatch, queries, "get_recipes_page")
+    assert (await listed(client))[1]["ingredients"][0]["ingredient_name"] == "sugar"
+    assert (await listed(client))[1]["ingredients"][0]["ingredient_name"] == "caster sugar"
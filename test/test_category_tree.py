@@ -0,0 +1,49 @@
+"""Tests for the cached /categories/tree hierarchy and subtree filters."""
+
+from data import crud
+
+
+async def tree(client):
+    response = await client.get("/categories/tree")
+    assert response.status_code == 200
+    return response.json()["categories"]
+
+
+def counts(nodes):
+    """Map category_id -> recipe_count over a (sub)tree."""
+    found = {}
+    for node in nodes:
+        found[node["category_id"]] = node["recipe_count"]
+        found.update(counts(node["children"]))
+    return found
+
+
+async def test_counts_cover_subtrees(client):
+    roots = await tree(client)
+    assert [root["category_id"] for root in roots] == [1]
+    assert [child["category_id"] for child in roots[0]["children"]] == [2]
+    assert counts(roots) == {1: 3, 2: 2}
+
+
+async def test_moving_a_category_rebuilds_the_tree(client, session):
+    await tree(client)
+    response = await client.post("/categories", json={"category_name": "Baking"})
+    baking_id = response.json()["category_id"]
+    await client.put("/categories/2", json={"parent_category_id": baking_id})
+
+    roots = await tree(client)
+    assert [root["category_id"] for root in roots] == [1, baking_id]
+    assert counts(roots) == {1: 1, baking_id: 2, 2: 2}
+
+    recipes = await crud.get_recipes_by_category(session, baking_id, include_descendants=True)
+    assert sorted(recipe.recipe_id for recipe in recipes) == [1, 3]
+    assert await crud.get_recipes_by_category(session, baking_id) == []
+
+
+async def test_recipe_category_writes_update_counts(client):
+    await tree(client)
+    await client.put("/recipes/2", json={"category_ids": [2]})
+    assert counts(await tree(client)) == {1: 3, 2: 3}
+
+    await client.delete("/recipes/1")
+    assert counts(await tree(client)) == {1: 2, 2: 2}
@@ -0,0 +1,102 @@
+"""Tests for ETag / If-None-Match handling on read endpoints."""
+
+import sqlite3
+
+from data import versions
+from data.cache import response_cache
+from data.config import settings
+from data.database import DATABASE_URL
+from data.models import Recipe
+
+
+async def get_with_etag(client, url: str, etag: str = None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return await client.get(url, headers=headers)
+
+
+async def test_unchanged_recipe_is_not_modified(client):
+    response = await client.get("/recipes/1")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    response = await get_with_etag(client, "/recipes/1", etag)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+async def test_writes_within_one_second_change_the_etag(client):
+    # Row timestamps have one-second resolution on SQLite; the ETag must
+    # still change for every write
+    await client.put("/recipes/1", json={"name": "Name A"})
+    response = await client.get("/recipes/1")
+    etag = response.headers["ETag"]
+    assert response.json()["recipe_name"] == "Name A"
+
+    await client.put("/recipes/1", json={"name": "Name B"})
+    response = await get_with_etag(client, "/recipes/1", etag)
+    assert response.status_code == 200
+    assert response.json()["recipe_name"] == "Name B"
+    assert response.headers["ETag"] != etag
+
+
+async def test_deleting_a_child_row_changes_the_etag(client):
+    response = await client.get("/recipes/1")
+    etag = response.headers["ETag"]
+    ri_id = response.json()["ingredients"][0]["ri_id"]
+    response = await client.delete(f"/recipes/1/ingredients/{ri_id}")
+    assert response.status_code == 200
+
+    response = await get_with_etag(client, "/recipes/1", etag)
+    assert response.status_code == 200
+    assert response.json()["ingredients"] == []
+
+
+async def test_embedded_row_change_invalidates_the_list(client):
+    etag = (await client.get("/recipes")).headers["ETag"]
+    await client.put("/ingredients/2", json={"ingredient_name": "caster sugar"})
+
+    response = await get_with_etag(client, "/recipes", etag)
+    assert response.status_code == 200
+
+
+async def test_unrelated_write_keeps_the_list_current(client):
+    etag = (await client.get("/recipes")).headers["ETag"]
+    await client.put("/meals/1", json={"meal_name": "Supper"})
+
+    response = await get_with_etag(client, "/recipes", etag)
+    assert response.status_code == 304
+
+
+async def test_outside_write_is_seen_when_the_period_ends(client, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(versions.time, "time", lambda: now)
+    etag = (await client.get("/recipes/1")).headers["ETag"]
+
+    # A write made by another process bumps no generation
+    path = DATABASE_URL.replace("sqlite+aiosqlite:///", "")
+    with sqlite3.connect(path) as connection:
+        connection.execute("UPDATE Recipe SET recipe_name = 'Outside' WHERE recipe_id = 1")
+    response_cache.clear()
+    response = await get_with_etag(client, "/recipes/1", etag)
+    assert response.status_code == 304
+
+    now += settings.etag_max_age
+    response = await get_with_etag(client, "/recipes/1", etag)
+    assert response.status_code == 200
+    assert response.json()["recipe_name"] == "Outside"
+    assert response.headers["ETag"] != etag
+
+
+async def test_rolled_back_write_keeps_the_version(session):
+    before = versions.get_version(Recipe)
+    recipe = await session.get(Recipe, 1)
+    recipe.recipe_name = "Never saved"
+    await session.flush()
+    await session.rollback()
+    assert versions.get_version(Recipe) == before
+
+    recipe = await session.get(Recipe, 1)
+    recipe.recipe_name = "Saved"
+    await session.commit()
+    assert versions.get_version(Recipe) != before
@@ -0,0 +1,61 @@
+"""Tests for the X-Total-Count header and the shared count cache."""
+
+import pytest
+
+from data.pagination import CountCache, count_cache
+
+
+# (list path, table, create payload, id key, seeded rows)
+LISTS = [
+    ("/meals", "Meal", {"meal_name": "Lunch"}, "meal_id", 1),
+    ("/food-items", "FoodItem", {"fooditem_name": "food 6"}, "fooditem_id", 5),
+    ("/ingredients", "Ingredient", {"ingredient_name": "salt"}, "ingredient_id", 5),
+    ("/categories", "Category", {"category_name": "French"}, "category_id", 2),
+    ("/unit-types", "UnitType", {"unit_type": "pinch"}, "id", 6),
+]
+
+
+def test_count_cache_expires_and_invalidates(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr("data.pagination.time.monotonic", lambda: now)
+    cache = CountCache(ttl=10)
+    cache.set("Meal", 3)
+    cache.set("Recipe", 4)
+    assert cache.get("Meal") == 3
+
+    cache.invalidate("Meal", "Unknown")
+    assert cache.get("Meal") is None
+    assert cache.get("Recipe") == 4
+
+    now += 11
+    assert cache.get("Recipe") is None
+
+
+async def get_total(client, path: str) -> int:
+    response = await client.get(path)
+    assert response.status_code == 200
+    return int(response.headers["X-Total-Count"])
+
+
+@pytest.mark.parametrize("path, table, payload, id_key, seeded", LISTS)
+async def test_total_follows_create_and_delete(client, path, table, payload, id_key, seeded):
+    assert await get_total(client, path) == seeded
+    assert count_cache.get(table) == seeded
+
+    # The count is cached for count_cache_ttl, so only invalidate() can make
+    # these totals exact
+    response = await client.post(path, json=payload)
+    assert response.status_code == 200
+    assert count_cache.get(table) is None
+    assert await get_total(client, path) == seeded + 1
+
+    response = await client.delete(f"{path}/{response.json()[id_key]}")
+    assert response.status_code == 200
+    assert count_cache.get(table) is None
+    assert await get_total(client, path) == seeded
+
+
+async def test_total_ignores_the_page_size(client):
+    response = await client.get("/ingredients", params={"limit": 2})
+    assert len(response.json()["ingredients"]) == 2
+    assert response.headers["X-Total-Count"] == "5"
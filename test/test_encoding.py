@@ -0,0 +1,63 @@
+"""Tests for JSON response encoding."""
+
+import json
+import math
+from datetime import datetime
+
+import pytest
+
+from data import encoding
+from data.encoding import FastJSONResponse
+
+
+def reject_constant(token: str):
+    # json.loads() accepts bare NaN / Infinity, which are not valid JSON
+    raise AssertionError(f"Invalid JSON token {token}")
+
+
+def stdlib_dumps(content) -> bytes:
+    # What FastAPI's JSONResponse sends, after jsonable_encoder has turned
+    # datetimes into isoformat() strings
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"),
+        default=lambda value: value.isoformat()
+    ).encode("utf-8")
+
+
+@pytest.mark.parametrize("content", [
+    {"name": "Soup", "quantity": 1.5, "tags": [1, 2], "nested": {"empty": None}},
+    {"created_at": datetime(2024, 5, 1, 12, 30, 15), "updated_at": datetime(2024, 5, 1, 0, 0, 0, 123456)},
+    [[1, [2.25, [3, []]]], {"rows": [{"id": 1, "ok": True}, {"id": 2, "ok": False}]}],
+    {"name": "Crème brûlée ☕ 🍮", "note": 'quote " backslash \\ newline \n control \x01 \u2028'},
+    {"values": [0.1, -0.0, 2.0, 123456789.125, 10 ** 20, -7]},
+])
+def test_dumps_matches_json_module(content):
+    assert encoding.dumps(content) == stdlib_dumps(content)
+
+
+def test_float_exponents_differ_only_in_notation():
+    # The one documented textual difference: no zero padding or "+" in exponents
+    content = [1e-7, 1e20]
+    assert encoding.dumps(content) == b"[1e-7,1e20]"
+    assert stdlib_dumps(content) == b"[1e-07,1e+20]"
+    assert json.loads(encoding.dumps(content)) == content
+
+
+def test_dumps_encodes_datetimes_as_iso_8601():
+    stamp = datetime(2024, 5, 1, 12, 30, 15)
+    assert json.loads(encoding.dumps({"at": stamp})) == {"at": stamp.isoformat()}
+
+
+def test_non_finite_floats_are_encoded_as_null():
+    body = encoding.dumps({"values": [math.nan, math.inf, -math.inf, 2.0]})
+    parsed = json.loads(body, parse_constant=reject_constant)
+    assert parsed == {"values": [None, None, None, 2.0]}
+
+
+def test_response_passes_encoded_bytes_through():
+    body = encoding.dumps([1, 2, 3])
+    assert FastJSONResponse(body).body == body
+
+
+def test_loads_round_trips():
+    assert encoding.loads(b'[{"a": 1.5}]') == [{"a": 1.5}]
@@ -0,0 +1,39 @@
+"""Tests for /recipes/{id}/expanded compound-recipe expansion."""
+
+
+async def expanded(client, recipe_id: int):
+    response = await client.get(f"/recipes/{recipe_id}/expanded")
+    assert response.status_code == 200
+    return response.json()
+
+
+def amounts(rows, key):
+    return {(row[key], row["unit_type"]): row["quantity"] for row in rows}
+
+
+async def test_food_items_resolve_through_their_recipes(client):
+    # Recipe 2 uses 2 of food item 1 (made by recipe 1) and 1 of food item 5 (bought)
+    await client.post("/recipes/2/ingredients", json={"ri_fooditem_id": 1, "ri_unit_type_id": 5, "ri_quantity": 2})
+    await client.post("/recipes/2/ingredients", json={"ri_fooditem_id": 5, "ri_unit_type_id": 6, "ri_quantity": 1})
+
+    body = await expanded(client, 2)
+    assert amounts(body["ingredients"], "ingredient_name") == {("sugar", "cup"): 3.0, ("butter", "cup"): 1.5}
+    assert amounts(body["food_items"], "fooditem_name") == {("food 5", "slice"): 1.0}
+    assert body["sub_recipes"] == [{"fooditem_id": 1, "recipe_id": 1}]
+
+
+async def test_changing_a_sub_recipe_updates_the_expansion(client):
+    await client.post("/recipes/2/ingredients", json={"ri_fooditem_id": 1, "ri_unit_type_id": 5, "ri_quantity": 2})
+    await expanded(client, 2)
+
+    ri_id = (await client.get("/recipes/1")).json()["ingredients"][0]["ri_id"]
+    await client.put(f"/recipes/1/ingredients/{ri_id}", json={"ri_quantity": 0.5})
+    body = await expanded(client, 2)
+    assert amounts(body["ingredients"], "ingredient_name") == {("sugar", "cup"): 1.0, ("butter", "cup"): 1.5}
+
+
+async def test_cycles_are_rejected(client):
+    await client.post("/recipes/2/ingredients", json={"ri_fooditem_id": 1, "ri_unit_type_id": 5, "ri_quantity": 1})
+    response = await client.post("/recipes/1/ingredients", json={"ri_fooditem_id": 2, "ri_unit_type_id": 5, "ri_quantity": 1})
+    assert response.status_code == 409
+    assert [row["ri_fooditem_id"] for row in (await client.get("/recipes/1")).json()["ingredients"]] == [None]
@@ -0,0 +1,59 @@
+"""Tests for streaming the recipe catalog from GET /recipes/export."""
+
+import json
+
+import pytest
+
+from data import crud, routes
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Export in batches of two and record the size of every batch streamed."""
+    sizes = []
+    stream_recipe_batches = crud.stream_recipe_batches
+
+    async def recording(db, batch_size=500):
+        async for batch in stream_recipe_batches(db, batch_size):
+            sizes.append(len(batch))
+            yield batch
+
+    monkeypatch.setattr(routes, "EXPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(crud, "stream_recipe_batches", recording)
+    return sizes
+
+
+async def get_details(client):
+    return [(await client.get(f"/recipes/{recipe_id}")).json() for recipe_id in (1, 2, 3)]
+
+
+async def test_ndjson_has_one_line_per_recipe(client, batches):
+    response = await client.get("/recipes/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert batches == [2, 1]
+
+    lines = response.text.splitlines()
+    assert response.text.endswith("\n")
+    # Every line is a complete recipe in the GET /recipes/{id} shape
+    assert [json.loads(line) for line in lines] == await get_details(client)
+
+
+async def test_json_is_a_single_array(client, batches):
+    response = await client.get("/recipes/export", params={"format": "json"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert batches == [2, 1]
+    assert response.json() == await get_details(client)
+
+
+async def test_empty_catalog(client):
+    for recipe_id in (1, 2, 3):
+        await client.delete(f"/recipes/{recipe_id}")
+    assert (await client.get("/recipes/export")).text == ""
+    assert (await client.get("/recipes/export", params={"format": "json"})).json() == []
+
+
+async def test_unknown_format_is_rejected(client):
+    response = await client.get("/recipes/export", params={"format": "csv"})
+    assert response.status_code == 422
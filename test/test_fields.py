@@ -0,0 +1,78 @@
+"""Tests for ?fields= and ?include= on recipe, meal and search reads."""
+
+import pytest
+
+
+async def get_json(client, path: str, **params):
+    response = await client.get(path, params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_recipe_fields_are_projected(client):
+    body = await get_json(client, "/recipes/1", fields="recipe_id,recipe_name")
+    assert body == {"recipe_id": 1, "recipe_name": "Recipe 1"}
+
+    body = await get_json(client, "/recipes", fields="recipe_id, ingredients")
+    assert [list(recipe) for recipe in body["recipes"]] == [["recipe_id", "ingredients"]] * 3
+    assert body["recipes"][0]["ingredients"][0]["ri_ingredient_id"] == 2
+
+
+async def test_include_limits_embedded_relationships(client):
+    full = await get_json(client, "/recipes/1")
+
+    body = await get_json(client, "/recipes/1", include="categories")
+    assert "ingredients" not in body and "instructions" not in body
+    assert body["categories"] == full["categories"]
+    assert body["recipe_name"] == full["recipe_name"]
+
+    # An empty include embeds no relationships but keeps every scalar field
+    body = await get_json(client, "/recipes/1", include="")
+    assert body == {key: full[key] for key in full if key not in ("ingredients", "instructions", "categories")}
+
+    body = await get_json(client, "/recipes", include="")
+    assert all(set(recipe).isdisjoint({"ingredients", "instructions", "categories"}) for recipe in body["recipes"])
+
+
+async def test_fields_and_include_combine(client):
+    body = await get_json(client, "/recipes/1", fields="recipe_id,ingredients,categories", include="ingredients")
+    assert list(body) == ["recipe_id", "ingredients"]
+
+
+async def test_meal_fields_and_include(client):
+    body = await get_json(client, "/meals", fields="meal_id,food_items")
+    assert body["meals"] == [{
+        "meal_id": 1,
+        "food_items": [{"fooditem_id": 1, "fooditem_name": "food 1", "fooditem_description": None}]
+    }]
+
+    body = await get_json(client, "/meals", include="")
+    assert list(body["meals"][0]) == ["meal_id", "meal_name", "meal_description", "created_at", "updated_at"]
+
+
+async def test_search_include(client):
+    body = await get_json(client, "/search", q="Recipe", include="categories")
+    recipe = body["results"]["recipes"][0]
+    assert "categories" in recipe and "ingredients" not in recipe
+
+    body = await get_json(client, "/search", q="Dinner", include="food_items")
+    meal = body["results"]["meals"][0]
+    assert "food_items" in meal and "categories" not in meal
+
+    body = await get_json(client, "/search", q="Recipe", include="")
+    assert "ingredients" not in body["results"]["recipes"][0]
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/recipes", {"fields": "recipe_id,secret"}),
+    ("/recipes", {"include": "food_items"}),
+    ("/recipes/1", {"fields": "meal_name"}),
+    ("/recipes/1", {"include": "steps"}),
+    ("/meals", {"fields": "recipe_name"}),
+    ("/meals", {"include": "ingredients"}),
+    ("/search", {"q": "Recipe", "include": "steps"}),
+])
+async def test_unknown_names_are_rejected(client, path, params):
+    response = await client.get(path, params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Unknown")
@@ -0,0 +1,92 @@
+"""Tests for search through the full-text index of migration 004 (SQLite FTS5)."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from data import crud, search
+from data.database import engine
+
+_MIGRATION = Path(__file__).parent.parent / "alembic" / "versions" / "004_add_full_text_search.py"
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("migration_004", _MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+migration = _load_migration()
+
+
+def _run(connection, step: str) -> None:
+    with Operations.context(MigrationContext.configure(connection)):
+        getattr(migration, step)()
+
+
+@pytest.fixture(autouse=True)
+async def full_text_index():
+    """Apply migration 004 to the test database (indexing the seeded rows)."""
+    async with engine.begin() as conn:
+        await conn.run_sync(_run, "upgrade")
+    search._index_available.clear()
+    yield
+    # drop_all() leaves virtual tables behind, so undo the migration
+    async with engine.begin() as conn:
+        await conn.run_sync(_run, "downgrade")
+    search._index_available.clear()
+
+
+async def found(session, q: str):
+    return [recipe.recipe_id for recipe in await crud.search_recipes(session, q)]
+
+
+async def test_index_is_used(session):
+    assert await search.index_available(session)
+    assert await search.search_ids(session, "recipe", "reci") == [1, 2, 3]
+
+
+async def test_terms_match_word_prefixes(session):
+    assert sorted(await found(session, "reci")) == [1, 2, 3]
+    assert await found(session, "reci 2") == [2]
+    # A term never matches inside a word, unlike the LIKE fallback
+    assert await found(session, "ecipe") == []
+
+
+async def test_descriptions_match_and_names_rank_first(client, session):
+    await client.put("/recipes/1", json={"description": "Creamy and rich"})
+    await client.put("/recipes/2", json={"name": "Creamy Soup"})
+    assert await found(session, "creamy") == [2, 1]
+
+
+async def test_triggers_follow_renames_and_deletes(client, session):
+    await client.put("/recipes/3", json={"name": "Lasagne"})
+    assert await found(session, "lasag") == [3]
+    assert sorted(await found(session, "recipe")) == [1, 2]
+
+    await client.delete("/recipes/2")
+    assert await found(session, "recipe") == [1]
+
+    response = await client.post("/recipes", json={"name": "Recipe Four", "fooditem_id": 4})
+    assert sorted(await found(session, "four")) == [response.json()["recipe_id"]]
+
+
+async def test_omni_search_counts_from_the_index(client):
+    await client.put("/ingredients/2", json={"ingredient_description": "fine white sugar"})
+    response = await client.get("/search", params={"q": "recipe", "limit": 1})
+    body = response.json()
+    assert len(body["results"]["recipes"]) == 1
+    assert body["totals"]["recipes"] == 3
+
+    body = (await client.get("/search", params={"q": "whit"})).json()
+    assert [item["ingredient_id"] for item in body["results"]["ingredients"]] == [2]
+    assert body["totals"] == {"recipes": 0, "meals": 0, "food_items": 0, "ingredients": 1}
+
+
+async def test_recipe_search_route(client):
+    response = await client.get("/recipes/search", params={"q": "reci 3"})
+    assert [recipe["recipe_id"] for recipe in response.json()["results"]] == [3]
@@ -0,0 +1,49 @@
+"""Tests that /recipes/filter stays consistent with recipe ingredient writes."""
+
+
+async def filtered(client, **params):
+    response = await client.get("/recipes/filter", params=params)
+    assert response.status_code == 200
+    ids = [recipe["recipe_id"] for recipe in response.json()["recipes"]]
+    assert int(response.headers["X-Total-Count"]) == len(ids)
+    return ids
+
+
+async def test_include_and_exclude(client):
+    assert await filtered(client, **{"with": "2"}) == [1]
+    assert await filtered(client, without="2,3") == [3]
+
+
+async def test_added_updated_and_removed_rows(client):
+    response = await client.post(
+        "/recipes/1/ingredients",
+        json={"ri_ingredient_id": 1, "ri_unit_type_id": 2, "ri_quantity": 100},
+    )
+    ri_id = response.json()["ri_id"]
+    assert await filtered(client, **{"with": "1,2"}) == [1]
+
+    await client.put(f"/recipes/1/ingredients/{ri_id}", json={"ri_ingredient_id": 5})
+    assert await filtered(client, **{"with": "1"}) == []
+    assert await filtered(client, **{"with": "5"}) == [1]
+
+    await client.delete(f"/recipes/1/ingredients/{ri_id}")
+    assert await filtered(client, **{"with": "5"}) == []
+
+
+async def test_created_and_deleted_recipes(client):
+    response = await client.post("/recipes", json={
+        "name": "Pancakes",
+        "fooditem_id": 4,
+        "ingredients": [{"ri_ingredient_id": 1, "ri_unit_type_id": 1, "ri_quantity": 2}],
+    })
+    recipe_id = response.json()["recipe_id"]
+    assert await filtered(client, **{"with": "1"}) == [recipe_id]
+
+    await client.delete(f"/recipes/{recipe_id}")
+    assert await filtered(client, **{"with": "1"}) == []
+
+
+async def test_food_item_rows(client):
+    await client.post("/recipes/2/ingredients", json={"ri_fooditem_id": 1, "ri_unit_type_id": 5, "ri_quantity": 1})
+    assert await filtered(client, with_food_items="1") == [2]
+    assert await filtered(client, without_food_items="1") == [1, 3]
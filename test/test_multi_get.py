@@ -0,0 +1,69 @@
+"""Tests for ?ids= multi-get on the list endpoints."""
+
+import pytest
+
+from data.config import settings
+
+
+# (list path, body key, id key)
+LISTS = [
+    ("/recipes", "recipes", "recipe_id"),
+    ("/meals", "meals", "meal_id"),
+    ("/food-items", "food_items", "fooditem_id"),
+    ("/ingredients", "ingredients", "ingredient_id"),
+]
+
+
+@pytest.fixture
+async def second_meal(client):
+    response = await client.post("/meals", json={"meal_name": "Lunch", "fooditem_ids": [2]})
+    assert response.json()["meal_id"] == 2
+
+
+async def multi_get(client, path: str, ids: str):
+    response = await client.get(path, params={"ids": ids})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("path, key, id_key", LISTS)
+async def test_rows_come_back_in_request_order(client, second_meal, path, key, id_key):
+    body = await multi_get(client, path, "2,1")
+    assert [row[id_key] for row in body[key]] == [2, 1]
+    assert body["missing"] == []
+
+
+@pytest.mark.parametrize("path, key, id_key", LISTS)
+async def test_duplicates_are_returned_once(client, second_meal, path, key, id_key):
+    body = await multi_get(client, path, "1,2,1, 2")
+    assert [row[id_key] for row in body[key]] == [1, 2]
+
+
+@pytest.mark.parametrize("path, key, id_key", LISTS)
+async def test_missing_ids_are_listed(client, path, key, id_key):
+    body = await multi_get(client, path, "99,1,98")
+    assert [row[id_key] for row in body[key]] == [1]
+    assert body["missing"] == [99, 98]
+
+
+async def test_rows_have_the_list_shape(client):
+    listed = (await client.get("/recipes")).json()["recipes"]
+    body = await multi_get(client, "/recipes", "3,1")
+    assert body["recipes"] == [listed[2], listed[0]]
+
+
+@pytest.mark.parametrize("path", [path for path, _, _ in LISTS])
+async def test_too_many_ids_are_rejected(client, monkeypatch, path):
+    monkeypatch.setattr(settings, "max_batch_ids", 3)
+    # Limit applies after duplicates are dropped
+    assert (await client.get(path, params={"ids": "1,2,3,3,1"})).status_code == 200
+
+    response = await client.get(path, params={"ids": "1,2,3,4"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "At most 3 ids in ids"
+
+
+@pytest.mark.parametrize("ids", ["1,a", "0,1", "-1", ","])
+async def test_malformed_ids_are_rejected(client, ids):
+    response = await client.get("/recipes", params={"ids": ids})
+    assert response.status_code == 400
@@ -0,0 +1,33 @@
+"""Tests for list pagination helpers and paged list endpoints."""
+
+import pytest
+from sqlalchemy import select
+
+from data.models import Ingredient
+from data.pagination import apply_page, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips():
+    assert decode_cursor(encode_cursor({"id": 42})) == {"id": 42}
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+async def test_apply_page_keyset_and_offset(session):
+    stmt = apply_page(select(Ingredient.ingredient_id), Ingredient.ingredient_id, limit=2, after_id=1)
+    assert (await session.execute(stmt)).scalars().all() == [2, 3]
+
+    stmt = apply_page(select(Ingredient.ingredient_id), Ingredient.ingredient_id, limit=2, offset=3)
+    assert (await session.execute(stmt)).scalars().all() == [4, 5]
+
+
+async def test_recipe_pages_follow_next_cursor(client):
+    first = (await client.get("/recipes", params={"limit": 2})).json()
+    assert [recipe["recipe_id"] for recipe in first["recipes"]] == [1, 2]
+
+    second = (await client.get("/recipes", params={"limit": 2, "after": first["next_cursor"]})).json()
+    assert [recipe["recipe_id"] for recipe in second["recipes"]] == [3]
+    assert second["next_cursor"] is None
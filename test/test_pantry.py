@@ -0,0 +1,41 @@
+"""Tests for /recipes/match pantry coverage ranking."""
+
+
+async def match(client, **params):
+    response = await client.get("/recipes/match", params=params)
+    assert response.status_code == 200
+    return response.json()["matches"], int(response.headers["X-Total-Count"])
+
+
+async def test_coverage_and_missing_rows(client):
+    await client.post("/recipes/1/ingredients", json={"ri_ingredient_id": 1, "ri_unit_type_id": 2, "ri_quantity": 100})
+    matches, total = await match(client, ingredients="2")
+    assert total == 1
+    assert matches[0]["recipe_id"] == 1
+    assert matches[0]["coverage"] == 0.5
+    assert [row["name"] for row in matches[0]["missing"]] == ["flour"]
+
+
+async def test_food_item_made_by_a_covered_recipe(client):
+    # Recipe 2 needs food item 1, which recipe 1 makes from ingredient 2
+    await client.post("/recipes/2/ingredients", json={"ri_fooditem_id": 1, "ri_unit_type_id": 5, "ri_quantity": 1})
+    matches, _ = await match(client, ingredients="2,3")
+    assert {m["recipe_id"]: m["coverage"] for m in matches} == {1: 1.0, 2: 1.0}
+
+    matches, _ = await match(client, ingredients="3")
+    assert {m["recipe_id"]: m["coverage"] for m in matches} == {2: 0.5}
+
+
+async def test_writes_rebuild_the_matrix(client):
+    matches, _ = await match(client, ingredients="5")
+    assert matches == []
+
+    response = await client.get("/recipes/3")
+    ri_id = response.json()["ingredients"][0]["ri_id"]
+    await client.put(f"/recipes/3/ingredients/{ri_id}", json={"ri_ingredient_id": 5})
+    matches, _ = await match(client, ingredients="5")
+    assert [m["recipe_id"] for m in matches] == [3]
+
+    await client.delete("/recipes/3")
+    matches, total = await match(client, ingredients="5")
+    assert (matches, total) == ([], 0)
@@ -0,0 +1,88 @@
+"""Tests for Prefer: return=representation on the update routes."""
+
+import pytest
+
+PREFER = {"Prefer": "return=representation"}
+
+
+async def put(client, url, body, prefer: bool):
+    response = await client.put(url, json=body, headers=PREFER if prefer else {})
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize("url, body, message", [
+    ("/recipes/1", {"name": "Renamed"}, "Recipe updated successfully"),
+    ("/meals/1", {"meal_name": "Supper"}, "Meal updated successfully"),
+    ("/ingredients/2", {"ingredient_name": "caster sugar"}, "Ingredient updated successfully"),
+])
+async def test_message_only_by_default(client, url, body, message):
+    response = await put(client, url, body, prefer=False)
+    assert response.json() == {"message": message}
+    assert "Preference-Applied" not in response.headers
+
+
+async def test_recipe_representation(client):
+    response = await put(client, "/recipes/1", {
+        "name": "Renamed",
+        "ingredients": [{"ri_ingredient_id": 5, "ri_unit_type_id": 2, "ri_quantity": 200}],
+        "category_ids": [1],
+    }, prefer=True)
+    assert response.headers["Preference-Applied"] == "return=representation"
+    body = response.json()
+    assert body["recipe_name"] == "Renamed"
+    assert [(ri["ingredient_name"], ri["unit_type"], ri["ri_quantity"]) for ri in body["ingredients"]] == [
+        ("milk", "gram", 200.0)
+    ]
+    assert [category["category_id"] for category in body["categories"]] == [1]
+    assert body["instructions"] == [{"step_number": 1, "instruction_text": "Mix"}]
+
+    stored = (await client.get("/recipes/1")).json()
+    assert {key: stored[key] for key in body if key != "updated_at"} == {
+        key: body[key] for key in body if key != "updated_at"
+    }
+
+
+async def test_meal_representation(client):
+    response = await put(client, "/meals/1", {"meal_name": "Supper", "fooditem_ids": [2, 3]}, prefer=True)
+    assert response.headers["Preference-Applied"] == "return=representation"
+    body = response.json()
+    assert body["meal_name"] == "Supper"
+    assert [item["fooditem_id"] for item in body["food_items"]] == [2, 3]
+
+
+async def test_ingredient_representation(client):
+    response = await put(client, "/ingredients/2", {"ingredient_density": 0.8}, prefer=True)
+    assert response.headers["Preference-Applied"] == "return=representation"
+    body = response.json()
+    # Columns the request did not set come back from the row (RETURNING)
+    assert (body["ingredient_name"], body["ingredient_density"]) == ("sugar", 0.8)
+    assert body["created_at"] and body["updated_at"]
+
+
+async def test_recipe_ingredient_representation(client):
+    ri_id = (await client.get("/recipes/1")).json()["ingredients"][0]["ri_id"]
+    url = f"/recipes/1/ingredients/{ri_id}"
+
+    response = await put(client, url, {"ri_quantity": 3}, prefer=False)
+    assert response.json() == {"message": "Recipe ingredient updated successfully"}
+
+    response = await put(client, url, {"ri_ingredient_id": 1, "ri_unit_type_id": 2}, prefer=True)
+    assert response.headers["Preference-Applied"] == "return=representation"
+    body = response.json()
+    # The lookup rows follow the changed foreign keys (populate_existing)
+    assert (body["ri_id"], body["ri_quantity"]) == (ri_id, 3.0)
+    assert (body["ingredient_name"], body["unit_type"]) == ("flour", "gram")
+
+
+async def test_prefer_among_other_preferences(client):
+    response = await client.put(
+        "/meals/1", json={"meal_name": "Supper"}, headers={"Prefer": "respond-async, Return=Representation; x=1"}
+    )
+    assert response.json()["meal_name"] == "Supper"
+
+
+async def test_missing_row_is_404_either_way(client):
+    for headers in ({}, PREFER):
+        response = await client.put("/meals/99", json={"meal_name": "x"}, headers=headers)
+        assert response.status_code == 404
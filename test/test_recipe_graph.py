@@ -0,0 +1,84 @@
+"""Tests for recipe cycle rejection and the in-memory dependency graph."""
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from data import crud, recipe_graph
+from data.expansion import RecipeCycleError
+
+
+def fail_next_commit(monkeypatch, session):
+    """Make the session's next commit fail as a lost database would."""
+    async def commit():
+        monkeypatch.undo()
+        raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+    monkeypatch.setattr(session, "commit", commit)
+
+
+async def add_food_item(client, recipe_id: int, fooditem_id: int):
+    return await client.post(
+        f"/recipes/{recipe_id}/ingredients",
+        json={"ri_fooditem_id": fooditem_id, "ri_unit_type_id": 5, "ri_quantity": 1}
+    )
+
+
+async def test_cycles_are_rejected(client):
+    # Recipe n makes food item n: 2 uses 1, 3 uses 2, so 1 using 3 closes a loop
+    assert (await add_food_item(client, 2, 1)).status_code == 200
+    assert (await add_food_item(client, 3, 2)).status_code == 200
+    response = await add_food_item(client, 1, 3)
+    assert response.status_code == 409
+
+    response = await client.post("/recipes", json={
+        "name": "Loop", "fooditem_id": 4,
+        "ingredients": [{"ri_fooditem_id": 4, "ri_unit_type_id": 5, "ri_quantity": 1}],
+    })
+    assert response.status_code == 409
+    assert (await client.get("/recipes")).headers["X-Total-Count"] == "3"
+
+
+async def test_failed_commit_restores_an_added_edge(client, session, monkeypatch):
+    fail_next_commit(monkeypatch, session)
+    with pytest.raises(OperationalError):
+        await crud.add_ingredient_to_recipe(
+            session, 2, {"ri_fooditem_id": 1, "ri_unit_type_id": 5, "ri_quantity": 1}
+        )
+    assert recipe_graph._graph.entry(2) == (2, frozenset())
+
+    # Recipe 2 does not use food item 1, so recipe 1 may use food item 2
+    assert (await add_food_item(client, 1, 2)).status_code == 200
+    # ... and now recipe 2 using food item 1 is a real cycle
+    assert (await add_food_item(client, 2, 1)).status_code == 409
+
+
+async def test_failed_commit_restores_an_update(client, session, monkeypatch):
+    assert (await add_food_item(client, 2, 1)).status_code == 200
+
+    fail_next_commit(monkeypatch, session)
+    with pytest.raises(OperationalError):
+        await crud.update_recipe(session, 2, {"ingredients": []})
+    assert recipe_graph._graph.entry(2) == (2, frozenset({1}))
+    assert (await add_food_item(client, 1, 2)).status_code == 409
+
+
+async def test_failed_commit_forgets_a_new_recipe(client, session, monkeypatch):
+    fail_next_commit(monkeypatch, session)
+    with pytest.raises(OperationalError):
+        await crud.create_recipe(session, {
+            "recipe_name": "Never saved", "recipe_fooditem_id": 4,
+            "ingredients": [{"ri_fooditem_id": 1, "ri_unit_type_id": 5, "ri_quantity": 1}],
+        })
+    # The unsaved recipe would have made food item 4 require food item 1
+    assert (await add_food_item(client, 1, 4)).status_code == 200
+
+
+def test_restore_recipe_leaves_out_an_entry_that_now_closes_a_cycle():
+    graph = recipe_graph.DependencyGraph.build({1: (1, []), 2: (2, [1])})
+    previous = graph.entry(2)
+    graph.set_recipe(2, 2, [])
+    graph.set_recipe(1, 1, [2])
+
+    graph.restore_recipe(2, previous)
+    assert graph.entry(2) is None
+    with pytest.raises(RecipeCycleError):
+        graph.set_recipe(3, 2, [1])
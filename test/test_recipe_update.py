@@ -0,0 +1,89 @@
+"""Tests that PUT /recipes/{id} diffs child rows instead of recreating them."""
+
+import re
+
+import pytest
+from sqlalchemy import event, select
+
+from data.database import engine
+from data.models import RecipeIngredient, RecipeInstruction
+
+_WRITE_RE = re.compile(r'^(INSERT INTO|UPDATE|DELETE FROM) "?(\w+)"?')
+
+
+@pytest.fixture
+def writes():
+    """(verb, table) of every INSERT / UPDATE / DELETE run during the test."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        match = _WRITE_RE.match(statement)
+        if match:
+            executed.append((match.group(1).split()[0], match.group(2)))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def ingredient_rows(session, recipe_id: int):
+    result = await session.execute(
+        select(RecipeIngredient.ri_id, RecipeIngredient.ri_ingredient_id, RecipeIngredient.ri_quantity)
+        .where(RecipeIngredient.ri_recipe_id == recipe_id)
+        .order_by(RecipeIngredient.ri_id)
+    )
+    return result.all()
+
+
+async def instruction_rows(session, recipe_id: int):
+    result = await session.execute(
+        select(RecipeInstruction.instruction_id, RecipeInstruction.step_number, RecipeInstruction.instruction_text)
+        .where(RecipeInstruction.recipe_id == recipe_id)
+        .order_by(RecipeInstruction.step_number)
+    )
+    return result.all()
+
+
+async def test_changed_rows_are_updated_in_place(client, session, writes):
+    (ri_id, _, _), = await ingredient_rows(session, 1)
+    (instruction_id, _, _), = await instruction_rows(session, 1)
+
+    response = await client.put("/recipes/1", json={
+        "ingredients": [
+            {"ri_ingredient_id": 2, "ri_unit_type_id": 1, "ri_quantity": 2.0},
+            {"ri_ingredient_id": 5, "ri_unit_type_id": 1, "ri_quantity": 1.0},
+        ],
+        "instructions": [
+            {"step_number": 1, "instruction_text": "Mix well"},
+            {"step_number": 2, "instruction_text": "Bake"},
+        ],
+    })
+    assert response.status_code == 200
+
+    ingredients = await ingredient_rows(session, 1)
+    assert ingredients[0] == (ri_id, 2, 2.0)
+    assert [row[1:] for row in ingredients[1:]] == [(5, 1.0)]
+    instructions = await instruction_rows(session, 1)
+    assert instructions[0] == (instruction_id, 1, "Mix well")
+    assert [row[1:] for row in instructions[1:]] == [(2, "Bake")]
+
+    assert ("DELETE", "RecipeIngredient") not in writes
+    assert ("DELETE", "RecipeInstruction") not in writes
+    assert writes.count(("INSERT", "RecipeIngredient")) == 1
+    assert writes.count(("INSERT", "RecipeInstruction")) == 1
+
+
+async def test_unchanged_lists_write_no_child_rows(client, writes):
+    await client.put("/recipes/1", json={
+        "ingredients": [{"ri_ingredient_id": 2, "ri_unit_type_id": 1, "ri_quantity": 1.5}],
+        "instructions": [{"step_number": 1, "instruction_text": "Mix"}],
+        "category_ids": [2],
+    })
+    assert [table for _, table in writes if table != "Recipe"] == []
+
+
+async def test_dropped_rows_are_deleted(client, session, writes):
+    await client.put("/recipes/1", json={"ingredients": [], "instructions": []})
+    assert await ingredient_rows(session, 1) == []
+    assert await instruction_rows(session, 1) == []
+    assert ("INSERT", "RecipeIngredient") not in writes
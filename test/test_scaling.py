@@ -0,0 +1,75 @@
+"""Tests for recipe scaling (scaling.py, /recipes/{id}/scaled and /recipes/scale)."""
+
+import numpy as np
+import pytest
+
+from data.scaling import round_quantities
+from data.units import DIMENSIONS
+
+MASS = DIMENSIONS.index("mass")
+COUNT = DIMENSIONS.index("count")
+
+
+def test_round_quantities():
+    rounded = round_quantities(
+        [1234.5, 0.0123456, 0.1 + 0.2, 0.0, 0.1, 2.6, -1.23456],
+        [MASS, MASS, -1, MASS, COUNT, COUNT, -1],
+    )
+    assert rounded.tolist() == [1230.0, 0.0123, 0.3, 0.0, 0.25, 2.5, -1.23]
+
+
+def test_round_quantities_keeps_non_finite_values():
+    rounded = round_quantities([np.inf, np.nan], [MASS, MASS])
+    assert rounded[0] == np.inf
+    assert np.isnan(rounded[1])
+
+
+def quantities(recipe):
+    return [(ri["ri_quantity"], ri["unit_type"]) for ri in recipe["ingredients"]]
+
+
+async def test_scaled_recipe(client):
+    response = await client.get("/recipes/1/scaled", params={"factor": 0.7})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["scale_factor"] == 0.7
+    assert quantities(body) == [(1.05, "cup")]
+
+    # The stored recipe is unchanged
+    assert (await client.get("/recipes/1")).json()["ingredients"][0]["ri_quantity"] == 1.5
+
+
+async def test_scaled_recipe_in_display_units(client):
+    await client.post("/recipes/1/ingredients", json={"ri_ingredient_id": 1, "ri_unit_type_id": 3, "ri_quantity": 24})
+    await client.post("/recipes/1/ingredients", json={"ri_ingredient_id": 5, "ri_unit_type_id": 2, "ri_quantity": 750})
+
+    response = await client.get("/recipes/1/scaled", params={"factor": 2, "normalize": "true"})
+    assert quantities(response.json()) == [(3.0, "cup"), (1.0, "cup"), (1.5, "kilogram")]
+
+
+async def test_scaled_recipe_not_found(client):
+    response = await client.get("/recipes/99/scaled", params={"factor": 2})
+    assert response.status_code == 404
+
+
+async def test_scale_several_recipes(client):
+    response = await client.post("/recipes/scale", json={"recipes": [
+        {"recipe_id": 1, "factor": 2},
+        {"recipe_id": 99, "factor": 1},
+        {"recipe_id": 1, "factor": 3},
+        {"recipe_id": 2, "factor": 0.5},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [(recipe["recipe_id"], quantities(recipe)) for recipe in body["recipes"]] == [
+        (1, [(3.0, "cup")]),
+        (1, [(4.5, "cup")]),
+        (2, [(0.75, "cup")]),
+    ]
+    assert body["missing"] == [99]
+
+
+@pytest.mark.parametrize("entries", [[], [{"recipe_id": 1, "factor": 0}], [{"recipe_id": 1, "factor": 1001}]])
+async def test_scale_rejects_bad_entries(client, entries):
+    response = await client.post("/recipes/scale", json={"recipes": entries})
+    assert response.status_code == 400
@@ -0,0 +1,53 @@
+"""Tests for search without the full-text index (the LIKE fallback)."""
+
+from data import crud, search
+
+
+def test_search_terms_split_on_non_word_characters():
+    assert search.search_terms("Chicken-fried  STEAK!") == ["chicken", "fried", "steak"]
+
+
+async def test_fallback_matches_substrings(session):
+    recipes = await crud.search_recipes(session, "ecipe 2")
+    assert [recipe.recipe_id for recipe in recipes] == [2]
+
+
+async def test_fallback_matches_recipe_names_only(client, session):
+    await client.put("/recipes/1", json={"description": "creamy and rich"})
+    assert await crud.search_recipes(session, "creamy") == []
+
+
+async def test_omni_search_limits_and_counts_matches(client):
+    response = await client.get("/search", params={"q": "ecipe", "limit": 2})
+    body = response.json()
+    assert [recipe["recipe_id"] for recipe in body["results"]["recipes"]] == [1, 2]
+    assert body["totals"]["recipes"] == 3
+
+
+async def test_fuzzy_search_tolerates_typos(client):
+    response = await client.get("/search", params={"q": "Recipee", "fuzzy": "true"})
+    assert {recipe["recipe_id"] for recipe in response.json()["results"]["recipes"]} == {1, 2, 3}
+
+
+async def test_fuzzy_index_follows_renames(client):
+    async def fuzzy_ids(q):
+        response = await client.get("/search", params={"q": q, "fuzzy": "true"})
+        return {recipe["recipe_id"] for recipe in response.json()["results"]["recipes"]}
+
+    assert await fuzzy_ids("Spagetti") == set()
+    await client.put("/recipes/2", json={"name": "Spaghetti"})
+    assert await fuzzy_ids("Spagetti") == {2}
+    assert await fuzzy_ids("Recipee") == {1, 3}
+
+
+async def test_recipe_search_route(client):
+    response = await client.get("/recipes/search", params={"q": "ecipe 3"})
+    assert response.status_code == 200
+    assert [recipe["recipe_id"] for recipe in response.json()["results"]] == [3]
+
+
+async def test_recipe_search_route_fuzzy(client):
+    await client.put("/recipes/2", json={"name": "Spaghetti"})
+    response = await client.get("/recipes/search", params={"q": "Spagetti", "fuzzy": "true"})
+    assert response.status_code == 200
+    assert [recipe["recipe_id"] for recipe in response.json()["results"]] == [2]
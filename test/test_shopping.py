@@ -0,0 +1,66 @@
+"""Tests for POST /shopping-list."""
+
+import pytest
+
+from data.models import RecipeIngredient
+
+
+async def shopping_list(client, plan):
+    response = await client.post("/shopping-list", json=plan)
+    assert response.status_code == 200
+    return response.json()
+
+
+def totals(rows, key):
+    return {(row[key], row["unit_type"]): row["quantity"] for row in rows}
+
+
+async def test_meals_and_recipes_through_a_sub_recipe(client):
+    # Recipe 2 uses 2 of food item 1, which recipe 1 makes from 1.5 cup of sugar
+    await client.post("/recipes/2/ingredients", json={"ri_fooditem_id": 1, "ri_unit_type_id": 5, "ri_quantity": 2})
+    await client.put("/meals/1", json={"fooditem_ids": [1, 5]})
+
+    body = await shopping_list(client, {
+        "meals": [{"meal_id": 1, "servings": 2}],
+        "recipes": [{"recipe_id": 2}, {"recipe_id": 2, "servings": 0.5}],
+    })
+    # sugar: 2 meal servings x 1.5 + 1.5 batches x 2 x 1.5
+    assert totals(body["ingredients"], "ingredient_name") == {("sugar", "cup"): 7.5, ("butter", "cup"): 2.25}
+    # food item 5 is bought: one per meal serving
+    assert [(row["fooditem_id"], row["quantity"]) for row in body["food_items"]] == [(5, 2.0)]
+    assert body["missing"] == {"meal_ids": [], "recipe_ids": []}
+
+
+async def test_missing_ids(client):
+    body = await shopping_list(client, {"meals": [{"meal_id": 99}], "recipes": [{"recipe_id": 3}, {"recipe_id": 98}]})
+    assert totals(body["ingredients"], "ingredient_name") == {("egg", "cup"): 1.5}
+    assert body["missing"] == {"meal_ids": [99], "recipe_ids": [98]}
+
+
+@pytest.mark.parametrize("plan", [
+    [],
+    {},
+    {"meals": "1"},
+    {"recipes": [{"recipe_id": 0}]},
+    {"recipes": [{"recipe_id": 1, "servings": 0}]},
+    {"recipes": [{"recipe_id": 1, "servings": True}]},
+    # Each entry is finite, the sum is not
+    {"recipes": [{"recipe_id": 1, "servings": 1e308}, {"recipe_id": 1, "servings": 1e308}]},
+    # The servings are finite, 1.5 cup per serving is not
+    {"recipes": [{"recipe_id": 1, "servings": 1.5e308}]},
+])
+async def test_bad_plans_are_rejected(client, plan):
+    response = await client.post("/shopping-list", json=plan)
+    assert response.status_code == 400
+
+
+async def test_cycle_in_stored_recipes_is_a_conflict(client, session):
+    # Written around the crud checks, as data imported by other means could be
+    session.add_all([
+        RecipeIngredient(ri_recipe_id=1, ri_fooditem_id=2, ri_unit_type_id=5, ri_quantity=1),
+        RecipeIngredient(ri_recipe_id=2, ri_fooditem_id=1, ri_unit_type_id=5, ri_quantity=1),
+    ])
+    await session.commit()
+
+    response = await client.post("/shopping-list", json={"recipes": [{"recipe_id": 1}]})
+    assert response.status_code == 409
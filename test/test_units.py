@@ -0,0 +1,75 @@
+"""Tests for unit conversion (units.py and /unit-types/convert)."""
+
+import numpy as np
+import pytest
+
+from data.units import ConversionTable
+
+
+def table():
+    return ConversionTable([
+        (1, "cup", "volume", 236.5882365),
+        (2, "gram", "mass", 1.0),
+        (3, "teaspoon", "volume", 4.92892159375),
+        (4, "kilogram", "mass", 1000.0),
+        (6, "slice", None, None),
+        (10_000_000, "tablespoon", "volume", 14.78676478125),
+    ])
+
+
+def test_matrix_is_sized_by_unit_count():
+    assert len(table()) == 6
+    assert table().matrix.shape == (6, 6)
+
+
+def test_convert_within_and_across_dimensions():
+    converted = table().convert(
+        [1, 1500, 1, 2, 1, 3],
+        [1, 2, 6, 6, 1, 10_000_000],
+        [3, 4, 6, 2, 2, 3],
+    )
+    assert converted[:2] == pytest.approx([48, 1.5])
+    assert converted[2] == 1
+    assert np.isnan(converted[3:5]).all()
+    assert converted[5] == pytest.approx(9)
+
+
+def test_convert_with_density():
+    converted = table().convert([1, 100], [1, 2], [2, 1], densities=[0.5, 0.5])
+    assert converted == pytest.approx([118.29411825, 100 / 0.5 / 236.5882365])
+
+
+def test_unknown_units_do_not_convert():
+    assert np.isnan(table().convert([1, 1, 1], [5, 0, 10_000_001], [5, 1, 1])).all()
+
+
+def test_normalize_moves_to_display_units():
+    quantities, unit_ids = table().normalize([1500, 48, 0.5, 2], [2, 3, 2, 6])
+    assert quantities == pytest.approx([1.5, 1, 0.5, 2])
+    assert unit_ids.tolist() == [4, 1, 2, 6]
+
+
+def test_empty_table():
+    assert np.isnan(ConversionTable([]).convert([1], [1], [1])).all()
+
+
+async def convert(client, **params):
+    return await client.get("/unit-types/convert", params=params)
+
+
+async def test_convert_endpoint(client):
+    response = await convert(client, quantity=2, from_unit=4, to_unit=2)
+    assert response.status_code == 200
+    assert response.json()["converted_quantity"] == 2000
+
+    response = await convert(client, quantity=1, from_unit=1, to_unit=2, ingredient_id=1)
+    assert response.json()["converted_quantity"] == pytest.approx(118.29411825)
+
+    response = await convert(client, quantity=1, from_unit=1, to_unit=2, ingredient_id=2)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("quantity", ["inf", "-inf", "nan"])
+async def test_convert_rejects_non_finite_quantities(client, quantity):
+    response = await convert(client, quantity=quantity, from_unit=1, to_unit=3)
+    assert response.status_code == 400